@@ -29,6 +29,132 @@ DEBUG = True
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 패턴 템플릿 PNG가 들어있는 폴더
+PATTERN_DIR = BASE_DIR / 'items' / 'pattern_logic' / 'mnt_project'
+
+# 패턴 렌더 캐시 메모리 용량 (디스크 캐시는 BASE_DIR / 'pattern_outputs')
+PATTERN_RENDER_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# 패턴 이미지 인코더 프로필: default / fast(낮은 zlib 레벨) / small(팔레트 PNG) / webp(무손실) / svg(벡터)
+# create-with-pattern 요청의 encoder 값으로 요청별 지정 가능
+PATTERN_ENCODER_PROFILE = 'default'
+
+# True면 create-with-pattern 이 항상 202 + 백그라운드 작업으로 동작
+# (False여도 요청에 `Prefer: respond-async` 헤더가 있으면 비동기)
+PATTERN_RENDER_ASYNC = False
+
+# 백그라운드 패턴 작업 스레드 수 (프로세스당)
+PATTERN_JOB_WORKERS = 2
+# running 상태로 이 시간(초) 동안 갱신이 없는 작업은 워커가 죽은 것으로 보고 run_pattern_jobs 가 다시 처리
+PATTERN_JOB_STALE_SECONDS = 10 * 60
+# 처리 중인 작업은 이 간격(초)마다 updated_at을 갱신 (오래 걸려도 살아 있는 작업은 stale로 보지 않음)
+PATTERN_JOB_HEARTBEAT_SECONDS = 30
+# 작업이 렌더 풀 자리 / 결과를 기다리는 최대 시간 (초, 넘으면 failed)
+PATTERN_JOB_RENDER_TIMEOUT = 5 * 60
+
+# async 뷰(/api/async/...)가 패턴 합성/인코딩을 넘기는 스레드 수
+PATTERN_RENDER_THREADS = min(4, os.cpu_count() or 1)
+
+# 렌더 워커 프로세스 풀 (0이면 끄고 요청 스레드에서 렌더링)
+# 워커는 시작할 때 타일을 한 번 로드하고, 결과는 공유 메모리 슬롯으로 돌려줌
+# 서버 워커 프로세스마다 풀이 하나씩 생기므로 (서버 워커 수 x PATTERN_RENDER_PROCESSES) 가 코어 수를 넘지 않게 설정
+PATTERN_RENDER_PROCESSES = 0
+# 대기 + 실행 중 렌더 작업 최대 수 (넘으면 기다리지 않고 503 + Retry-After)
+PATTERN_RENDER_QUEUE_SIZE = 32
+# 요청 하나가 렌더 결과를 기다리는 최대 시간 (초, 넘으면 503 / 백그라운드 작업은 PATTERN_JOB_RENDER_TIMEOUT)
+PATTERN_RENDER_TIMEOUT = 10
+# 결과 공유 메모리 슬롯 하나의 크기 (bytes, 더 큰 결과는 pickle로 전달)
+PATTERN_RENDER_RESULT_BYTES = 4 * 1024 * 1024
+
+# 닉네임 중복 확인은 프로세스별 메모리 인덱스로 처리
+# 다른 프로세스에서 생긴 닉네임을 반영하는 간격 / 삭제·수정까지 반영하도록 전체를 다시 읽는 간격 (초)
+NICKNAME_INDEX_REFRESH_SECONDS = 2
+NICKNAME_INDEX_REBUILD_SECONDS = 300
+# 닉네임 예약 유지 시간 (초, 닉네임 페이지 → 바코드 페이지 등록까지)
+NICKNAME_RESERVATION_SECONDS = 15 * 60
+
+# 업로드 사진에서 서버가 대표색(dominant_color) / 팔레트를 직접 추출 (사진이 있으면 클라이언트 값보다 우선)
+PRODUCT_COLOR_EXTRACTION = True
+PRODUCT_PALETTE_SIZE = 5
+PRODUCT_COLOR_SAMPLE_SIDE = 64      # k-means 샘플 이미지 긴 변 (px)
+PRODUCT_COLOR_TIME_BUDGET_MS = 50   # 사진 한 장당 k-means 시간 예산
+
+# 목록용 이미지 파생본: 이름 → 긴 변 최대 길이(px)
+# 처음 요청될 때 MEDIA_ROOT/renditions/ 아래에 만들어 재사용 (크기를 바꾸면 새 이름으로 다시 생성)
+IMAGE_RENDITIONS = {
+    'thumb': 256,
+    'medium': 768,
+}
+
+# 즉시 렌더링 패턴 이미지 (GET /api/patterns/<barcode>.png) 의 브라우저 / CDN 캐시 시간 (초)
+# 패턴 세트가 바뀌면 ETag가 달라지므로 만료 후 재검증 시 새 이미지를 받음
+PATTERN_IMAGE_MAX_AGE = 30 * 24 * 3600
+# size 파라미터 최대값 (px, 원본 크기 = 타일 크기 × 2)
+# 원본보다 크게 확대하면 요청 하나가 수백 MB를 쓰므로 인증 없는 GET에서는 원본 크기까지만 허용
+PATTERN_IMAGE_MAX_SIZE = 2048
+
+# 패턴 스프라이트 시트 (GET /api/products/sprite-sheet/)
+# 한 장에 넣을 수 있는 최대 물건 수 / 셀(패턴 하나) 기본·최대 크기(px, 짝수)
+PATTERN_SPRITE_MAX_ITEMS = 400
+PATTERN_SPRITE_CELL_SIZE = 256
+PATTERN_SPRITE_MAX_CELL_SIZE = 512
+# 시트 전체 크기 상한: 가로(columns × cell, px)는 한 줄 버퍼(cell × 가로 × 3 바이트) 메모리를,
+# 전체 픽셀 수는 요청 하나의 합성 / 압축 시간을 제한 (넘으면 400)
+PATTERN_SPRITE_MAX_WIDTH = 10240
+PATTERN_SPRITE_MAX_PIXELS = 64 * 1024 * 1024
+
+# 물건 사진 업로드 제한
+# 받는 도중 PRODUCT_IMAGE_MAX_UPLOAD_BYTES를 넘으면 중단(413), 헤더의 해상도가 PRODUCT_IMAGE_MAX_PIXELS를 넘으면 400
+# 통과한 사진은 긴 변 PRODUCT_IMAGE_MAX_SIDE 이하, 메타데이터 없는 JPEG로 다시 저장
+PRODUCT_IMAGE_MAX_UPLOAD_BYTES = 15 * 1024 * 1024
+PRODUCT_IMAGE_MAX_PIXELS = 50_000_000
+PRODUCT_IMAGE_MAX_SIDE = 2048
+PRODUCT_IMAGE_JPEG_QUALITY = 85
+
+FILE_UPLOAD_HANDLERS = [
+    'items.uploads.SizeLimitedUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# True면 응답에 단계별 소요 시간(Server-Timing 헤더)을 붙임 (/api/metrics/ 히스토그램은 항상 집계)
+PATTERN_SERVER_TIMING = False
+
+# 로그 설정
+# 요청 스레드는 큐에 넣기만 하고 파일 / 콘솔 쓰기는 리스너 스레드에서 처리
+# 로그 파일은 프로세스별 logs/pattern_generator.<pid>.log, 10MB 또는 하루마다 교체, 백업 10개 유지
+# (워커 프로세스끼리 같은 파일을 교체하며 로그를 잃지 않도록 pid로 나눔)
+# 프로세스가 시작할 때 7일 넘게 기록이 없는 pid의 파일을 지우고, pid 파일은 최근 20개까지만 남김
+LOG_DIR = BASE_DIR / 'logs'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'pattern_queue': {
+            'class': 'items.pattern_logic.log_handlers.QueueingRotatingFileHandler',
+            'filename': str(LOG_DIR / 'pattern_generator.log'),
+            'max_bytes': 10 * 1024 * 1024,
+            'backup_count': 10,
+            'interval_hours': 24,
+            'console': True,
+            'retention_days': 7,
+            'max_process_files': 20,
+        },
+    },
+    'root': {
+        'handlers': ['pattern_queue'],
+        'level': 'WARNING',
+    },
+    'loggers': {
+        'items': {
+            'handlers': ['pattern_queue'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 ALLOWED_HOSTS = []
 
 
@@ -55,6 +181,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'items.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -80,10 +207,26 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite 운영 설정 (여러 키오스크가 동시에 물건을 등록해도 쓰기가 서로 막히지 않도록)
+#   journal_mode=WAL: 읽기(목록 / 닉네임 확인)가 쓰기를 막지 않고, 커밋은 WAL 파일에 덧붙이기만 함
+#   synchronous=NORMAL: WAL에서는 커밋마다 fsync하지 않아도 DB가 깨지지 않음 (전원 차단 시 마지막 커밋만 잃을 수 있음)
+#   timeout: busy timeout (초) - 다른 연결이 쓰는 중이면 바로 "database is locked" 대신 기다림
+#   transaction_mode=IMMEDIATE: atomic() 시작 시 쓰기 잠금을 잡아서, 읽다가 쓰기로 바꿀 때 생기는 즉시 실패를 없앰
+#   CONN_MAX_AGE: 요청마다 연결을 새로 열지 않고 재사용 (연결할 때마다 PRAGMA를 다시 실행하지 않음)
+# benchmark_db 명령으로 Django 기본 설정과 쓰기 처리량을 비교할 수 있음
+SQLITE_OPTIONS = {
+    'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA temp_store=MEMORY;',
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': 20,
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': SQLITE_OPTIONS,
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
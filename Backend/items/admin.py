@@ -1,7 +1,31 @@
 from django.contrib import admin
 
 # Register your models here.
-from django.contrib import admin
-from .models import Product
+from .models import NicknameReservation, PatternAsset, Product
+
+
+@admin.register(Product)
+class ProductAdmin(admin.ModelAdmin):
+    list_display = ('nickname', 'item_name', 'barcode', 'dominant_color', 'created_at')
+    search_fields = ('=barcode', 'nickname', 'item_name')
+    raw_id_fields = ('pattern_asset',)
+
+    def get_search_results(self, request, queryset, search_term):
+        # 13자리 숫자는 바코드 정확히 일치로만 검색 (barcode 인덱스 사용, 닉네임 LIKE 검색 생략)
+        term = search_term.strip()
+        if len(term) == 13 and term.isdigit():
+            return queryset.filter(barcode=term), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(PatternAsset)
+class PatternAssetAdmin(admin.ModelAdmin):
+    list_display = ('barcode', 'bottom_color', 'pattern_set_version', 'encoder', 'created_at')
+    search_fields = ('=barcode',)
+    list_filter = ('encoder', 'pattern_set_version')
+
 
-admin.site.register(Product)
+@admin.register(NicknameReservation)
+class NicknameReservationAdmin(admin.ModelAdmin):
+    list_display = ('nickname', 'expires_at', 'created_at')
+    search_fields = ('nickname',)
@@ -0,0 +1,224 @@
+"""
+ASGI(uvicorn 등)용 async 엔드포인트
+
+닉네임 확인은 async ORM으로 처리하고, 패턴 합성/인코딩은 렌더 전용 스레드 풀로 넘겨
+한 워커가 렌더링 중에도 다른 키오스크의 요청(키 입력마다 오는 닉네임 확인 등)을 계속 받는다.
+응답 형식은 views.py의 동기 엔드포인트와 같다.
+"""
+
+import asyncio
+import contextvars
+import json
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from .imaging import extract_product_colors, normalize_upload
+from .jobs import enqueue_pattern_job
+from .models import PatternJob, Product
+from .nicknames import NicknameTaken, get_nickname_index, save_product_nickname
+from .patterns import (
+    attach_pattern_asset,
+    find_pattern_asset,
+    get_pattern_generator,
+    get_render_executor,
+    pattern_asset_key,
+    render_asset_bytes,
+    store_pattern_asset,
+)
+from .uploads import upload_too_large
+from .views import RENDER_BUSY_RETRY_AFTER, wants_async_render
+from items.pattern_logic.encoders import get_profile
+from items.pattern_logic.metrics import timed
+from items.pattern_logic.render_cache import normalize_hex
+from items.pattern_logic.render_pool import RenderPoolBusy
+
+
+def _request_data(request):
+    """FormData(multipart / urlencoded)와 JSON 본문을 모두 dict처럼 읽음"""
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except ValueError:
+            return {}
+    return request.POST
+
+
+async def _run_in_render_executor(func, *args, **kwargs):
+    """CPU 작업을 렌더 스레드 풀에서 실행하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    # 요청 컨텍스트(단계 시간 수집 등)를 렌더 스레드에도 넘김
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_render_executor(), partial(context.run, func, *args, **kwargs),
+    )
+
+
+async def _nickname_available(nickname, token=None):
+    """
+    닉네임 사용 가능 여부 (인덱스 갱신 주기가 지났을 때만 DB 조회를 스레드에서 실행)
+
+    대부분의 호출은 메모리만 읽으므로 이벤트 루프에서 바로 답하고,
+    갱신도 공용 sync 스레드(thread_sensitive)를 잡지 않도록 별도 스레드에서 실행한다.
+    """
+    index = get_nickname_index()
+    if index.needs_sync():
+        await sync_to_async(index.sync, thread_sensitive=False)()
+    return index.is_available(nickname, token)
+
+
+# 1) 닉네임 중복 확인 (GET /api/async/products/check-nickname/?nickname=...)
+@require_GET
+async def check_nickname(request):
+    nickname = request.GET.get('nickname', '').strip()
+    token = request.GET.get('token') or None
+    available = await _nickname_available(nickname, token)
+    return JsonResponse({'exists': not available})
+
+
+@timed("db_save")
+def _save_product_with_job(product, encoder, nickname_token):
+    with transaction.atomic():
+        save_product_nickname(product, nickname_token)
+        job = PatternJob.objects.create(product=product, encoder=encoder)
+        enqueue_pattern_job(job)
+    return job
+
+
+def _save_product_with_pattern(product, key, asset, image_bytes, nickname_token):
+    # 렌더링은 이미 끝났으므로 자산을 저장하고 Product만 짧게 한 트랜잭션으로 처리
+    # (저장이 실패해도 자산은 같은 조합의 다음 요청이 재사용)
+    if asset is None:
+        asset = store_pattern_asset(key, lambda: image_bytes)
+    with transaction.atomic():
+        attach_pattern_asset(product, asset)
+        with timed("db_save"):
+            save_product_nickname(product, nickname_token)
+
+
+# 2) 패턴 생성까지 같이 처리 (POST /api/async/products/create-with-pattern/)
+@csrf_exempt
+@require_POST
+@timed("create_product_with_pattern_async")
+async def create_product_with_pattern(request):
+    """
+    views.create_product_with_pattern 의 async 버전
+
+    DB 접근은 async ORM / 짧은 sync 트랜잭션으로, 패턴 렌더링은 렌더 스레드 풀에서 처리한다.
+    """
+    data = _request_data(request)
+
+    item_name = data.get('item_name')
+    nickname = data.get('nickname')
+    met_date = data.get('met_date')
+    farewell_date = data.get('farewell_date')
+    barcode = data.get('barcode')
+    dominant_color = data.get('dominant_color')
+    image_file = request.FILES.get('image')
+    encoder = data.get('encoder') or settings.PATTERN_ENCODER_PROFILE
+    nickname_token = data.get('nickname_token') or None  # 닉네임 예약 토큰
+
+    if upload_too_large(request):
+        return JsonResponse({"detail": "사진 파일이 너무 큽니다."}, status=413)
+
+    # 필수 값 체크
+    if not all([item_name, nickname, met_date, farewell_date, barcode]):
+        return JsonResponse({"detail": "필수 값이 누락되었습니다."}, status=400)
+
+    # 닉네임 충돌은 사진 처리 / 렌더링 전에 메모리 인덱스로 먼저 거름 (최종 판정은 저장 시점)
+    if not await _nickname_available(nickname, nickname_token):
+        return JsonResponse({"detail": str(NicknameTaken(nickname))}, status=409)
+
+    # 사진 검증 / 축소 + 메타데이터 제거 후 서버에서 대표색 / 팔레트 추출 (모두 렌더 스레드에서)
+    palette = None
+    if image_file:
+        try:
+            with timed("upload_normalize"):
+                image_file = await _run_in_render_executor(normalize_upload, image_file)
+        except ValueError as e:
+            return JsonResponse({"detail": str(e)}, status=400)
+
+        with timed("color_extract"):
+            colors = await _run_in_render_executor(extract_product_colors, image_file)
+        if colors:
+            dominant_color, palette = colors
+
+    # 패턴 입력값은 Product를 저장하기 전에 검증
+    # (첫 호출에는 패턴 타일을 로드하므로 생성기 준비도 렌더 스레드에서)
+    try:
+        with timed("validate"):
+            get_profile(encoder)
+            generator = await _run_in_render_executor(get_pattern_generator)
+            generator.describe_pattern(barcode, dominant_color)
+    except ValueError as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+    if dominant_color:
+        dominant_color = normalize_hex(dominant_color)
+
+    product = Product(
+        item_name=item_name,
+        nickname=nickname,
+        met_date=met_date,
+        farewell_date=farewell_date,
+        barcode=barcode,
+        dominant_color=dominant_color,
+        palette=palette,
+    )
+
+    if image_file:
+        product.image = image_file
+
+    # 비동기 모드: 작업만 등록하고 202 응답
+    if wants_async_render(request):
+        try:
+            job = await sync_to_async(_save_product_with_job)(product, encoder, nickname_token)
+        except NicknameTaken as e:
+            return JsonResponse({"detail": str(e)}, status=409)
+        return JsonResponse(
+            {
+                "id": product.id,
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": reverse('product_pattern_status', args=[product.id]),
+            },
+            status=202,
+        )
+
+    try:
+        # 같은 조합의 패턴 자산이 있으면 렌더링 없이 재사용
+        key = await _run_in_render_executor(pattern_asset_key, barcode, dominant_color, encoder)
+        asset = await sync_to_async(find_pattern_asset)(key)
+        image_bytes = None
+        if asset is None:
+            image_bytes = await _run_in_render_executor(render_asset_bytes, key)
+        await sync_to_async(_save_product_with_pattern)(product, key, asset, image_bytes, nickname_token)
+    except NicknameTaken as e:
+        return JsonResponse({"detail": str(e)}, status=409)
+    except RenderPoolBusy as e:
+        response = JsonResponse(
+            {"detail": f"패턴 생성 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요. ({e})"},
+            status=503,
+        )
+        response['Retry-After'] = str(RENDER_BUSY_RETRY_AFTER)
+        return response
+    except Exception as e:
+        # 패턴 생성 실패 시
+        return JsonResponse(
+            {"detail": f"패턴 생성 중 오류가 발생했습니다: {e}"},
+            status=500,
+        )
+
+    return JsonResponse(
+        {
+            "id": product.id,
+            "pattern_image_url": product.pattern_image.url,
+            "pattern_info": product.pattern_info,
+        },
+        status=201,
+    )
@@ -0,0 +1,208 @@
+"""
+업로드 사진 처리 (색상 추출 / 업로드 검증 및 재인코딩)
+
+큰 휴대폰 사진도 원본 해상도로 디코딩하지 않도록 JPEG는 draft()로 디코딩 단계에서 축소하고,
+작은 샘플 이미지에서 NumPy k-means로 대표색 / 팔레트를 구한다.
+"""
+
+import io
+import logging
+import os
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+def open_downscaled(fileobj, max_side):
+    """
+    이미지를 max_side 이하로 축소해서 RGB로 읽음 (EXIF 방향 보정 포함)
+
+    JPEG는 draft()로 DCT 스케일링(1/2 ~ 1/8)을 걸어 원본 해상도로 디코딩하지 않고,
+    그 외 포맷은 thumbnail()의 reducing_gap으로 먼저 정수배 축소한 뒤 리샘플링한다.
+
+    Args:
+        fileobj: 파일 경로 또는 파일 객체 (업로드 파일이면 끝나고 처음 위치로 되돌림)
+        max_side: 결과 이미지의 긴 변 최대 길이
+
+    Returns:
+        PIL.Image: RGB 이미지
+    """
+    start = fileobj.tell() if hasattr(fileobj, "tell") else None
+    try:
+        with Image.open(fileobj) as image:
+            image.draft("RGB", (max_side, max_side))
+            image.thumbnail((max_side, max_side), Image.Resampling.BILINEAR, reducing_gap=2.0)
+            # 휴대폰 사진의 EXIF 회전 정보 반영
+            return ImageOps.exif_transpose(image).convert("RGB")
+    finally:
+        if start is not None:
+            fileobj.seek(start)
+
+
+def _init_centers(pixels, k, rng):
+    """k-means++ 초기 중심"""
+    centers = [pixels[rng.integers(len(pixels))]]
+    dist = ((pixels - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = dist.sum()
+        if total == 0:
+            break
+        centers.append(pixels[rng.choice(len(pixels), p=dist / total)])
+        dist = np.minimum(dist, ((pixels - centers[-1]) ** 2).sum(axis=1))
+    return np.array(centers, dtype=np.float32)
+
+
+def kmeans_palette(pixels, k=5, max_iter=20, time_budget_ms=50, seed=0):
+    """
+    픽셀 (N, 3) 배열을 k개 색으로 군집화 (벡터화된 k-means)
+
+    시간 예산을 넘기면 그때까지의 중심으로 끝낸다.
+
+    Args:
+        pixels: (N, 3) RGB 배열
+        k: 팔레트 색 수
+        max_iter: 최대 반복 횟수
+        time_budget_ms: 군집화에 쓸 최대 시간 (ms)
+        seed: 초기 중심 선택 시드 (같은 사진이면 같은 결과)
+
+    Returns:
+        list[tuple]: [(r, g, b), 비율] 목록, 비율이 큰 순
+    """
+    pixels = np.asarray(pixels, dtype=np.float32).reshape(-1, 3)
+    if len(pixels) == 0:
+        return []
+
+    deadline = time.perf_counter() + time_budget_ms / 1000
+    centers = _init_centers(pixels, k, np.random.default_rng(seed))
+    pixel_sq = (pixels ** 2).sum(axis=1, keepdims=True)
+
+    for _ in range(max_iter):
+        # |p - c|^2 = |p|^2 - 2 p·c + |c|^2  (N x k 거리 행렬을 한 번에)
+        dist = pixel_sq - 2 * pixels @ centers.T + (centers ** 2).sum(axis=1)
+        labels = dist.argmin(axis=1)
+
+        counts = np.bincount(labels, minlength=len(centers)).astype(np.float32)
+        sums = np.stack(
+            [np.bincount(labels, weights=pixels[:, c], minlength=len(centers)) for c in range(3)],
+            axis=1,
+        )
+        nonempty = counts > 0
+        new_centers = centers.copy()
+        new_centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+
+        converged = np.abs(new_centers - centers).max() < 0.5
+        centers = new_centers
+        if converged or time.perf_counter() > deadline:
+            break
+
+    dist = pixel_sq - 2 * pixels @ centers.T + (centers ** 2).sum(axis=1)
+    counts = np.bincount(dist.argmin(axis=1), minlength=len(centers))
+
+    order = np.argsort(-counts, kind="stable")
+    return [
+        (tuple(int(round(v)) for v in centers[i]), counts[i] / len(pixels))
+        for i in order
+        if counts[i] > 0
+    ]
+
+
+def extract_colors(fileobj, k=5, sample_side=64, time_budget_ms=50):
+    """
+    사진에서 대표색과 팔레트 추출
+
+    Args:
+        fileobj: 이미지 파일 경로 또는 파일 객체
+        k: 팔레트 색 수
+        sample_side: 군집화용 샘플 이미지의 긴 변 길이
+        time_budget_ms: k-means 시간 예산 (ms)
+
+    Returns:
+        tuple: (대표색 "#rrggbb", 팔레트 ["#rrggbb", ...]) - 가장 많은 픽셀을 차지한 색 순
+    """
+    sample = open_downscaled(fileobj, sample_side)
+    clusters = kmeans_palette(np.asarray(sample), k=k, time_budget_ms=time_budget_ms)
+    palette = ["#{:02x}{:02x}{:02x}".format(*rgb) for rgb, _ in clusters]
+    return palette[0], palette
+
+
+def extract_product_colors(image_file):
+    """
+    업로드된 물건 사진에서 대표색 / 팔레트 추출 (설정값 사용)
+
+    Returns:
+        tuple | None: (대표색, 팔레트), 추출을 끈 경우나 읽을 수 없는 이미지면 None
+                      (None이면 클라이언트가 보낸 dominant_color를 그대로 사용)
+    """
+    if not settings.PRODUCT_COLOR_EXTRACTION:
+        return None
+    try:
+        return extract_colors(
+            image_file,
+            k=settings.PRODUCT_PALETTE_SIZE,
+            sample_side=settings.PRODUCT_COLOR_SAMPLE_SIDE,
+            time_budget_ms=settings.PRODUCT_COLOR_TIME_BUDGET_MS,
+        )
+    except (OSError, ValueError, Image.DecompressionBombError):
+        logger.warning("사진 색상 추출 실패: %s", getattr(image_file, "name", image_file), exc_info=True)
+        return None
+
+
+# 업로드 사진으로 받는 포맷
+UPLOAD_FORMATS = {"JPEG", "PNG", "WEBP"}
+
+
+def inspect_image(fileobj):
+    """
+    이미지 헤더만 읽어서 포맷 / 크기 확인 (픽셀 디코딩 없음)
+
+    Returns:
+        tuple: (포맷, (가로, 세로))
+
+    Raises:
+        ValueError: 이미지가 아니거나 지원하지 않는 포맷 / 너무 큰 해상도
+    """
+    start = fileobj.tell()
+    try:
+        with Image.open(fileobj) as image:
+            fmt, size = image.format, image.size
+    except (OSError, Image.DecompressionBombError):
+        raise ValueError("이미지 파일을 읽을 수 없습니다.")
+    finally:
+        fileobj.seek(start)
+
+    if fmt not in UPLOAD_FORMATS:
+        raise ValueError(f"지원하지 않는 이미지 포맷: {fmt} (가능한 값: {', '.join(sorted(UPLOAD_FORMATS))})")
+    if size[0] * size[1] > settings.PRODUCT_IMAGE_MAX_PIXELS:
+        raise ValueError(f"이미지 해상도가 너무 큽니다: {size[0]}x{size[1]}")
+    return fmt, size
+
+
+def normalize_upload(upload):
+    """
+    업로드 사진을 저장용으로 정리
+
+    헤더 검증 → 디코딩 단계에서 PRODUCT_IMAGE_MAX_SIDE 이하로 축소 → EXIF 등 메타데이터를 뺀 JPEG로 다시 인코딩
+
+    Args:
+        upload: UploadedFile
+
+    Returns:
+        ContentFile: 저장할 JPEG (이름은 원본 이름의 확장자만 .jpg로)
+
+    Raises:
+        ValueError: 이미지가 아니거나 지원하지 않는 포맷 / 너무 큰 해상도
+    """
+    inspect_image(upload)
+    image = open_downscaled(upload, settings.PRODUCT_IMAGE_MAX_SIDE)
+
+    # exif 등을 넘기지 않으므로 메타데이터는 저장되지 않음
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=settings.PRODUCT_IMAGE_JPEG_QUALITY, optimize=True)
+
+    stem = os.path.splitext(os.path.basename(upload.name or "image"))[0] or "image"
+    return ContentFile(buffer.getvalue(), name=f"{stem}.jpg")
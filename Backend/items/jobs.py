@@ -0,0 +1,162 @@
+"""
+패턴 렌더링 백그라운드 작업
+외부 브로커 없이 프로세스 내 스레드 풀(로컬 큐)로 PatternJob을 처리한다.
+큐에 남은 작업은 DB에 그대로 있으므로 `manage.py run_pattern_jobs`로 다시 처리할 수 있다.
+처리 중(running)인 작업은 PATTERN_JOB_HEARTBEAT_SECONDS 마다 updated_at을 갱신하고,
+워커가 죽어서 PATTERN_JOB_STALE_SECONDS 동안 갱신이 없는 작업은 다시 대기 상태로 돌린다.
+"""
+
+import contextlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import PatternJob, Product
+from .patterns import attach_pattern_asset, get_or_create_pattern_asset
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """프로세스당 하나의 작업 스레드 풀"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.PATTERN_JOB_WORKERS,
+                    thread_name_prefix='pattern-job',
+                )
+    return _executor
+
+
+def enqueue_pattern_job(job):
+    """트랜잭션이 커밋된 뒤 작업을 스레드 풀에 넣음"""
+    transaction.on_commit(lambda: get_executor().submit(run_pattern_job, job.pk))
+
+
+def _fail_job(job_id, error):
+    """처리 중인 작업을 실패로 기록 (인스턴스 상태와 무관하게 DB 행만 갱신)"""
+    PatternJob.objects.filter(pk=job_id, status=PatternJob.STATUS_RUNNING).update(
+        status=PatternJob.STATUS_FAILED, error=error, updated_at=timezone.now(),
+    )
+
+
+@contextlib.contextmanager
+def job_heartbeat(job_id, interval=None):
+    """
+    블록을 실행하는 동안 별도 스레드에서 주기적으로 작업의 updated_at을 갱신
+    (렌더링이 오래 걸려도 reclaim_stale_jobs 가 살아 있는 작업을 다시 대기시키지 않도록)
+    """
+    if interval is None:
+        interval = settings.PATTERN_JOB_HEARTBEAT_SECONDS
+    stop = threading.Event()
+
+    def beat():
+        try:
+            while not stop.wait(interval):
+                PatternJob.objects.filter(pk=job_id, status=PatternJob.STATUS_RUNNING).update(
+                    updated_at=timezone.now(),
+                )
+        except Exception:
+            logger.exception("패턴 작업 #%s 상태 갱신 실패", job_id)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name=f'pattern-job-heartbeat-{job_id}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_pattern_job(job_id):
+    """
+    작업 하나를 처리 (렌더링 → Product에 원자적으로 연결)
+
+    가져간 뒤의 어느 단계에서 실패해도(렌더링, DB 잠금, 삭제된 물건 등) 작업은 failed로 남긴다.
+
+    Returns:
+        bool: 이 호출에서 작업을 처리했으면 True (다른 워커가 가져갔으면 False)
+    """
+    try:
+        # queued → running 으로 바꾸는 데 성공한 워커만 처리 (중복 처리 방지)
+        claimed = PatternJob.objects.filter(
+            pk=job_id, status=PatternJob.STATUS_QUEUED,
+        ).update(status=PatternJob.STATUS_RUNNING, progress=10, updated_at=timezone.now())
+        if not claimed:
+            return False
+
+        try:
+            job = PatternJob.objects.select_related('product').get(pk=job_id)
+            # 백그라운드 작업은 렌더 풀이 가득 차도 바로 실패하지 않고 PATTERN_JOB_RENDER_TIMEOUT 까지 기다림
+            with job_heartbeat(job_id):
+                asset = get_or_create_pattern_asset(
+                    job.product.barcode, job.product.dominant_color, job.encoder or None,
+                    wait=True, timeout=settings.PATTERN_JOB_RENDER_TIMEOUT,
+                )
+
+            # 렌더 결과와 작업 완료 상태를 한 트랜잭션으로 반영
+            with transaction.atomic():
+                product = Product.objects.select_for_update().get(pk=job.product_id)
+                attach_pattern_asset(product, asset)
+                product.save(update_fields=['pattern_asset', 'pattern_image', 'pattern_info', 'updated_at'])
+
+                job.status = PatternJob.STATUS_DONE
+                job.progress = 100
+                job.save(update_fields=['status', 'progress', 'updated_at'])
+        except Exception as e:
+            logger.exception("패턴 작업 #%s 실패", job_id)
+            _fail_job(job_id, str(e))
+        return True
+    finally:
+        close_old_connections()
+
+
+def reclaim_stale_jobs(stale_seconds=None):
+    """
+    running 상태로 오래 갱신이 없는 작업(처리하던 워커가 죽은 작업)을 다시 대기 상태로 돌림
+
+    Args:
+        stale_seconds: 이 시간(초) 동안 updated_at이 그대로면 죽은 것으로 봄 (None이면 설정값)
+
+    Returns:
+        int: 되돌린 작업 수
+    """
+    if stale_seconds is None:
+        stale_seconds = settings.PATTERN_JOB_STALE_SECONDS
+    now = timezone.now()
+    count = PatternJob.objects.filter(
+        status=PatternJob.STATUS_RUNNING,
+        updated_at__lt=now - timedelta(seconds=stale_seconds),
+    ).update(status=PatternJob.STATUS_QUEUED, progress=0, updated_at=now)
+    if count:
+        logger.warning("처리가 멈춘 패턴 작업 %d건을 다시 대기 상태로 돌렸습니다", count)
+    return count
+
+
+def process_pending_jobs(limit=None, stale_seconds=None):
+    """
+    DB에 대기 중인 작업(과 처리가 멈춘 작업)을 현재 스레드에서 차례로 처리
+
+    Returns:
+        int: 처리한 작업 수
+    """
+    reclaim_stale_jobs(stale_seconds)
+    job_ids = PatternJob.objects.filter(
+        status=PatternJob.STATUS_QUEUED,
+    ).order_by('created_at').values_list('pk', flat=True)
+    if limit is not None:
+        job_ids = job_ids[:limit]
+
+    return sum(1 for job_id in list(job_ids) if run_pattern_job(job_id))
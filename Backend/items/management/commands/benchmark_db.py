@@ -0,0 +1,182 @@
+import io
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+from PIL import Image
+
+from items.nicknames import get_nickname_index
+
+
+class Command(BaseCommand):
+    help = (
+        "키오스크 동시 등록을 흉내 내어 SQLite 쓰기 처리량을 "
+        "Django 기본 설정과 settings.SQLITE_OPTIONS 설정으로 비교합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8, help="동시에 등록하는 스레드 수")
+        parser.add_argument("--readers", type=int, default=2, help="등록하는 동안 목록을 읽는 스레드 수")
+        parser.add_argument("--transactions", type=int, default=20, help="쓰기 스레드당 등록 수")
+        parser.add_argument("--output", help="결과 JSON을 저장할 경로")
+
+    def handle(self, *args, **options):
+        default = settings.DATABASES["default"]
+        profiles = [
+            # 튜닝 전: Django 기본값 (rollback journal, DEFERRED 트랜잭션, 5초 timeout, 요청마다 새 연결)
+            ("default", {}, 0),
+            # 튜닝 후: 설정 파일의 운영 프로필
+            ("tuned", default.get("OPTIONS", {}), default.get("CONN_MAX_AGE", 0)),
+        ]
+
+        results = {}
+        for number, (name, db_options, conn_max_age) in enumerate(profiles, start=1):
+            with tempfile.TemporaryDirectory(prefix="db_bench_") as tmp:
+                results[name] = self.run_profile(
+                    number, name, tmp, db_options, conn_max_age, options,
+                )
+
+        self.stdout.write(
+            f"{'profile':<10}{'writes/s':>10}{'reads/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}{'errors':>8}"
+        )
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<10}{r['writes_per_sec']:>10.1f}{r['reads_per_sec']:>10.1f}"
+                f"{r['write_p50_ms']:>9.2f}{r['write_p95_ms']:>9.2f}{r['write_max_ms']:>9.2f}{r['errors']:>8}"
+            )
+        if results["default"]["writes_per_sec"]:
+            ratio = results["tuned"]["writes_per_sec"] / results["default"]["writes_per_sec"]
+            self.stdout.write(f"쓰기 처리량 {ratio:.2f}배")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+                f.write("\n")
+            self.stdout.write(f"결과 저장: {options['output']}")
+
+    def run_profile(self, number, name, tmp, db_options, conn_max_age, options):
+        """
+        임시 DB / MEDIA_ROOT로 default 연결을 바꿔서 실제 등록 요청을 동시에 보냄
+
+        쓰기 한 번은 키오스크의 등록 요청 그대로
+        (POST /api/products/create-with-pattern/: 사진 정리 → 패턴 렌더링 → 자산 / Product 저장)이고,
+        바코드가 모두 달라서 매번 렌더링한다. 테스트 클라이언트도 요청 시작 / 끝 시그널을 보내므로
+        연결은 CONN_MAX_AGE에 따라 요청마다 닫히거나 유지된다.
+        """
+        config = connections.configure_settings({
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": os.path.join(tmp, "bench.sqlite3"),
+                "OPTIONS": dict(db_options),
+                "CONN_MAX_AGE": conn_max_age,
+            }
+        })["default"]
+
+        original = connections.settings["default"]
+        connections["default"].close()
+        del connections["default"]
+        connections.settings["default"] = config
+        try:
+            with override_settings(
+                MEDIA_ROOT=os.path.join(tmp, "media"),
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ):
+                call_command("migrate", verbosity=0)
+                # 닉네임 인덱스는 프로세스에 하나라 이전 프로필의 DB 내용을 버리고 다시 읽음
+                get_nickname_index().rebuild()
+                return self.run_threads(number, name, options)
+        finally:
+            connections["default"].close()
+            del connections["default"]
+            connections.settings["default"] = original
+
+    def run_threads(self, number, name, options):
+        writers = options["writers"]
+        per_writer = options["transactions"]
+        photo = self.sample_photo()
+        latencies = []
+        statuses = Counter()
+        reads = [0]
+        lock = threading.Lock()
+        writing = threading.Event()
+        start = threading.Barrier(writers + options["readers"] + 1)
+
+        def writer(index):
+            client = Client()
+            start.wait()
+            try:
+                for n in range(per_writer):
+                    started = time.perf_counter()
+                    response = client.post("/api/products/create-with-pattern/", {
+                        "item_name": "bench",
+                        "nickname": f"{name}-{index}-{n}",
+                        "met_date": "2020-01-01",
+                        "farewell_date": "2024-01-01",
+                        # 프로필 / 스레드 / 순번마다 다른 바코드 (렌더 캐시 / 자산 재사용 없이 매번 렌더링)
+                        "barcode": f"{number}{index:04d}{n:08d}",
+                        "dominant_color": "#112233",
+                        "image": SimpleUploadedFile("photo.jpg", photo, content_type="image/jpeg"),
+                    })
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        statuses[response.status_code] += 1
+                        if response.status_code == 201:
+                            latencies.append(elapsed)
+            finally:
+                connections.close_all()
+
+        def reader():
+            client = Client()
+            start.wait()
+            try:
+                while writing.is_set():
+                    response = client.get("/api/products/")
+                    if response.status_code == 200:
+                        with lock:
+                            reads[0] += 1
+            finally:
+                connections.close_all()
+
+        writing.set()
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(options["readers"])]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads[:writers]:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        writing.clear()
+        for thread in threads[writers:]:
+            thread.join()
+
+        latencies.sort()
+        return {
+            "writes": len(latencies),
+            "errors": sum(count for code, count in statuses.items() if code != 201),
+            "status_counts": {str(code): count for code, count in sorted(statuses.items())},
+            "seconds": round(elapsed, 3),
+            "writes_per_sec": round(len(latencies) / elapsed, 1),
+            "reads_per_sec": round(reads[0] / elapsed, 1),
+            "write_p50_ms": round(statistics.median(latencies), 3) if latencies else 0.0,
+            "write_p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3) if latencies else 0.0,
+            "write_max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        }
+
+    @staticmethod
+    def sample_photo():
+        """키오스크 웹캠 캡처 크기의 JPEG"""
+        buffer = io.BytesIO()
+        Image.new("RGB", (1280, 720), (200, 30, 40)).save(buffer, "JPEG", quality=90)
+        return buffer.getvalue()
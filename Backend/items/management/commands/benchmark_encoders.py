@@ -0,0 +1,45 @@
+import json
+import logging
+
+from django.core.management.base import BaseCommand
+
+from items.pattern_logic.benchmark import benchmark_encoders, random_barcodes, random_hex_colors
+from items.pattern_logic.encoders import RASTER_PROFILES
+from items.patterns import get_pattern_generator
+
+
+class Command(BaseCommand):
+    help = "인코더 프로필별 패턴 이미지 인코딩 시간과 크기를 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=10, help="측정할 바코드 수")
+        parser.add_argument("--repeat", type=int, default=3, help="바코드당 인코딩 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0, help="바코드/색상 생성 시드")
+        parser.add_argument("--profile", action="append", choices=RASTER_PROFILES,
+                            help="측정할 프로필 (여러 번 지정 가능, 기본: 전체)")
+        parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+
+    def handle(self, *args, **options):
+        logging.getLogger("items.pattern_logic").setLevel(logging.WARNING)
+        generator = get_pattern_generator()
+
+        barcodes = random_barcodes(options["count"], options["seed"])
+        colors = random_hex_colors(options["count"], options["seed"])
+        results = benchmark_encoders(
+            generator,
+            barcodes,
+            colors=colors,
+            profiles=options["profile"],
+            repeat=options["repeat"],
+        )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        self.stdout.write(f"{'profile':<10}{'mean ms':>10}{'median ms':>12}{'mean bytes':>14}")
+        for row in results:
+            self.stdout.write(
+                f"{row['profile']:<10}{row['encode']['mean_ms']:>10.2f}"
+                f"{row['encode']['median_ms']:>12.2f}{row['bytes_mean']:>14,}"
+            )
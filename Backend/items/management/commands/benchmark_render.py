@@ -0,0 +1,126 @@
+import io
+import json
+import logging
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from PIL import Image
+
+from items.pattern_logic.benchmark import (
+    _summary,
+    compare_results,
+    make_synthetic_tiles,
+    random_barcodes,
+    random_hex_colors,
+    run_stage_suite,
+)
+from items.patterns import reset_pattern_generator
+
+
+class Command(BaseCommand):
+    help = "패턴 생성 단계별 / 전체 요청 벤치마크를 실행하고 결과를 JSON으로 출력합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tile-size", type=int, default=256, help="합성 타일 한 변 크기 (px)")
+        parser.add_argument("--assets", action="store_true", help="합성 타일 대신 설정의 PATTERN_DIR 타일 사용")
+        parser.add_argument("--count", type=int, default=10, help="측정할 바코드 수")
+        parser.add_argument("--repeat", type=int, default=3, help="바코드당 반복 횟수")
+        parser.add_argument("--seed", type=int, default=0, help="바코드/색상/합성 타일 시드")
+        parser.add_argument("--no-request", action="store_true", help="Django 요청 단계 생략")
+        parser.add_argument("--output", help="결과 JSON을 저장할 경로 (기본: 표준 출력)")
+        parser.add_argument("--compare", help="비교할 이전 결과 JSON 경로")
+
+    def handle(self, *args, **options):
+        from django.conf import settings
+
+        logging.getLogger("items.pattern_logic").setLevel(logging.WARNING)
+        pattern_dir = str(settings.PATTERN_DIR) if options["assets"] else None
+
+        results = run_stage_suite(
+            pattern_dir=pattern_dir,
+            tile_size=options["tile_size"],
+            count=options["count"],
+            repeat=options["repeat"],
+            seed=options["seed"],
+        )
+        if not options["no_request"]:
+            request_stage = self.benchmark_request(pattern_dir, options)
+            if request_stage is not None:
+                results["stages"]["django_request"] = request_stage
+
+        output = json.dumps(results, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+            self.stdout.write(f"결과 저장: {options['output']}")
+        elif not options["compare"]:
+            self.stdout.write(output)
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as f:
+                baseline = json.load(f)
+            self.stdout.write(f"{'stage':<22}{'baseline ms':>14}{'current ms':>14}{'ratio':>8}")
+            for row in compare_results(results, baseline):
+                base = f"{row['baseline_ms']:.3f}" if row["baseline_ms"] is not None else "-"
+                ratio = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+                self.stdout.write(f"{row['stage']:<22}{base:>14}{row['current_ms']:>14.3f}{ratio:>8}")
+
+    def benchmark_request(self, pattern_dir, options):
+        """
+        POST /api/products/create-with-pattern/ 전체 요청 시간
+        (사진 업로드 처리 + 렌더링 + 저장, 각 요청의 DB 변경은 롤백하고 파일은 임시 MEDIA_ROOT에 저장)
+        """
+        count = options["count"] * options["repeat"]
+        barcodes = random_barcodes(count, options["seed"] + 1)
+        colors = random_hex_colors(count, options["seed"] + 1)
+
+        photo = io.BytesIO()
+        Image.new("RGB", (640, 480), (120, 80, 40)).save(photo, "JPEG")
+
+        samples = []
+        with tempfile.TemporaryDirectory(prefix="pattern_bench_media_") as media_root:
+            if pattern_dir is None:
+                pattern_dir = make_synthetic_tiles(
+                    f"{media_root}/tiles", options["tile_size"], options["seed"],
+                )
+
+            with override_settings(
+                PATTERN_DIR=pattern_dir,
+                MEDIA_ROOT=media_root,
+                ALLOWED_HOSTS=["testserver"],
+            ):
+                reset_pattern_generator()
+                client = Client()
+                try:
+                    for index, (barcode, color) in enumerate(zip(barcodes, colors)):
+                        image = io.BytesIO(photo.getvalue())
+                        image.name = "bench.jpg"
+                        data = {
+                            "item_name": "bench",
+                            "nickname": f"__bench_{index}",
+                            "met_date": "2020-01-01",
+                            "farewell_date": "2024-01-01",
+                            "barcode": barcode,
+                            "dominant_color": color,
+                            "image": image,
+                        }
+                        with transaction.atomic():
+                            started = time.perf_counter()
+                            response = client.post("/api/products/create-with-pattern/", data)
+                            samples.append((time.perf_counter() - started) * 1000)
+                            transaction.set_rollback(True)
+
+                        if response.status_code != 201:
+                            # 마이그레이션 누락 등 환경 문제: 실패한 요청 시간은 결과에 넣지 않음
+                            self.stderr.write(
+                                f"요청 단계 중단 ({response.status_code}): "
+                                f"{response.content.decode('utf-8', 'replace')[:200]}"
+                            )
+                            return None
+                finally:
+                    reset_pattern_generator()
+
+        return _summary(samples)
@@ -0,0 +1,41 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from items.pattern_logic.pattern_library import compile_pattern_set
+from items.pattern_logic.pattern_set import PATTERN_SET_FILENAME, read_header
+
+
+class Command(BaseCommand):
+    help = (
+        "패턴 PNG 디렉토리를 패턴 세트 파일(pattern_set.bin) 하나로 컴파일합니다. "
+        "실행 중인 워커는 다음 요청에서 새 세트로 전환합니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--pattern-dir", default=None, help="패턴 이미지 디렉토리 (기본: settings.PATTERN_DIR)")
+        parser.add_argument("--output", default=None, help="저장 경로 (기본: 패턴 디렉토리의 pattern_set.bin, 다른 경로는 워커가 읽지 않음)")
+        parser.add_argument("--check", action="store_true", help="컴파일하지 않고 기존 파일의 헤더만 출력")
+
+    def handle(self, *args, **options):
+        pattern_dir = options["pattern_dir"] or str(settings.PATTERN_DIR)
+
+        if options["check"]:
+            path = options["output"] or os.path.join(pattern_dir, PATTERN_SET_FILENAME)
+            try:
+                header = read_header(path)
+            except (OSError, ValueError) as e:
+                raise CommandError(str(e))
+            self.stdout.write(
+                f"{path}: 버전 {header['version']}, 타일 {header['tile_size']}px, "
+                f"패턴 {int(header['present'].sum())}개"
+            )
+            return
+
+        try:
+            path, version, count = compile_pattern_set(pattern_dir, options["output"])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"완료: {path} (버전 {version}, 패턴 {count}개)"))
@@ -0,0 +1,69 @@
+import json
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from items.pattern_logic.batch import read_batch_file, validate_many
+from items.patterns import get_pattern_generator
+
+
+class Command(BaseCommand):
+    help = "CSV/JSONL 바코드 목록으로 패턴 이미지를 일괄 생성합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("input", help="barcode(, bottom_color) 컬럼이 있는 CSV 또는 JSONL 파일")
+        parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+        parser.add_argument("--chunksize", type=int, default=16, help="워커에 한 번에 넘기는 작업 수")
+        parser.add_argument("--results", help="항목별 결과를 JSONL로 기록할 경로")
+        parser.add_argument("--progress-every", type=int, default=1000, help="진행 상황 출력 간격 (항목 수)")
+        parser.add_argument("--verbose-render", action="store_true", help="항목별 렌더링 INFO 로그 출력")
+        parser.add_argument("--check-digit", action="store_true", help="EAN-13 체크 숫자가 틀린 바코드는 실패로 처리")
+        parser.add_argument("--validate-only", action="store_true", help="렌더링 없이 바코드 검증만 수행")
+
+    def handle(self, *args, **options):
+        generator = None if options["validate_only"] else get_pattern_generator()
+        if not options["verbose_render"]:
+            # 수만 건을 처리할 때 항목마다 찍히는 INFO 로그는 생략
+            logging.getLogger("items.pattern_logic").setLevel(logging.WARNING)
+
+        try:
+            items = read_batch_file(options["input"])
+            results_file = open(options["results"], "w", encoding="utf-8") if options["results"] else None
+        except OSError as e:
+            raise CommandError(str(e))
+
+        ok = failed = 0
+        started = time.perf_counter()
+        try:
+            if generator is None:
+                results = validate_many(items, check_digit=options["check_digit"])
+            else:
+                results = generator.render_many(
+                    items, workers=options["workers"], chunksize=options["chunksize"],
+                    check_digit=options["check_digit"],
+                )
+            for result in results:
+                if result["error"] is None:
+                    ok += 1
+                else:
+                    failed += 1
+                    self.stderr.write(f"[{result['index']}] {result['barcode']}: {result['error']}")
+
+                if results_file is not None:
+                    results_file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+                done = ok + failed
+                if options["progress_every"] and done % options["progress_every"] == 0:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(f"{done}건 처리 ({done / elapsed:.1f}건/초)")
+        finally:
+            if results_file is not None:
+                results_file.close()
+
+        elapsed = time.perf_counter() - started
+        total = ok + failed
+        rate = total / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 성공 {ok}건, 실패 {failed}건, {elapsed:.2f}초 ({rate:.1f}건/초)"
+        ))
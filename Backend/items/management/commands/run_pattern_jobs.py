@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from items.jobs import process_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "DB에 대기 중인 패턴 작업(PatternJob)을 처리합니다. "
+        "(서버 재시작으로 남은 작업 / 처리 중 멈춘 작업 복구용)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="종료하지 않고 주기적으로 계속 처리")
+        parser.add_argument("--interval", type=float, default=2.0, help="--loop 모드의 조회 간격 (초)")
+        parser.add_argument("--limit", type=int, default=None, help="한 번에 처리할 최대 작업 수")
+        parser.add_argument(
+            "--stale-seconds", type=float, default=None,
+            help="running 상태로 이 시간(초) 동안 갱신이 없으면 다시 처리 (기본: PATTERN_JOB_STALE_SECONDS)",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = process_pending_jobs(limit=options["limit"], stale_seconds=options["stale_seconds"])
+            if count:
+                self.stdout.write(f"패턴 작업 {count}건 처리")
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
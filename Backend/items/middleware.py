@@ -0,0 +1,51 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from items.pattern_logic.metrics import collect_timings
+
+
+def server_timing_header(timings):
+    """[(단계 이름, 초), ...] → 'compose;dur=12.3, encode;dur=40.1' (같은 단계는 합산)"""
+    totals = {}
+    for stage, seconds in timings:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in totals.items())
+
+
+class ServerTimingMiddleware:
+    """
+    요청 처리 중 기록된 단계 시간을 Server-Timing 응답 헤더로 내보냄
+    settings.PATTERN_SERVER_TIMING 이 True일 때만 동작 (브라우저 개발자 도구에서 확인용)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.PATTERN_SERVER_TIMING:
+            return self.get_response(request)
+
+        with collect_timings() as timings:
+            response = self.get_response(request)
+        self.add_header(response, timings)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.PATTERN_SERVER_TIMING:
+            return await self.get_response(request)
+
+        with collect_timings() as timings:
+            response = await self.get_response(request)
+        self.add_header(response, timings)
+        return response
+
+    def add_header(self, response, timings):
+        if timings:
+            response['Server-Timing'] = server_timing_header(timings)
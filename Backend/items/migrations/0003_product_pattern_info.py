@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0002_product_pattern_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='pattern_info',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
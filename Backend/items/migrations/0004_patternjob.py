@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0003_product_pattern_info'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PatternJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '진행 중'), ('done', '완료'), ('failed', '실패')], db_index=True, default='queued', max_length=10)),
+                ('progress', models.PositiveSmallIntegerField(default=0)),
+                ('encoder', models.CharField(blank=True, max_length=20)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pattern_jobs', to='items.product')),
+            ],
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_existing_patterns(apps, schema_editor):
+    """
+    pattern_info에 패턴 세트 버전이 기록된 기존 물건을 PatternAsset에 연결
+    (버전 정보가 없는 예전 물건은 그대로 둠)
+    """
+    Product = apps.get_model('items', 'Product')
+    PatternAsset = apps.get_model('items', 'PatternAsset')
+    db_alias = schema_editor.connection.alias
+
+    products = Product.objects.using(db_alias).exclude(pattern_image='').exclude(pattern_image__isnull=True)
+    for product in products.iterator():
+        info = product.pattern_info or {}
+        version = info.get('pattern_set_version')
+        if not version:
+            continue
+
+        bottom = (info.get('bottom_color_hex') or '').strip().lstrip('#').lower()
+        asset, _ = PatternAsset.objects.using(db_alias).get_or_create(
+            barcode=product.barcode,
+            bottom_color=f"#{bottom}" if bottom else '',
+            pattern_set_version=version,
+            encoder=info.get('encoder') or 'default',
+            defaults={'image': product.pattern_image.name, 'pattern_info': info},
+        )
+        product.pattern_asset = asset
+        product.save(update_fields=['pattern_asset'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0005_product_updated_at_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='barcode',
+            field=models.CharField(db_index=True, max_length=13),
+        ),
+        migrations.CreateModel(
+            name='PatternAsset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('barcode', models.CharField(max_length=13)),
+                ('bottom_color', models.CharField(blank=True, max_length=7)),
+                ('pattern_set_version', models.CharField(max_length=16)),
+                ('encoder', models.CharField(max_length=20)),
+                ('image', models.ImageField(upload_to='pattern_outputs/')),
+                ('pattern_info', models.JSONField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('barcode', 'bottom_color', 'pattern_set_version', 'encoder'), name='pattern_asset_unique_render')],
+            },
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='pattern_asset',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='items.patternasset'),
+        ),
+        migrations.RunPython(link_existing_patterns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0006_patternasset'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='patternjob',
+            name='status',
+            field=models.CharField(choices=[('queued', '대기'), ('running', '진행 중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='patternjob',
+            index=models.Index(fields=['status', 'created_at'], name='pattern_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='patternjob',
+            index=models.Index(fields=['product', '-created_at', '-id'], name='pattern_job_product_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('items', '0008_nicknamereservation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='nicknamereservation',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
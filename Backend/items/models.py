@@ -1,11 +1,41 @@
 from django.db import models
 
+
+class PatternAsset(models.Model):
+    """
+    렌더링된 패턴 이미지 (바코드, 하단 색, 패턴 세트 버전, 인코더 조합당 하나)
+    같은 조합으로 들어온 물건은 새로 렌더링하지 않고 이 자산을 함께 가리킨다.
+    """
+
+    barcode = models.CharField(max_length=13)
+    bottom_color = models.CharField(max_length=7, blank=True)        # 정규화된 "#rrggbb" (없으면 빈 문자열)
+    pattern_set_version = models.CharField(max_length=16)            # PatternLibrary.version
+    encoder = models.CharField(max_length=20)                        # 인코더 프로필 (파일 형식이 달라짐)
+
+    image = models.ImageField(upload_to='pattern_outputs/')
+    pattern_info = models.JSONField(blank=True, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # 조합당 하나 (바코드로 시작하는 인덱스라 바코드 조회에도 사용됨)
+            models.UniqueConstraint(
+                fields=['barcode', 'bottom_color', 'pattern_set_version', 'encoder'],
+                name='pattern_asset_unique_render',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.barcode} {self.bottom_color or '-'} ({self.pattern_set_version}, {self.encoder})"
+
+
 class Product(models.Model):
     item_name = models.CharField(max_length=100)          # 물건 이름
     nickname = models.CharField(max_length=50, unique=True)  # 닉네임 (중복 불가)
     met_date = models.DateField()                             # 물건과 만난 날짜
     farewell_date = models.DateField()                        # 물건과 헤어지는 날짜
-    barcode = models.CharField(max_length = 13)
+    barcode = models.CharField(max_length = 13, db_index=True)
     
     # 색 추출 기능
     image = models.ImageField(upload_to='product_images/', blank=True, null=True)  # 물건 이미지: 웹캠 캡처 or 파일 업로드 모두 여기로 저장
@@ -14,8 +44,73 @@ class Product(models.Model):
     
     # 패턴 이미지
     pattern_image = models.ImageField(upload_to='pattern_outputs/', blank=True, null=True)
+    pattern_info = models.JSONField(blank=True, null=True)  # 패턴 구성 정보 (사분면별 행/열/회전, 색상)
+    pattern_asset = models.ForeignKey(
+        PatternAsset, on_delete=models.SET_NULL, blank=True, null=True, related_name='products',
+    )  # 공유 패턴 자산 (pattern_image / pattern_info는 이 자산의 값을 복사해 둔 것)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # 패턴 연결 등 변경 시각 (목록 Last-Modified / ETag용)
+
+    class Meta:
+        indexes = [
+            # 아카이브 목록 정렬 / 커서 페이지네이션 (-created_at, -id)
+            models.Index(fields=['-created_at', '-id'], name='product_created_id_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.item_name} ({self.nickname}) - {self.barcode}"
+
+
+class NicknameReservation(models.Model):
+    """
+    닉네임 임시 예약 (닉네임 페이지에서 확정한 뒤 등록 요청까지 다른 키오스크가 같은 닉네임을 쓰지 못하게)
+    등록 요청에 토큰을 함께 보내면 예약이 사용되고 삭제된다.
+    취소 / 다른 닉네임으로 변경은 행을 지우지 않고 만료시켜서 다른 프로세스도 변경을 볼 수 있게 한다.
+    """
+
+    nickname = models.CharField(max_length=50, unique=True)
+    token = models.CharField(max_length=32, unique=True)
+    expires_at = models.DateTimeField(db_index=True)  # 지난 예약은 다음 예약 때 정리
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    # 예약 / 연장 / 취소 시각 - 다른 프로세스의 NicknameIndex가 이 값으로 바뀐 예약만 다시 읽음
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.nickname} (~{self.expires_at:%Y-%m-%d %H:%M})"
+
+
+class PatternJob(models.Model):
+    """패턴 렌더링 백그라운드 작업 (POST /api/products/create-with-pattern/ 비동기 모드)"""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, '대기'),
+        (STATUS_RUNNING, '진행 중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name='pattern_jobs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    progress = models.PositiveSmallIntegerField(default=0)   # 0 ~ 100
+    encoder = models.CharField(max_length=20, blank=True)    # 인코더 프로필 (빈 값이면 설정 기본값)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # 대기 작업을 오래된 순으로 가져오기 (process_pending_jobs, status 단독 조회도 이 인덱스 사용)
+            models.Index(fields=['status', 'created_at'], name='pattern_job_status_idx'),
+            # 물건의 최근 작업 (pattern-status 엔드포인트)
+            models.Index(fields=['product', '-created_at', '-id'], name='pattern_job_product_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.item_name} ({self.nickname}) - {self.barcode}"
\ No newline at end of file
+        return f"PatternJob #{self.pk} ({self.status}) - product {self.product_id}"
@@ -0,0 +1,333 @@
+"""
+닉네임 사용 가능 여부 확인 / 임시 예약
+
+닉네임 페이지는 입력이 멈출 때마다(debounce) 중복 확인을 보내므로,
+프로세스마다 사용 중 / 예약 중인 닉네임을 메모리에 두고 DB 조회 없이 답한다.
+다른 프로세스의 변경은 NICKNAME_INDEX_REFRESH_SECONDS 간격으로 증분 조회해서 반영한다.
+  - 물건: id 기준 (새로 생긴 물건만)
+  - 예약: updated_at 기준 (예약 / 연장 / 취소가 모두 updated_at을 바꾸고, 취소도 행을 지우지 않고 만료시킴)
+물건 삭제 / 닉네임 수정까지 반영하도록 NICKNAME_INDEX_REBUILD_SECONDS 마다 전체를 다시 읽는다.
+
+확인은 안내용이고, 실제 중복은 예약(DB unique)과 Product 저장 시점에 최종 판정한다.
+"""
+
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import NicknameReservation, Product
+
+
+class NicknameTaken(Exception):
+    """이미 쓰이고 있거나 다른 사람이 예약한 닉네임 (HTTP 409로 응답)"""
+
+    def __init__(self, nickname):
+        super().__init__(f"이미 사용 중인 닉네임입니다: {nickname}")
+        self.nickname = nickname
+
+
+# 예약 증분 조회 때 마지막으로 본 updated_at보다 이만큼 앞에서부터 다시 읽음 (초)
+# (먼저 시각을 찍고 늦게 커밋된 예약을 놓치지 않도록, 같은 예약을 다시 읽어도 결과는 같음)
+RESERVATION_REFRESH_OVERLAP = 5
+
+
+class NicknameIndex:
+    """
+    사용 중인 닉네임 집합 + 예약 목록 (프로세스당 하나, get_nickname_index() 사용)
+
+    is_available()은 메모리만 읽으므로 async 뷰에서도 바로 호출할 수 있고,
+    DB를 읽어야 하는 갱신은 needs_sync() / sync()로 따로 실행한다.
+
+    갱신은 DB를 잠금 없이 읽은 뒤 잠금 안에서 교체하므로, 읽는 동안 들어온 add / reserve / release를
+    기록해 두었다가 교체 후 다시 적용한다 (갱신 때문에 방금 저장 / 예약한 닉네임이 빠지지 않도록).
+    """
+
+    def __init__(self, refresh_seconds=2, rebuild_seconds=300):
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()  # 갱신(rebuild / refresh)은 한 번에 하나만
+        self._recorded = None  # 갱신 중에 들어온 변경 [(종류, 닉네임, 값)]
+        self._taken = set()
+        self._reserved = {}  # 닉네임 → (토큰, 만료 시각)
+        self._last_product_id = 0
+        self._reservations_seen = None  # 마지막으로 읽은 예약의 updated_at
+        self._refreshed_at = None
+        self._rebuilt_at = None
+
+    def _apply(self, change):
+        """변경 하나를 반영 (잠금 안에서 호출, 갱신 중이면 기록)"""
+        kind, nickname, value = change
+        if kind == 'add':
+            self._taken.add(nickname)
+            self._reserved.pop(nickname, None)
+        elif kind == 'reserve':
+            self._reserved[nickname] = value
+        else:
+            self._reserved.pop(nickname, None)
+        if self._recorded is not None:
+            self._recorded.append(change)
+
+    def _recording(self, read):
+        """read()가 DB를 읽는 동안 들어온 변경을 기록 (read는 교체 후 _replay_recorded 호출)"""
+        with self._lock:
+            self._recorded = []
+        try:
+            read()
+        finally:
+            with self._lock:
+                self._recorded = None
+
+    def _replay_recorded(self):
+        """DB를 읽는 동안 들어온 변경을 다시 적용 (잠금 안에서 호출)"""
+        recorded, self._recorded = self._recorded, None
+        for change in recorded or ():
+            self._apply(change)
+
+    def rebuild(self):
+        """DB에서 전체를 다시 읽음"""
+        with self._sync_lock:
+            self._recording(self._rebuild)
+
+    def _rebuild(self):
+        now = timezone.now()
+        taken = set()
+        last_product_id = 0
+        for pk, nickname in Product.objects.values_list('id', 'nickname').iterator():
+            taken.add(nickname)
+            last_product_id = max(last_product_id, pk)
+        reserved = {}
+        reservations_seen = now
+        for nickname, token, expires_at, updated_at in NicknameReservation.objects.filter(
+            expires_at__gt=now,
+        ).values_list('nickname', 'token', 'expires_at', 'updated_at'):
+            reserved[nickname] = (token, expires_at)
+            reservations_seen = max(reservations_seen, updated_at)
+
+        with self._lock:
+            self._taken = taken
+            self._reserved = reserved
+            self._last_product_id = last_product_id
+            self._reservations_seen = reservations_seen
+            self._rebuilt_at = self._refreshed_at = time.monotonic()
+            self._replay_recorded()
+
+    def refresh(self):
+        """
+        마지막으로 본 이후 바뀐 물건 / 예약만 반영
+        (물건은 id, 예약은 updated_at 인덱스 범위 조회 한 번씩)
+        """
+        with self._sync_lock:
+            self._recording(self._refresh)
+
+    def _refresh(self):
+        products = list(
+            Product.objects.filter(id__gt=self._last_product_id).values_list('id', 'nickname')
+        )
+        since = self._reservations_seen - timedelta(seconds=RESERVATION_REFRESH_OVERLAP)
+        reservations = list(
+            NicknameReservation.objects.filter(updated_at__gt=since)
+            .values_list('nickname', 'token', 'expires_at', 'updated_at')
+        )
+        with self._lock:
+            for pk, nickname in products:
+                self._taken.add(nickname)
+                self._last_product_id = max(self._last_product_id, pk)
+            for nickname, token, expires_at, updated_at in reservations:
+                # 취소 / 변경된 예약은 만료 시각이 지난 상태로 들어옴
+                self._reserved[nickname] = (token, expires_at)
+                self._reservations_seen = max(self._reservations_seen, updated_at)
+            self._refreshed_at = time.monotonic()
+            self._replay_recorded()
+
+    def needs_sync(self):
+        """DB에서 다시 읽을 때가 됐는지 (메모리만 확인)"""
+        if self._rebuilt_at is None:
+            return True
+        now = time.monotonic()
+        return (
+            now - self._rebuilt_at >= self.rebuild_seconds
+            or now - self._refreshed_at >= self.refresh_seconds
+        )
+
+    def sync(self):
+        """갱신 주기가 지났으면 DB에서 다시 읽음 (전체 또는 증분, 다른 스레드가 갱신 중이면 그 결과를 기다림)"""
+        with self._sync_lock:
+            now = time.monotonic()
+            if self._rebuilt_at is None or now - self._rebuilt_at >= self.rebuild_seconds:
+                mode = self._rebuild
+            elif now - self._refreshed_at >= self.refresh_seconds:
+                mode = self._refresh
+            else:
+                return
+            self._recording(mode)
+
+    def is_available(self, nickname, token=None):
+        """
+        닉네임을 쓸 수 있는지 (메모리만 읽음, 먼저 sync()로 갱신)
+
+        Args:
+            token: 예약 토큰 (이 토큰으로 예약한 닉네임이면 사용 가능)
+        """
+        with self._lock:
+            if nickname in self._taken:
+                return False
+            reserved = self._reserved.get(nickname)
+        if reserved is None:
+            return True
+        reserved_token, expires_at = reserved
+        return reserved_token == token or expires_at <= timezone.now()
+
+    def add(self, nickname):
+        """물건이 저장됨 (예약은 사용된 것으로 정리)"""
+        with self._lock:
+            self._apply(('add', nickname, None))
+
+    def reserve(self, nickname, token, expires_at):
+        with self._lock:
+            self._apply(('reserve', nickname, (token, expires_at)))
+
+    def release(self, nickname):
+        """예약 해제"""
+        with self._lock:
+            self._apply(('release', nickname, None))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_nickname_index():
+    """워커 프로세스당 하나의 NicknameIndex를 재사용"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = NicknameIndex(
+                    refresh_seconds=settings.NICKNAME_INDEX_REFRESH_SECONDS,
+                    rebuild_seconds=settings.NICKNAME_INDEX_REBUILD_SECONDS,
+                )
+    return _index
+
+
+def nickname_available(nickname, token=None):
+    """닉네임 중복 확인 (check-nickname 엔드포인트, 갱신 주기가 지났을 때만 DB 조회)"""
+    index = get_nickname_index()
+    index.sync()
+    return index.is_available(nickname, token)
+
+
+def reserve_nickname(nickname, token=None):
+    """
+    닉네임을 NICKNAME_RESERVATION_SECONDS 동안 예약
+
+    같은 토큰으로 다시 예약하면 기존 예약을 연장하거나(같은 닉네임) 새 닉네임으로 바꾼다.
+
+    Args:
+        token: 이전에 받은 예약 토큰 (없으면 새로 발급)
+
+    Returns:
+        NicknameReservation
+
+    Raises:
+        NicknameTaken: 이미 쓰이고 있거나 다른 사람이 예약 중인 닉네임
+    """
+    index = get_nickname_index()
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=settings.NICKNAME_RESERVATION_SECONDS)
+    released = None
+    try:
+        with transaction.atomic():
+            # 오래전에 만료된 예약만 삭제 (최근 만료 / 취소는 다른 프로세스가 증분 조회로 볼 수 있게 남겨 둠)
+            NicknameReservation.objects.filter(
+                expires_at__lte=now - timedelta(seconds=settings.NICKNAME_INDEX_REBUILD_SECONDS),
+            ).delete()
+
+            previous = (
+                NicknameReservation.objects.filter(token=token, expires_at__gt=now).first()
+                if token else None
+            )
+            if previous is not None and previous.nickname == nickname:
+                previous.expires_at = expires_at
+                previous.save(update_fields=['expires_at', 'updated_at'])
+                reservation = previous
+            else:
+                if previous is not None:
+                    previous.expires_at = now
+                    previous.save(update_fields=['expires_at', 'updated_at'])
+                    released = previous.nickname
+                if Product.objects.filter(nickname=nickname).exists():
+                    index.add(nickname)
+                    raise NicknameTaken(nickname)
+
+                # 같은 닉네임의 만료된 예약 행이 남아 있으면 새 토큰으로 다시 사용
+                reservation = NicknameReservation.objects.filter(nickname=nickname).first()
+                if reservation is None:
+                    reservation = NicknameReservation.objects.create(
+                        nickname=nickname, token=uuid.uuid4().hex, expires_at=expires_at,
+                    )
+                elif reservation.expires_at > now:
+                    raise NicknameTaken(nickname)
+                else:
+                    reservation.token = uuid.uuid4().hex
+                    reservation.expires_at = expires_at
+                    reservation.save(update_fields=['token', 'expires_at', 'updated_at'])
+    except IntegrityError:
+        raise NicknameTaken(nickname)
+
+    if released is not None:
+        index.release(released)
+    index.reserve(reservation.nickname, reservation.token, reservation.expires_at)
+    return reservation
+
+
+def release_nickname(token):
+    """
+    예약 취소 (행은 만료시켜서 남겨 둠 - 다른 프로세스가 취소를 볼 수 있도록)
+
+    Returns:
+        bool: 취소한 예약이 있었으면 True
+    """
+    now = timezone.now()
+    reservation = NicknameReservation.objects.filter(token=token, expires_at__gt=now).first()
+    if reservation is None:
+        return False
+    reservation.expires_at = now
+    reservation.save(update_fields=['expires_at', 'updated_at'])
+    get_nickname_index().release(reservation.nickname)
+    return True
+
+
+def save_product_nickname(product, token=None, **save_kwargs):
+    """
+    닉네임을 확정하며 Product 저장 (호출하는 쪽 트랜잭션 안에서 호출)
+
+    다른 사람이 예약 중인 닉네임이면 거절하고, 자기 예약(token)이면 예약을 사용 처리한다.
+    예약 없이 들어온 요청끼리 겹쳐도 unique 충돌을 NicknameTaken으로 바꿔서 돌려준다.
+
+    Raises:
+        NicknameTaken: 이미 쓰이고 있거나 다른 사람이 예약 중인 닉네임
+    """
+    nickname = product.nickname
+    reservation = NicknameReservation.objects.filter(
+        nickname=nickname, expires_at__gt=timezone.now(),
+    ).first()
+    if reservation is not None:
+        if reservation.token != token:
+            raise NicknameTaken(nickname)
+        reservation.expires_at = timezone.now()
+        reservation.save(update_fields=['expires_at', 'updated_at'])
+
+    try:
+        # savepoint: 충돌해도 바깥 트랜잭션은 계속 쓸 수 있도록
+        with transaction.atomic():
+            product.save(**save_kwargs)
+    except IntegrityError:
+        raise NicknameTaken(nickname)
+
+    transaction.on_commit(lambda: get_nickname_index().add(nickname))
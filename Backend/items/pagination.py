@@ -0,0 +1,22 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ProductCursorPagination(CursorPagination):
+    """
+    아카이브 목록 커서(keyset) 페이지네이션
+    (-created_at, -id) 인덱스를 그대로 타므로 뒤 페이지로 가도 OFFSET 비용이 없다.
+
+    `?page_size=` 또는 `?cursor=`가 있을 때만 적용된다.
+    (둘 다 없으면 기존처럼 전체 목록 배열을 응답)
+    """
+
+    ordering = ('-created_at', '-id')
+    page_size = 30
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
@@ -5,58 +5,75 @@
 """
 
 import os
+import re
 import sys
+import json
 import datetime
 import logging
 import numpy as np
 from PIL import Image
-import shutil
 
-# 로깅 설정
+try:
+    from .compositor import composite_palette, composite_quadrants
+    from .encoders import DEFAULT_PROFILE, encode_image, get_profile
+    from .log_handlers import QueueingRotatingFileHandler
+    from .metrics import timed
+    from .pattern_library import find_pattern_dir, get_pattern_library
+    from .render_cache import DEFAULT_MAX_BYTES, RenderCache, render_key, write_atomic
+    from .sprite_sheet import SpriteSheet
+    from .vector import render_svg
+except ImportError:  # 스크립트로 직접 실행하는 경우 (python barcode_pattern.py)
+    from compositor import composite_palette, composite_quadrants
+    from encoders import DEFAULT_PROFILE, encode_image, get_profile
+    from log_handlers import QueueingRotatingFileHandler
+    from metrics import timed
+    from pattern_library import find_pattern_dir, get_pattern_library
+    from render_cache import DEFAULT_MAX_BYTES, RenderCache, render_key, write_atomic
+    from sprite_sheet import SpriteSheet
+    from vector import render_svg
+
+logger = logging.getLogger(__name__)
+
+# 하단 색상값: '#rrggbb' 또는 'rrggbb'
+HEX_COLOR_RE = re.compile(r"#?[0-9a-fA-F]{6}")
+
+
 def setup_logging():
-    """로그 파일 및 콘솔 출력 설정"""
-    os.makedirs("logs", exist_ok=True)
-    log_file = f"logs/pattern_generator_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file, encoding='utf-8'),
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
-    return logging.getLogger(__name__)
+    """
+    스크립트로 직접 실행할 때의 로그 설정 (logs/pattern_generator.log + 콘솔)
+    Django에서는 settings.LOGGING 이 같은 핸들러로 한 번만 설정하므로 호출하지 않는다.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, QueueingRotatingFileHandler) for h in root.handlers):
+        return
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueingRotatingFileHandler(os.path.join("logs", "pattern_generator.log")))
 
 class BarcodePatternGenerator:
-    def __init__(self, pattern_dir=None, output_dir=None):
+    def __init__(self, pattern_dir=None, output_dir=None, library=None,
+                 cache_max_bytes=DEFAULT_MAX_BYTES, disk_cache=True,
+                 encoder_profile=DEFAULT_PROFILE):
         """
         바코드 패턴 생성기 초기화
         
         Args:
             pattern_dir: 패턴 이미지 파일들이 있는 디렉토리 경로
             output_dir: 생성된 패턴 이미지가 저장될 출력 디렉토리 경로
+            library: 공유 PatternLibrary (None이면 프로세스 공용 라이브러리 사용)
+            cache_max_bytes: 렌더 캐시 메모리 용량
+            disk_cache: True면 렌더 결과를 output_dir에도 캐시
+                        (Django처럼 결과를 스토리지에 직접 저장하는 경우 False)
+            encoder_profile: 기본 인코더 프로필 (default / fast / small / webp / svg)
         """
-        self.logger = setup_logging()
+        self.logger = logger
         project_root = os.path.dirname(os.path.abspath(__file__))
 
-        # 패턴 디렉토리 자동 탐색
-        if pattern_dir is None:
-            candidate_dirs = [
-                os.path.join(project_root, "mnt_project"),
-                os.path.join(project_root, "patterns"),
-                "/mnt/project",
-            ]
-            pattern_dir = next((d for d in candidate_dirs if os.path.isdir(d)), None)
-
-        if not pattern_dir or not os.path.isdir(pattern_dir):
-            raise FileNotFoundError(
-                "패턴 디렉터리를 찾을 수 없습니다. --pattern-dir 경로를 확인하세요."
-            )
+        # 패턴 라이브러리는 프로세스 단위로 한 번만 로드해서 공유
+        if library is None:
+            library = get_pattern_library(find_pattern_dir(pattern_dir))
 
-        self.pattern_dir = pattern_dir
-        self.patterns = {}
-        self.load_patterns()
+        self.library = library
+        self.pattern_dir = library.pattern_dir
 
         # 출력 디렉토리 설정
         # Django에서 output_dir을 전달하면 그걸 사용, 아니면 기본값("pattern_outputs") 사용
@@ -66,6 +83,15 @@ class BarcodePatternGenerator:
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
 
+        get_profile(encoder_profile)  # 잘못된 프로필 이름이면 여기서 ValueError
+        self.encoder_profile = encoder_profile
+
+        # 렌더 캐시: 메모리 LRU + (선택) output_dir 아래 content-addressed 파일
+        self.render_cache = RenderCache(
+            self.output_dir if disk_cache else None,
+            max_bytes=cache_max_bytes,
+        )
+
         # 색상 팔레트
         self.colors = [
             (255, 0, 0),      
@@ -85,39 +111,14 @@ class BarcodePatternGenerator:
             "남색", "보라색", "핑크색", "갈색", "회색"
         ]
 
-    
+    @property
+    def patterns(self):
+        """(행, 열) → 흑백 패턴 이미지 (공유 라이브러리의 현재 스냅샷)"""
+        return self.library.patterns
+
     def load_patterns(self):
-        """패턴 이미지 파일들을 메모리에 로드"""
-        self.logger.info("패턴 이미지 로드 시작...")
-        
-        for row in range(10):
-            for col in range(10):
-                filenames = [
-                    f"{row}{col}.png",
-                    f"{row}-{col}.png",
-                    f"({row},{col}).png",
-                ]
-                
-                filepath = None
-                for name in filenames:
-                    candidate = os.path.join(self.pattern_dir, name)
-                    if os.path.exists(candidate):
-                        filepath = candidate
-                        break
-                
-                if filepath:
-                    try:
-                        img = Image.open(filepath).convert('L')  # 흑백으로 변환
-                        self.patterns[(row, col)] = img
-                        self.logger.debug(f"패턴 로드 완료: {os.path.basename(filepath)}")
-                    except Exception as e:
-                        self.logger.error(f"패턴 로드 실패 {os.path.basename(filepath)}: {str(e)}")
-                else:
-                    self.logger.warning(
-                        f"패턴 파일 없음: {[os.path.join(self.pattern_dir, name) for name in filenames]}"
-                    )
-        
-        self.logger.info(f"총 {len(self.patterns)}개의 패턴 로드 완료")
+        """패턴 이미지 파일들을 다시 로드 (공유 라이브러리 전체가 갱신됨)"""
+        self.library.reload()
     
     def parse_barcode(self, barcode):
         """
@@ -132,7 +133,8 @@ class BarcodePatternGenerator:
         if len(barcode) != 13:
             raise ValueError(f"바코드는 13자리여야 합니다. 입력된 길이: {len(barcode)}")
         
-        if not barcode.isdigit():
+        # ASCII 숫자만 허용 (isdigit()은 전각 숫자 등도 통과시킴, parse_barcodes와 같은 기준)
+        if not (barcode.isascii() and barcode.isdigit()):
             raise ValueError("바코드는 숫자로만 구성되어야 합니다.")
         
         # 3자리씩 4개 그룹으로 분할
@@ -170,13 +172,11 @@ class BarcodePatternGenerator:
     
     def hex_to_rgb(self, hex_str):
         """'#rrggbb' → (r,g,b)"""
-        hex_str = hex_str.lstrip('#')
-        if len(hex_str) != 6:
+        # int(..., 16)은 '-f', '+f', ' f'도 받아들이므로 16진수 6자리만 허용
+        if not isinstance(hex_str, str) or not HEX_COLOR_RE.fullmatch(hex_str):
             raise ValueError(f"잘못된 hex 색상값: {hex_str}")
-        r = int(hex_str[0:2], 16)
-        g = int(hex_str[2:4], 16)
-        b = int(hex_str[4:6], 16)
-        return (r, g, b)
+        hex_str = hex_str.lstrip('#')
+        return (int(hex_str[0:2], 16), int(hex_str[2:4], 16), int(hex_str[4:6], 16))
 
     def apply_color(self, image, color_index):
         """
@@ -229,124 +229,267 @@ class BarcodePatternGenerator:
 
         return Image.fromarray(rgb_array, 'RGB')
 
-    def create_pattern_image(self, barcode, bottom_color_hex=None):
+    def compose_pattern(self, patterns_info, color_index, bottom_rgb=None, palette=False, tile_size=None):
         """
-        바코드를 기반으로 최종 패턴 이미지 생성
-        1,2사분면: 바코드 마지막 자리 색
-        3,4사분면: bottom_color_hex (예: '#aabbcc')
+        파싱된 패턴 정보로 2x2 컬러 패턴 이미지를 합성
+        1,2사분면: 바코드 팔레트 색 / 3,4사분면: bottom_rgb (없으면 팔레트 색)
         
         Args:
-            barcode: 13자리 바코드 문자열
+            patterns_info: parse_barcode 결과의 [(행, 열, 회전각도), ...]
+            color_index: 색상 인덱스 (0-9)
+            bottom_rgb: 하단 사분면 (r,g,b) 또는 None
+            palette: True면 같은 결과를 P 모드(팔레트) 이미지로 생성
+            tile_size: 사분면 한 변 크기 (None이면 원본 타일 크기, output_tile_size() 참고)
             
         Returns:
-            생성된 이미지 파일 경로
+            RGB (또는 P) PIL Image 객체
         """
-        self.logger.info(f"패턴 생성 시작: {barcode}")
+        # 회전 결과는 라이브러리 atlas에 미리 계산되어 있으므로 복사/회전 없이 참조만 함
+        library = self.library
+        tiles = []
         
-        # 바코드 파싱
-        patterns_info, color_index = self.parse_barcode(barcode)
-        self.logger.info(f"파싱 결과: 패턴={patterns_info}, 색상 index={color_index}")
+        for idx, (row, col, rotation) in enumerate(patterns_info, 1):
+            if not library.present[row, col]:
+                # atlas에는 기본 패턴(00.png 또는 흰색)이 채워져 있음
+                self.logger.warning("패턴 %d%d.png을 찾을 수 없습니다. 기본 패턴 사용", row, col)
 
-        # 사진 색(hex)을 (r,g,b)로 변환
+            tiles.append(library.get_tile(row, col, rotation, tile_size))
+            self.logger.debug("패턴 ①%d: %d%d.png, %d도 회전", idx, row, col, rotation)
+
+        top_rgb = self.colors[color_index]
+        if bottom_rgb is None:
+            bottom_rgb = top_rgb
+        quadrant_colors = [top_rgb, top_rgb, bottom_rgb, bottom_rgb]
+
+        if palette:
+            index_array, colors = composite_palette(tiles, quadrant_colors)
+            image = Image.fromarray(index_array, 'P')
+            image.putpalette([c for color in colors for c in color])
+            return image
+
+        # 모자이크 임계값 처리 + 사분면 색상 LUT를 한 번에 적용 (출력 버퍼 1개만 할당)
+        rgb_array = composite_quadrants(tiles, quadrant_colors)
+        return Image.fromarray(rgb_array, 'RGB')
+
+    def output_tile_size(self, size=None):
+        """
+        출력 이미지 한 변 size 에 해당하는 사분면 타일 크기
+
+        원본보다 작으면 축소 atlas, 크면 타일별 확대본을 쓰고(크기별로 한 번만 리샘플링),
+        홀수 크기는 한 픽셀 큰 짝수 크기로 합성한 뒤 오른쪽 / 아래 한 줄을 잘라낸다.
+
+        Args:
+            size: 출력 한 변 픽셀 수 (None이면 원본 크기 = 타일 크기 x 2)
+
+        Returns:
+            int | None: 사분면 타일 크기 (원본 크기면 None)
+
+        Raises:
+            ValueError: 2 미만의 크기
+        """
+        native = self.library.tile_size * 2
+        if size is None or size == native:
+            return None
+        if size < 2:
+            raise ValueError(f"출력 크기는 2 이상이어야 합니다: {size}")
+        return (size + 1) // 2
+
+    def cache_key(self, barcode, bottom_color_hex=None, profile=None, size=None):
+        """
+        (바코드, 하단 색상, 패턴 세트 버전, 인코더 프로필, 출력 크기)의 해시
+        렌더 캐시 / 파일명 / HTTP ETag 에 사용 (원본 크기는 크기 없이 계산해서 기존 키 유지)
+        """
+        profile = profile or self.encoder_profile
+        variant = profile if self.output_tile_size(size) is None else f"{profile}@{size}"
+        return render_key(barcode, bottom_color_hex, self.library.version, variant)
+
+    def render_name(self, barcode, bottom_color_hex=None, profile=None, size=None):
+        """
+        렌더 결과의 캐시 키이자 파일명 (확장자 포함)
+        cache_key() 로 결정되므로 같은 입력이면 항상 같은 이름
+        """
+        spec = get_profile(profile or self.encoder_profile)
+        key = self.cache_key(barcode, bottom_color_hex, profile, size)
+        return f"pattern_{barcode}_{key[:16]}{spec['ext']}"
+
+    def render_pattern(self, barcode, bottom_color_hex=None, profile=None, size=None):
+        """
+        인코딩된 패턴 이미지 바이트 반환 (렌더 캐시에 있으면 렌더링/인코딩 생략)
+        
+        Args:
+            barcode: 13자리 바코드 문자열
+            bottom_color_hex: 하단 사분면 색 (예: '#aabbcc')
+            profile: 인코더 프로필 (None이면 생성기 기본값)
+            size: 출력 한 변 픽셀 수 (None이면 원본 크기)
+            
+        Returns:
+            인코딩된 이미지 바이트 (PNG / WebP / SVG)
+        """
+        profile = profile or self.encoder_profile
+        spec = get_profile(profile)
+        patterns_info, color_index = self.parse_barcode(barcode)
         bottom_rgb = None
         if bottom_color_hex is not None:
             bottom_rgb = self.hex_to_rgb(bottom_color_hex)
-            self.logger.info(f"하단 색상(hex): {bottom_color_hex}, rgb={bottom_rgb}")
+        tile_size = self.output_tile_size(size)
 
-        # 개별 패턴 이미지 준비
-        pattern_images = []
-        
-        for idx, (row, col, rotation) in enumerate(patterns_info, 1):
-            # 패턴 가져오기
-            if (row, col) not in self.patterns:
-                self.logger.warning(f"패턴 {row}{col}.png을 찾을 수 없습니다. 기본 패턴 사용")
-                # 기본 패턴으로 00.png 사용
-                pattern_img = self.patterns.get((0, 0), None)
-                if pattern_img is None:
-                    # 빈 흰색 이미지 생성
-                    pattern_img = Image.new('L', (256, 256), color=255)
+        name = self.render_name(barcode, bottom_color_hex, profile, size)
+        data = self.render_cache.get(name)
+        if data is None:
+            if spec.get('vector'):
+                with timed("compose"):
+                    data = self.compose_svg(patterns_info, color_index, bottom_rgb, size)
             else:
-                pattern_img = self.patterns[(row, col)].copy()
-            
-            # 회전 적용
-            if rotation != 0:
-                pattern_img = self.rotate_pattern(pattern_img, rotation)
-                self.logger.debug(f"패턴 ①{idx}: {row}{col}.png, {rotation}도 회전")
-            
-            pattern_images.append(pattern_img)
-        
-        # 2x2 그리드로 배치 (각 패턴은 256x256 픽셀로 가정)
-        pattern_size = pattern_images[0].size[0]
-        grid_size = pattern_size * 2
-        
-        '''
-        # 최종 이미지 생성 (2x2 그리드)
-        final_image = Image.new('L', (grid_size, grid_size), color=255)
-        # 패턴 배치 (①②③④)
-        positions = [
-            (0, 0),                      # ① 왼쪽 상단
-            (pattern_size, 0),           # ② 오른쪽 상단
-            (0, pattern_size),           # ③ 왼쪽 하단
-            (pattern_size, pattern_size) # ④ 오른쪽 하단
-        ]
+                with timed("compose"):
+                    image = self.compose_pattern(
+                        patterns_info, color_index, bottom_rgb, palette=spec['palette'], tile_size=tile_size,
+                    )
+                    if size is not None and image.size[0] != size:
+                        image = image.crop((0, 0, size, size))
+                with timed("encode"):
+                    data = encode_image(image, profile)
+            self.render_cache.put(name, data)
+        return data
+
+    def compose_svg(self, patterns_info, color_index, bottom_rgb=None, size=None):
+        """
+        compose_pattern 과 같은 배치 / 색으로 SVG 생성
+        타일 모양은 라이브러리에 캐시된 경로(tile_path)를 쓰고 회전은 transform으로 지정
+
+        Args:
+            size: SVG width/height (None이면 원본 크기, 벡터라 어떤 크기든 같은 문서)
+
+        Returns:
+            bytes: SVG 문서
+        """
+        library = self.library
+        top_rgb = self.colors[color_index]
+        if bottom_rgb is None:
+            bottom_rgb = top_rgb
+        return render_svg(
+            [library.tile_path(row, col) for row, col, _ in patterns_info],
+            [(rotation // 90) % 4 for _, _, rotation in patterns_info],
+            [top_rgb, top_rgb, bottom_rgb, bottom_rgb],
+            library.tile_size,
+            size,
+        )
+
+    def describe_pattern(self, barcode, bottom_color_hex=None):
+        """
+        패턴 구성 정보를 구조화된 dict로 반환 (Product.pattern_info, JSON 사이드카용)
         
-        for img, pos in zip(pattern_images, positions):
-            final_image.paste(img, pos)
+        Args:
+            barcode: 13자리 바코드 문자열
+            bottom_color_hex: 하단 사분면 색 (예: '#aabbcc')
+            
+        Returns:
+            dict: 바코드, 상/하단 색상, 사분면별 (행, 열, 회전), 패턴 세트 버전
+        """
+        patterns_info, color_index = self.parse_barcode(barcode)
+        bottom_rgb = None
+        if bottom_color_hex is not None:
+            bottom_rgb = self.hex_to_rgb(bottom_color_hex)
 
-        # 색상 적용
-        final_colored = self.apply_color(final_image, color)
+        return {
+            "barcode": barcode,
+            "created_at": datetime.datetime.now().isoformat(timespec='seconds'),
+            "top_color_index": color_index,
+            "top_color_name": self.color_names[color_index],
+            "top_rgb": list(self.colors[color_index]),
+            "bottom_color_hex": bottom_color_hex,
+            "bottom_rgb": list(bottom_rgb) if bottom_rgb is not None else None,
+            "patterns": [
+                {"quadrant": i, "row": row, "col": col, "rotation": rotation}
+                for i, (row, col, rotation) in enumerate(patterns_info, 1)
+            ],
+            "pattern_set_version": self.library.version,
+        }
 
-        # 파일 저장
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"pattern_{barcode}_{timestamp}.png"
-        output_path = os.path.join(self.output_dir, output_filename)
+    def render_many(self, items, workers=None, chunksize=16, check_digit=False):
+        """
+        여러 바코드를 프로세스 풀로 렌더링 (결과를 완료 순서대로 스트리밍)
+        잘못된 바코드는 해당 항목의 error로만 기록되고 배치는 계속 진행됨
         
-        # 고품질로 저장
-        final_colored.save(output_path, 'PNG', quality=100)
-'''        
-        # 최종 이미지는 처음부터 RGB로 생성
-        final_rgb = Image.new('RGB', (grid_size, grid_size), color=(255, 255, 255))
-
-        positions = [
-            (0, 0),                      # idx 0 → 1사분면
-            (pattern_size, 0),           # idx 1 → 2사분면
-            (0, pattern_size),           # idx 2 → 3사분면
-            (pattern_size, pattern_size) # idx 3 → 4사분면
-        ]
+        Args:
+            items: 바코드 문자열, (barcode, hex) 튜플 또는 dict 의 iterable
+            workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스)
+            chunksize: 워커에 한 번에 넘기는 작업 수
+            check_digit: True면 EAN-13 체크 숫자가 틀린 바코드는 렌더링하지 않음
+            
+        Yields:
+            dict: {"index", "barcode", "bottom_color", "path", "error"}
+        """
+        try:
+            from .batch import render_many
+        except ImportError:  # 스크립트로 직접 실행하는 경우
+            from batch import render_many
+        return render_many(self, items, workers=workers, chunksize=chunksize, check_digit=check_digit)
 
-        for idx, (base_img, pos) in enumerate(zip(pattern_images, positions)):
-            if idx < 2:
-                # 1,2 사분면: 바코드 팔레트 색
-                colored = self.apply_color(base_img, color_index)
-            else:
-                # 3,4 사분면: 사진에서 추출한 색 (없으면 팔레트 색으로 fallback)
-                if bottom_rgb is not None:
-                    colored = self.apply_color_rgb(base_img, bottom_rgb)
-                else:
-                    colored = self.apply_color(base_img, color_index)
+    def sprite_sheet(self, items, columns=None, cell_size=256):
+        """
+        여러 패턴을 격자로 배치한 스프라이트 시트 생성 (PNG는 iter_png()/save()로 한 줄씩 인코딩)
+
+        Args:
+            items: (key, barcode, 하단 색 hex 또는 None) 의 iterable
+            columns: 한 줄의 셀 수 (None이면 정사각형에 가깝게)
+            cell_size: 셀 한 변의 픽셀 수 (짝수)
+
+        Returns:
+            SpriteSheet
+        """
+        return SpriteSheet(self, items, columns=columns, cell_size=cell_size)
+
+    def cache_stats(self):
+        """렌더 캐시 히트/미스 통계"""
+        return self.render_cache.stats()
 
-            final_rgb.paste(colored, pos)
+    @timed("create_pattern_image")
+    def create_pattern_image(self, barcode, bottom_color_hex=None, profile=None):
+        """
+        바코드를 기반으로 최종 패턴 이미지 생성
+        1,2사분면: 바코드 마지막 자리 색
+        3,4사분면: bottom_color_hex (예: '#aabbcc')
+        같은 입력이면 output_dir의 기존 파일을 그대로 반환
+        
+        Args:
+            barcode: 13자리 바코드 문자열
+            
+        Returns:
+            생성된 이미지 파일 경로
+        """
+        self.logger.info("패턴 생성 시작: %s", barcode)
         
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"pattern_{barcode}_{timestamp}.png"
-        output_path = os.path.join(self.output_dir, output_filename)
-        final_rgb.save(output_path, 'PNG', quality=100)
+        # 바코드 파싱
+        with timed("parse_barcode"):
+            patterns_info, color_index = self.parse_barcode(barcode)
+        self.logger.info("파싱 결과: 패턴=%s, 색상 index=%d", patterns_info, color_index)
+
+        # 사진 색(hex)을 (r,g,b)로 변환
+        bottom_rgb = None
+        if bottom_color_hex is not None:
+            bottom_rgb = self.hex_to_rgb(bottom_color_hex)
+            self.logger.info("하단 색상(hex): %s, rgb=%s", bottom_color_hex, bottom_rgb)
+
+        # 같은 입력이면 이미 만들어진 파일을 그대로 사용
+        name = self.render_name(barcode, bottom_color_hex, profile)
+        output_path = os.path.join(self.output_dir, name)
+        if os.path.exists(output_path):
+            self.logger.info("기존 패턴 파일 사용: %s", output_path)
+            return output_path
+
+        # 렌더 캐시에 있으면 렌더링과 PNG 인코딩 모두 생략
+        data = self.render_pattern(barcode, bottom_color_hex, profile)
+        if not os.path.exists(output_path):
+            with timed("file_write"):
+                write_atomic(output_path, data)
 
-        self.logger.info(f"패턴 이미지 생성 완료: {output_path}")
+        self.logger.info("패턴 이미지 생성 완료: %s", output_path)
         
-        # info 텍스트도 두 색상 정보 적어주면 좋음
-        info_path = output_path.replace('.png', '_info.txt')
-        with open(info_path, 'w', encoding='utf-8') as f:
-            f.write(f"바코드: {barcode}\n")
-            f.write(f"생성 시간: {timestamp}\n")
-            f.write(f"상단 색상 index: {color_index} ({self.color_names[color_index]})\n")
-            f.write(f"상단 RGB: {self.colors[color_index]}\n")
-            if bottom_rgb is not None:
-                f.write(f"하단 색상 hex: {bottom_color_hex}\n")
-                f.write(f"하단 RGB: {bottom_rgb}\n")
-            f.write(f"\n패턴 구성:\n")
-            for i, (row, col, rotation) in enumerate(patterns_info, 1):
-                f.write(f"  패턴 {i}: {row}{col}.png, 회전 {rotation}도\n")
+        # 패턴 구성 정보는 JSON 사이드카로 저장
+        info = self.describe_pattern(barcode, bottom_color_hex)
+        info_path = os.path.join(self.output_dir, os.path.splitext(name)[0] + '_info.json')
+        with timed("sidecar_write"):
+            write_atomic(info_path, json.dumps(info, ensure_ascii=False, indent=2).encode('utf-8'))
 
         return output_path
     
@@ -388,11 +531,12 @@ class BarcodePatternGenerator:
                 print(f"\n❌ 입력 오류: {str(e)}")
                 print("   13자리 숫자를 정확히 입력해주세요.")
             except Exception as e:
-                self.logger.error(f"처리 중 오류 발생: {str(e)}")
+                self.logger.error("처리 중 오류 발생: %s", e)
                 print(f"\n❌ 오류 발생: {str(e)}")
 
 def main():
     """메인 함수"""
+    setup_logging()
     try:
         generator = BarcodePatternGenerator()
         generator.process_barcode_input()
@@ -0,0 +1,121 @@
+"""
+바코드 대량 검증 / 파싱
+수백만 줄짜리 입력을 렌더링 전에 검사할 수 있도록 parse_barcode 를 NumPy 배열 연산으로 처리한다.
+(문자열을 (N, 13) 문자 코드 배열로 바꾼 뒤 길이 / 숫자 / 체크 숫자 검사와 분할을 한 번에)
+"""
+
+import numpy as np
+
+# parse_barcodes 결과 한 줄: 4개 사분면의 (행, 열, 회전각도) + 색상 번호
+PARSED_DTYPE = np.dtype([
+    ("row", np.uint8, 4),
+    ("col", np.uint8, 4),
+    ("rotation", np.uint16, 4),  # 회전 각도 (세 번째 숫자 * 90)
+    ("color", np.uint8),
+])
+
+# 오류 코드 (0 = 정상)
+OK = 0
+ERROR_LENGTH = 1
+ERROR_NOT_DIGIT = 2
+ERROR_CHECK_DIGIT = 3
+
+ERROR_REASONS = {
+    ERROR_LENGTH: "바코드는 13자리여야 합니다.",
+    ERROR_NOT_DIGIT: "바코드는 숫자로만 구성되어야 합니다.",
+    ERROR_CHECK_DIGIT: "EAN-13 체크 숫자가 맞지 않습니다.",
+}
+
+# EAN-13 가중치 (앞 12자리에 1, 3 반복)
+_EAN_WEIGHTS = np.array([1, 3] * 6, dtype=np.int32)
+
+
+def _digit_matrix(barcodes):
+    """
+    바코드 목록을 (N, 13) 숫자 배열로 변환
+
+    Returns:
+        tuple: (digits, lengths, is_digit)
+            digits: (N, 13) uint8 - 숫자가 아닌 문자 자리는 10 이상의 값
+            lengths: (N,) 문자열 길이 (13자보다 긴 문자열은 digits 에서 잘림, list 입력은 원래 문자열 기준)
+            is_digit: (N,) 13자리가 모두 ASCII 숫자인지
+    """
+    if isinstance(barcodes, np.ndarray):
+        arr = barcodes
+        lengths = None
+    else:
+        # NumPy 고정 길이 문자열은 끝의 NUL('\x00')을 잘라내므로 길이는 원래 문자열에서 구함
+        # ('1234567890123\x00' 같은 입력이 13자리로 통과하지 않도록)
+        barcodes = [b if isinstance(b, str) else str(b) for b in barcodes]
+        lengths = np.fromiter(map(len, barcodes), dtype=np.int64, count=len(barcodes))
+        arr = np.asarray(barcodes, dtype=str) if barcodes else np.empty(0, dtype="U13")
+    if arr.dtype.kind not in "US":
+        arr = arr.astype(str)
+    arr = arr.reshape(-1)
+    if lengths is None:
+        lengths = np.char.str_len(arr)
+
+    width = 4 if arr.dtype.kind == "U" else 1
+    if arr.dtype.itemsize != 13 * width:
+        arr = arr.astype(f"{arr.dtype.kind}13")
+    codes = arr.view(np.uint32 if width == 4 else np.uint8).reshape(len(arr), 13)
+
+    # 큰 배열 할당을 줄이기 위해 ASCII 여부만 먼저 보고 uint8로 계산
+    # ('0' 미만 문자는 부호 없는 뺄셈에서 큰 값으로 넘어가므로 <= 9 한 번으로 검사됨)
+    ascii_only = codes.max(axis=1, initial=0) < 128
+    digits = codes.astype(np.uint8)
+    np.subtract(digits, np.uint8(ord("0")), out=digits)
+    is_digit = ascii_only & (digits <= 9).all(axis=1)
+    return digits, lengths, is_digit
+
+
+def parse_barcodes(barcodes, check_digit=False):
+    """
+    바코드 여러 개를 한 번에 검증 / 파싱 (BarcodePatternGenerator.parse_barcode 의 벡터화 버전)
+
+    Args:
+        barcodes: 바코드 문자열의 list 또는 NumPy 문자열 배열
+        check_digit: True면 EAN-13 체크 숫자(마지막 자리)도 검사
+
+    Returns:
+        tuple: (parsed, errors)
+            parsed: PARSED_DTYPE 구조화 배열 (N,) - 오류인 줄은 0으로 채워짐
+            errors: 오류 코드 uint8 배열 (N,) - 0이면 정상, 사유는 ERROR_REASONS[코드]
+    """
+    digits, lengths, is_digit = _digit_matrix(barcodes)
+    count = len(lengths)
+
+    errors = np.zeros(count, dtype=np.uint8)
+    errors[~is_digit] = ERROR_NOT_DIGIT
+    errors[lengths != 13] = ERROR_LENGTH
+
+    if check_digit:
+        total = digits[:, :12] @ _EAN_WEIGHTS
+        expected = (10 - total % 10) % 10
+        errors[(errors == OK) & (expected != digits[:, 12])] = ERROR_CHECK_DIGIT
+
+    digits[errors != OK] = 0
+
+    # 3자리씩 4개 그룹: (행, 열, 회전), 마지막 1자리는 색상
+    groups = digits[:, :12].reshape(count, 4, 3)
+    parsed = np.empty(count, dtype=PARSED_DTYPE)
+    parsed["row"] = groups[:, :, 0]
+    parsed["col"] = groups[:, :, 1]
+    parsed["rotation"] = groups[:, :, 2]
+    parsed["rotation"] *= 90
+    parsed["color"] = digits[:, 12]
+    return parsed, errors
+
+
+def to_patterns_info(record):
+    """
+    parse_barcodes 결과 한 줄을 parse_barcode 와 같은 형식으로 변환
+
+    Returns:
+        tuple: ([(행, 열, 회전각도), ...], 색상번호)
+    """
+    patterns_info = [
+        (int(r), int(c), int(a))
+        for r, c, a in zip(record["row"], record["col"], record["rotation"])
+    ]
+    return patterns_info, int(record["color"])
@@ -0,0 +1,177 @@
+"""
+대량 패턴 생성
+CSV/JSONL로 받은 바코드 목록을 프로세스 풀에 나눠서 렌더링한다.
+잘못된 항목이 있어도 배치 전체를 멈추지 않고 항목별 결과로 돌려준다.
+"""
+
+import os
+import csv
+import json
+import multiprocessing
+from itertools import islice
+
+try:
+    from .barcodes import ERROR_LENGTH, ERROR_REASONS, parse_barcodes
+except ImportError:  # 스크립트로 직접 실행하는 경우
+    from barcodes import ERROR_LENGTH, ERROR_REASONS, parse_barcodes
+
+# 입력 파일에서 하단 색상으로 인정하는 컬럼 이름 (앞쪽 우선)
+COLOR_FIELDS = ("bottom_color", "dominant_color", "color")
+
+# 바코드 검증을 한 번에 처리하는 항목 수
+VALIDATE_CHUNK_SIZE = 65536
+
+# 워커 프로세스마다 한 번만 만드는 생성기
+_worker_generator = None
+
+
+def read_batch_file(path):
+    """
+    CSV 또는 JSONL 파일에서 항목을 하나씩 읽음 (파일 전체를 메모리에 올리지 않음)
+
+    CSV는 헤더에 barcode 컬럼이 있어야 하고,
+    JSONL은 한 줄에 {"barcode": "...", "bottom_color": "#rrggbb"} 형식의 객체 하나.
+
+    Yields:
+        dict: 항목 (읽기 실패한 줄은 {"error": 사유})
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline='', encoding='utf-8') as f:
+        if ext in ('.jsonl', '.ndjson', '.json'):
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    item = json.loads(line)
+                except ValueError as e:
+                    yield {"error": f"{line_no}번째 줄 JSON 파싱 실패: {e}"}
+                    continue
+                if not isinstance(item, dict):
+                    item = {"barcode": item}
+                yield item
+        else:
+            yield from csv.DictReader(f)
+
+
+def _to_job(index, item):
+    """입력 항목(str / (barcode, hex) / dict)을 (index, barcode, hex, error) 작업으로 변환"""
+    error = None
+    if isinstance(item, dict):
+        barcode = item.get("barcode")
+        bottom = next((item[k] for k in COLOR_FIELDS if item.get(k)), None)
+        error = item.get("error")
+    elif isinstance(item, (tuple, list)):
+        barcode, bottom = (list(item) + [None])[:2]
+    else:
+        barcode, bottom = item, None
+
+    if barcode is not None:
+        barcode = str(barcode).strip()
+    if isinstance(bottom, str):
+        bottom = bottom.strip() or None
+    if error is None and not barcode:
+        error = "바코드가 비어 있습니다."
+    return index, barcode, bottom, error
+
+
+def validate_jobs(jobs, check_digit=False, chunk_size=VALIDATE_CHUNK_SIZE):
+    """
+    작업을 chunk_size 개씩 모아 parse_barcodes 로 한 번에 검증하고,
+    잘못된 바코드는 error를 채운 작업으로 돌려줌 (렌더링 워커로 보내기 전에 걸러짐)
+
+    Yields:
+        tuple: (index, barcode, hex, error)
+    """
+    jobs = iter(jobs)
+    while True:
+        chunk = list(islice(jobs, chunk_size))
+        if not chunk:
+            return
+        pending = [i for i, job in enumerate(chunk) if job[3] is None]
+        _, errors = parse_barcodes([chunk[i][1] for i in pending], check_digit=check_digit)
+        for i, code in zip(pending, errors.tolist()):
+            if code:
+                index, barcode, bottom, _ = chunk[i]
+                reason = ERROR_REASONS[code]
+                if code == ERROR_LENGTH:
+                    reason += f" 입력된 길이: {len(barcode)}"
+                chunk[i] = (index, barcode, bottom, reason)
+        yield from chunk
+
+
+def validate_many(items, check_digit=False):
+    """
+    렌더링 없이 바코드만 검증 (수백만 줄 입력을 렌더링 전에 확인할 때)
+
+    Args:
+        items: 바코드 문자열, (barcode, hex) 튜플 또는 dict 의 iterable
+        check_digit: True면 EAN-13 체크 숫자도 검사
+
+    Yields:
+        dict: {"index", "barcode", "bottom_color", "path", "error"} (path는 항상 None)
+    """
+    jobs = (_to_job(index, item) for index, item in enumerate(items))
+    for index, barcode, bottom, error in validate_jobs(jobs, check_digit):
+        yield {"index": index, "barcode": barcode, "bottom_color": bottom, "path": None, "error": error}
+
+
+def _render_one(generator, job):
+    """작업 하나를 렌더링하고 결과 dict 반환 (예외는 error로 기록)"""
+    index, barcode, bottom, error = job
+    result = {"index": index, "barcode": barcode, "bottom_color": bottom, "path": None, "error": error}
+    if error is not None:
+        return result
+    try:
+        result["path"] = generator.create_pattern_image(barcode, bottom)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def _init_worker(pattern_dir, output_dir, cache_max_bytes):
+    """프로세스 풀 워커 초기화 (패턴 라이브러리는 워커당 한 번만 로드)"""
+    global _worker_generator
+    try:
+        from .barcode_pattern import BarcodePatternGenerator
+    except ImportError:  # 스크립트로 직접 실행하는 경우
+        from barcode_pattern import BarcodePatternGenerator
+
+    _worker_generator = BarcodePatternGenerator(
+        pattern_dir=pattern_dir,
+        output_dir=output_dir,
+        cache_max_bytes=cache_max_bytes,
+    )
+
+
+def _render_in_worker(job):
+    return _render_one(_worker_generator, job)
+
+
+def render_many(generator, items, workers=None, chunksize=16, check_digit=False):
+    """
+    여러 바코드를 렌더링하며 결과를 완료되는 순서대로 하나씩 돌려줌
+
+    Args:
+        generator: 설정(패턴/출력 디렉토리)을 가져올 BarcodePatternGenerator
+        items: 바코드 문자열, (barcode, hex) 튜플 또는 dict 의 iterable
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 처리)
+        chunksize: 워커에 한 번에 넘기는 작업 수
+        check_digit: True면 EAN-13 체크 숫자가 틀린 바코드도 렌더링하지 않음
+
+    Yields:
+        dict: {"index", "barcode", "bottom_color", "path", "error"}
+              (성공하면 error가 None, 실패하면 path가 None)
+    """
+    jobs = validate_jobs((_to_job(index, item) for index, item in enumerate(items)), check_digit)
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1:
+        for job in jobs:
+            yield _render_one(generator, job)
+        return
+
+    initargs = (generator.pattern_dir, generator.output_dir, generator.render_cache.max_bytes)
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        yield from pool.imap_unordered(_render_in_worker, jobs, chunksize)
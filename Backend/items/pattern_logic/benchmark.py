@@ -0,0 +1,292 @@
+"""
+패턴 생성 벤치마크
+인코더 프로필별 인코딩 시간과 결과 크기, 생성 단계별 소요 시간을 측정한다.
+합성 타일 세트를 만들어 쓸 수 있어 mnt_project 없이도 실행 가능하고,
+결과는 JSON으로 저장해서 커밋 간에 비교한다.
+"""
+
+import datetime
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import PIL
+from PIL import Image
+
+try:
+    from .barcode_pattern import BarcodePatternGenerator
+    from .encoders import RASTER_PROFILES, encode_image, get_profile
+    from .pattern_library import PatternLibrary
+except ImportError:  # 스크립트로 직접 실행하는 경우
+    from barcode_pattern import BarcodePatternGenerator
+    from encoders import RASTER_PROFILES, encode_image, get_profile
+    from pattern_library import PatternLibrary
+
+
+def random_barcodes(count, seed=0):
+    """재현 가능한 임의의 13자리 바코드 목록"""
+    rng = random.Random(seed)
+    return ["".join(rng.choice("0123456789") for _ in range(13)) for _ in range(count)]
+
+
+def random_hex_colors(count, seed=0):
+    """재현 가능한 임의의 '#rrggbb' 색상 목록"""
+    rng = random.Random(seed + 1)
+    return [f"#{rng.randrange(0x1000000):06x}" for _ in range(count)]
+
+
+def _summary(samples_ms):
+    return {
+        "mean_ms": round(statistics.mean(samples_ms), 3),
+        "median_ms": round(statistics.median(samples_ms), 3),
+        "min_ms": round(min(samples_ms), 3),
+        "max_ms": round(max(samples_ms), 3),
+        "samples": len(samples_ms),
+    }
+
+
+def benchmark_encoders(generator, barcodes, colors=None, profiles=None, repeat=3):
+    """
+    인코더 프로필별 인코딩 시간 / 바이트 크기 측정
+
+    합성은 바코드마다 한 번만 하고 인코딩만 repeat 번 반복해서 측정한다.
+    (팔레트 프로필은 팔레트 이미지로 합성한 결과를 인코딩)
+
+    Args:
+        generator: BarcodePatternGenerator
+        barcodes: 측정할 바코드 목록
+        colors: 바코드별 하단 색상 hex 목록 (None이면 팔레트 색)
+        profiles: 측정할 프로필 이름 목록 (None이면 SVG를 뺀 전체)
+        repeat: 바코드당 인코딩 반복 횟수
+
+    Returns:
+        list[dict]: 프로필별 {"profile", "encode": 시간 통계, "bytes_mean", "bytes_min", "bytes_max"}
+    """
+    profiles = list(profiles or RASTER_PROFILES)
+    colors = colors or [None] * len(barcodes)
+
+    images = []
+    for barcode, color in zip(barcodes, colors):
+        patterns_info, color_index = generator.parse_barcode(barcode)
+        bottom_rgb = generator.hex_to_rgb(color) if color else None
+        images.append({
+            False: generator.compose_pattern(patterns_info, color_index, bottom_rgb),
+            True: generator.compose_pattern(patterns_info, color_index, bottom_rgb, palette=True),
+        })
+
+    results = []
+    for profile in profiles:
+        spec = get_profile(profile)
+        timings = []
+        sizes = []
+        for variants in images:
+            image = variants[spec["palette"]]
+            for _ in range(repeat):
+                started = time.perf_counter()
+                data = encode_image(image, profile)
+                timings.append((time.perf_counter() - started) * 1000)
+            sizes.append(len(data))
+
+        results.append({
+            "profile": profile,
+            "encode": _summary(timings),
+            "bytes_mean": round(statistics.mean(sizes)),
+            "bytes_min": min(sizes),
+            "bytes_max": max(sizes),
+        })
+    return results
+
+
+def make_synthetic_tiles(directory, tile_size=256, seed=0, block=16):
+    """
+    (행,열).png 100개의 합성 흑백 타일 생성 (block px 단위의 무작위 흑백 격자)
+
+    Returns:
+        타일을 만든 디렉토리 경로
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    cells = -(-tile_size // block)
+    for row in range(10):
+        for col in range(10):
+            grid = rng.integers(0, 2, (cells, cells), dtype=np.uint8) * 255
+            tile = grid.repeat(block, axis=0).repeat(block, axis=1)[:tile_size, :tile_size]
+            Image.fromarray(tile, "L").save(os.path.join(directory, f"({row},{col}).png"))
+    return directory
+
+
+def time_calls(func, args_list, repeat=3, setup=None):
+    """
+    args_list의 인자마다 func를 repeat 번 호출한 시간 통계
+
+    Args:
+        func: 측정할 함수
+        args_list: 호출 인자 튜플 목록
+        repeat: 인자당 반복 횟수
+        setup: 매 호출 전에 같은 인자로 실행할 준비 함수 (측정에서 제외)
+    """
+    samples = []
+    for args in args_list:
+        for _ in range(repeat):
+            if setup is not None:
+                setup(*args)
+            started = time.perf_counter()
+            func(*args)
+            samples.append((time.perf_counter() - started) * 1000)
+    return _summary(samples)
+
+
+def benchmark_stages(generator, barcodes, colors=None, repeat=3):
+    """
+    패턴 생성 단계별 소요 시간 측정
+
+    - load_patterns: 타일 디렉토리 전체 다시 로드
+    - parse_barcode / rotate_pattern / apply_color / apply_color_rgb: 기존 단계 함수
+    - atlas_tile: 미리 회전된 atlas에서 타일 참조 (rotate_pattern 대체 경로)
+    - compose: 2x2 배치 + 색 적용 (기존 paste 단계)
+    - encode_png: 기본 프로필 PNG 인코딩
+    - render_pattern / create_pattern_image: 렌더 캐시와 출력 파일을 비운 뒤의 전체 생성
+
+    Args:
+        generator: BarcodePatternGenerator (create_pattern_image가 output_dir에 파일을 씀)
+        barcodes: 측정할 바코드 목록
+        colors: 바코드별 하단 색상 hex 목록 (None이면 팔레트 색)
+        repeat: 항목당 반복 횟수
+
+    Returns:
+        dict: 단계 이름 → 시간 통계
+    """
+    colors = colors or [None] * len(barcodes)
+    library = generator.library
+    parsed = [generator.parse_barcode(barcode) for barcode in barcodes]
+    bottoms = [generator.hex_to_rgb(color) if color else None for color in colors]
+
+    # 단계 함수 입력: 바코드마다 첫 번째 사분면 타일
+    first_tiles = [
+        (generator.patterns[(info[0][0], info[0][1])], info[0][2], color_index)
+        for info, color_index in parsed
+        if (info[0][0], info[0][1]) in generator.patterns
+    ]
+    composed = [
+        (generator.compose_pattern(info, color_index, bottom),)
+        for (info, color_index), bottom in zip(parsed, bottoms)
+    ]
+    items = list(zip(barcodes, colors))
+
+    def clear_cache(*args):
+        generator.render_cache.clear()
+
+    def clear_output(barcode, color):
+        generator.render_cache.clear()
+        path = os.path.join(generator.output_dir, generator.render_name(barcode, color))
+        if os.path.exists(path):
+            os.remove(path)
+
+    return {
+        "load_patterns": time_calls(generator.load_patterns, [()], repeat),
+        "parse_barcode": time_calls(generator.parse_barcode, [(b,) for b in barcodes], repeat),
+        "rotate_pattern": time_calls(
+            generator.rotate_pattern, [(tile, angle) for tile, angle, _ in first_tiles], repeat,
+        ),
+        "atlas_tile": time_calls(
+            library.get_tile, [info[0] for info, _ in parsed], repeat,
+        ),
+        "apply_color": time_calls(
+            generator.apply_color, [(tile, index) for tile, _, index in first_tiles], repeat,
+        ),
+        "apply_color_rgb": time_calls(
+            generator.apply_color_rgb, [(tile, (18, 52, 86)) for tile, _, _ in first_tiles], repeat,
+        ),
+        "compose": time_calls(
+            generator.compose_pattern,
+            [(info, color_index, bottom) for (info, color_index), bottom in zip(parsed, bottoms)],
+            repeat,
+        ),
+        "encode_png": time_calls(encode_image, composed, repeat),
+        "render_pattern": time_calls(generator.render_pattern, items, repeat, setup=clear_cache),
+        "create_pattern_image": time_calls(
+            generator.create_pattern_image, items, repeat, setup=clear_output,
+        ),
+    }
+
+
+def environment_info():
+    """결과 비교용 실행 환경 정보"""
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pillow": PIL.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_stage_suite(pattern_dir=None, tile_size=256, count=10, repeat=3, seed=0):
+    """
+    단계별 벤치마크 실행
+
+    Args:
+        pattern_dir: 실제 타일 디렉토리 (None이면 tile_size 크기의 합성 타일 사용)
+        tile_size: 합성 타일 한 변 크기
+        count: 바코드 수
+        repeat: 항목당 반복 횟수
+        seed: 바코드 / 색상 / 합성 타일 시드
+
+    Returns:
+        dict: {"meta": 실행 조건 + 환경, "stages": 단계별 시간 통계}
+    """
+    barcodes = random_barcodes(count, seed)
+    colors = random_hex_colors(count, seed)
+
+    with tempfile.TemporaryDirectory(prefix="pattern_bench_") as workdir:
+        if pattern_dir is None:
+            tiles_dir = make_synthetic_tiles(os.path.join(workdir, "tiles"), tile_size, seed)
+        else:
+            tiles_dir = pattern_dir
+
+        # 공유 라이브러리를 건드리지 않도록 전용 라이브러리 / 출력 폴더 사용
+        # (디스크 캐시를 끄고 매 측정 전에 메모리 캐시를 비워 항상 실제 렌더링을 측정)
+        generator = BarcodePatternGenerator(
+            library=PatternLibrary(tiles_dir),
+            output_dir=os.path.join(workdir, "outputs"),
+            disk_cache=False,
+        )
+        stages = benchmark_stages(generator, barcodes, colors, repeat)
+        actual_tile_size = generator.library.tile_size
+
+    return {
+        "meta": {
+            "synthetic": pattern_dir is None,
+            "tile_size": actual_tile_size,
+            "count": count,
+            "repeat": repeat,
+            "seed": seed,
+            **environment_info(),
+        },
+        "stages": stages,
+    }
+
+
+def compare_results(current, baseline):
+    """
+    두 결과의 단계별 평균 시간 비교
+
+    Returns:
+        list[dict]: {"stage", "baseline_ms", "current_ms", "ratio"} (ratio < 1 이면 빨라짐)
+    """
+    rows = []
+    for stage, summary in current["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        base_ms = base["mean_ms"] if base else None
+        rows.append({
+            "stage": stage,
+            "baseline_ms": base_ms,
+            "current_ms": summary["mean_ms"],
+            "ratio": round(summary["mean_ms"] / base_ms, 3) if base_ms else None,
+        })
+    return rows
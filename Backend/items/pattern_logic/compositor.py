@@ -0,0 +1,148 @@
+"""
+패턴 합성 엔진
+4개의 흑백 타일을 2x2 모자이크로 배치한 뒤
+한 번의 임계값 처리 + 사분면별 색상 LUT로 RGB 이미지를 만든다.
+
+같은 atlas 타일에 대해서는 타일별 apply_color + paste 결과와 픽셀 단위로 같다.
+다만 atlas는 크기가 다른 타일(현재 패턴 세트의 3열, 2048px)을 최근접 축소해서 담으므로
+그 타일을 쓰는 바코드는 atlas 도입 전(원본 타일을 그대로 붙이던 때)과 결과가 다르다.
+(이 변환은 pattern_library.ATLAS_REVISION 으로 패턴 세트 버전에 반영됨)
+"""
+
+import threading
+
+import numpy as np
+
+WHITE = (255, 255, 255)
+
+# 값 >> 7 == 0 이면 128 미만 (검은색 부분), 1 이면 흰색 부분
+THRESHOLD_SHIFT = 7
+
+# 사분면별 LUT 시작 위치: LUT[2*q] = q 사분면 색, LUT[2*q + 1] = 흰색
+#   ① 왼쪽 상단 0, ② 오른쪽 상단 2, ③ 왼쪽 하단 4, ④ 오른쪽 하단 6
+QUADRANT_OFFSETS = np.array([[0, 2], [4, 6]], dtype=np.uint8)[:, None, :, None]
+
+# LUT 조회를 나눠서 처리할 행 수
+# (np.take는 intp 인덱스일 때만 빠르므로 작은 조각 단위로 변환해서 조회)
+LOOKUP_CHUNK_ROWS = 128
+
+# 스레드별로 재사용하는 작업 버퍼 (요청마다 새로 할당하지 않음)
+_scratch = threading.local()
+
+# 이보다 큰 작업 버퍼는 스레드에 남기지 않음 (드문 큰 렌더링 뒤에도 워커 스레드마다 메모리를 잡고 있지 않게)
+SCRATCH_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _scratch_buffer(name, shape, dtype):
+    """현재 스레드의 작업 버퍼 (크기가 같으면 재사용, SCRATCH_MAX_BYTES 보다 크면 이번 호출에만 사용)"""
+    buf = getattr(_scratch, name, None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=dtype)
+        if buf.nbytes > SCRATCH_MAX_BYTES:
+            return buf
+        setattr(_scratch, name, buf)
+    return buf
+
+
+def build_lut(quadrant_colors):
+    """
+    사분면 색상 4개로 (8, 3) 색상 LUT 생성
+
+    Args:
+        quadrant_colors: [(r,g,b)] * 4 (①②③④ 순서)
+    """
+    lut = np.empty((8, 3), dtype=np.uint8)
+    lut[0::2] = quadrant_colors
+    lut[1::2] = WHITE
+    return lut
+
+
+def _threshold_mosaic(tiles):
+    """
+    타일 4개를 2x2 모자이크로 배치하고 한 번에 임계값 처리
+
+    Returns:
+        (2H, 2W) uint8 작업 버퍼 (128 미만 → 0, 이상 → 1). 스레드별로 재사용되므로
+        다음 합성 호출 전까지만 유효하다.
+    """
+    height, width = tiles[0].shape
+    idx = _scratch_buffer('mosaic', (height * 2, width * 2), np.uint8)
+
+    # 모자이크 배치
+    idx[:height, :width] = tiles[0]
+    idx[:height, width:] = tiles[1]
+    idx[height:, :width] = tiles[2]
+    idx[height:, width:] = tiles[3]
+
+    # 전체 모자이크를 한 번에 임계값 처리
+    np.right_shift(idx, THRESHOLD_SHIFT, out=idx)
+    return idx
+
+
+def composite_quadrants(tiles, quadrant_colors, out=None):
+    """
+    2x2 모자이크 합성 + 색상 적용을 한 번에 수행
+
+    Args:
+        tiles: 같은 크기의 흑백 uint8 타일 배열 4개 (①②③④ 순서)
+        quadrant_colors: 각 사분면의 검은색 부분에 칠할 (r,g,b) 4개
+        out: 결과를 쓸 (2H, 2W, 3) uint8 배열 (None이면 새로 할당)
+
+    Returns:
+        (2H, 2W, 3) uint8 RGB 배열
+    """
+    height, width = tiles[0].shape
+    idx = _threshold_mosaic(tiles)
+
+    # 사분면 번호를 더해 LUT 인덱스로 변환
+    quadrants = idx.reshape(2, height, 2, width)
+    quadrants += QUADRANT_OFFSETS
+
+    if out is None:
+        out = np.empty((height * 2, width * 2, 3), dtype=np.uint8)
+
+    # LUT 조회 결과를 출력 버퍼에 바로 기록
+    lut = build_lut(quadrant_colors)
+    chunk = _scratch_buffer('lookup', (LOOKUP_CHUNK_ROWS, width * 2), np.intp)
+    for top in range(0, height * 2, LOOKUP_CHUNK_ROWS):
+        rows = min(LOOKUP_CHUNK_ROWS, height * 2 - top)
+        np.copyto(chunk[:rows], idx[top:top + rows])
+        np.take(lut, chunk[:rows], axis=0, out=out[top:top + rows], mode='clip')
+    return out
+
+
+def composite_palette(tiles, quadrant_colors, out=None):
+    """
+    composite_quadrants와 같은 결과를 팔레트(P 모드) 인덱스 배열로 생성
+    결과 색이 흰색 + 최대 4색이므로 PNG를 2~4비트 팔레트로 저장할 수 있다.
+
+    Args:
+        tiles: 같은 크기의 흑백 uint8 타일 배열 4개 (①②③④ 순서)
+        quadrant_colors: 각 사분면의 검은색 부분에 칠할 (r,g,b) 4개
+        out: 결과를 쓸 (2H, 2W) uint8 배열 (None이면 새로 할당)
+
+    Returns:
+        tuple: ((2H, 2W) uint8 팔레트 인덱스 배열, [(r,g,b), ...] 팔레트)
+    """
+    height, width = tiles[0].shape
+    idx = _threshold_mosaic(tiles)
+
+    # 중복 없는 팔레트 (0번은 흰색)
+    palette = [WHITE]
+    for color in quadrant_colors:
+        color = tuple(int(c) for c in color)
+        if color not in palette:
+            palette.append(color)
+
+    if out is None:
+        out = np.empty((height * 2, width * 2), dtype=np.uint8)
+
+    src = idx.reshape(2, height, 2, width)
+    dst = out.reshape(2, height, 2, width)
+    for q, color in enumerate(quadrant_colors):
+        row, col = divmod(q, 2)
+        ink = palette.index(tuple(int(c) for c in color))
+        # 임계값 결과 1(흰색) → 0번, 0(색) → ink 번 : ink - bit * ink
+        np.multiply(src[row, :, col, :], np.uint8(ink), out=dst[row, :, col, :])
+        np.subtract(np.uint8(ink), dst[row, :, col, :], out=dst[row, :, col, :])
+    return out, palette
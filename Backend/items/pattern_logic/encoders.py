@@ -0,0 +1,107 @@
+"""
+패턴 이미지 인코더 프로필
+결과 이미지는 흰색 + 최대 두세 가지 색뿐이라 인코딩 방식에 따라
+인코딩 시간과 파일 크기 차이가 크다.
+"""
+
+import io
+
+from PIL import Image
+
+# 프로필 이름 → 저장 옵션
+#   format: Pillow 저장 포맷 / ext: 파일 확장자 / content_type: HTTP 응답용
+#   palette: True면 P 모드(팔레트) 이미지로 저장 / options: Image.save 옵션
+#   vector: True면 래스터 인코딩 대신 생성기가 타일 경로로 SVG를 만듦
+ENCODER_PROFILES = {
+    # 기존과 같은 기본 PNG (zlib 기본 레벨)
+    "default": {
+        "format": "PNG",
+        "ext": ".png",
+        "content_type": "image/png",
+        "palette": False,
+        "options": {},
+    },
+    # 인코딩 속도 우선 (zlib 레벨 1)
+    "fast": {
+        "format": "PNG",
+        "ext": ".png",
+        "content_type": "image/png",
+        "palette": False,
+        "options": {"compress_level": 1},
+    },
+    # 크기 우선: 2~4비트 팔레트 PNG + optimize
+    "small": {
+        "format": "PNG",
+        "ext": ".png",
+        "content_type": "image/png",
+        "palette": True,
+        "options": {"optimize": True},
+    },
+    # WebP 무손실
+    "webp": {
+        "format": "WEBP",
+        "ext": ".webp",
+        "content_type": "image/webp",
+        "palette": False,
+        "options": {"lossless": True, "quality": 100, "method": 4},
+    },
+    # SVG (타일 경로 + 색, 크기와 무관하게 작고 확대해도 깨지지 않음)
+    "svg": {
+        "format": "SVG",
+        "ext": ".svg",
+        "content_type": "image/svg+xml",
+        "palette": False,
+        "vector": True,
+        "options": {},
+    },
+}
+
+# PIL 이미지를 인코딩하는 프로필 (벤치마크 등)
+RASTER_PROFILES = [name for name, spec in ENCODER_PROFILES.items() if not spec.get("vector")]
+
+DEFAULT_PROFILE = "default"
+
+
+def get_profile(name=None):
+    """
+    인코더 프로필 조회
+
+    Args:
+        name: 프로필 이름 (None이면 기본 프로필)
+
+    Raises:
+        ValueError: 알 수 없는 프로필 이름
+    """
+    name = name or DEFAULT_PROFILE
+    try:
+        return ENCODER_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"알 수 없는 인코더 프로필: {name} (가능한 값: {', '.join(ENCODER_PROFILES)})"
+        )
+
+
+def encode_image(image, profile=None):
+    """
+    PIL Image를 프로필에 맞게 인코딩
+
+    팔레트 프로필에 RGB 이미지가 들어오면 median cut으로 4색 팔레트로 변환한다.
+    (생성기는 처음부터 팔레트 이미지를 만들어서 넘기므로 이 변환을 거치지 않음)
+
+    Returns:
+        인코딩된 바이트
+
+    Raises:
+        ValueError: 벡터(SVG) 프로필 - BarcodePatternGenerator.render_pattern 에서 처리
+    """
+    spec = get_profile(profile)
+    if spec.get("vector"):
+        raise ValueError(f"{profile} 프로필은 이미지 인코딩이 아니라 render_pattern으로 생성합니다.")
+    if spec["palette"] and image.mode != "P":
+        image = image.quantize(colors=4, method=Image.Quantize.MEDIANCUT)
+    elif not spec["palette"] and image.mode == "P":
+        image = image.convert("RGB")
+
+    buf = io.BytesIO()
+    image.save(buf, spec["format"], **spec["options"])
+    return buf.getvalue()
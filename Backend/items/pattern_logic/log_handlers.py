@@ -0,0 +1,168 @@
+"""
+패턴 생성기 로그 핸들러
+요청 스레드는 로그 레코드를 큐에 넣기만 하고, 파일 / 콘솔 쓰기는 별도 리스너 스레드가 처리한다.
+로그 파일은 크기와 시간 중 먼저 도달한 기준으로 교체(rotate)된다.
+
+여러 워커 프로세스가 같은 파일을 각자 교체하면 한 프로세스의 rename 때문에 다른 프로세스의 로그가
+옛 파일로 가거나 사라지므로, 파일은 프로세스별로 나눈다 (pattern_generator.<pid>.log).
+프로세스가 시작할 때마다 파일이 새로 생기므로, 시작 시 오래된 / 개수를 넘는 다른 pid의 파일을 지운다.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import re
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+
+def process_log_filename(filename, pid=None):
+    """
+    프로세스별 로그 파일 이름 (logs/pattern_generator.log → logs/pattern_generator.<pid>.log)
+    """
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{pid or os.getpid()}{ext}"
+
+
+def prune_process_logs(filename, retention_days=7, max_files=20, keep_pid=None):
+    """
+    다른 프로세스의 로그 파일(백업 포함) 정리
+
+    마지막 기록이 retention_days 일보다 오래된 pid의 파일을 지우고,
+    남은 pid가 max_files 개를 넘으면 오래된 것부터 지운다. 현재 프로세스(keep_pid)의 파일은 남긴다.
+
+    Returns:
+        int: 지운 파일 수
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    root, ext = os.path.splitext(os.path.basename(filename))
+    pattern = re.compile(rf"^{re.escape(root)}\.(\d+){re.escape(ext)}(?:\.\d+)?$")
+    keep_pid = keep_pid or os.getpid()
+
+    # pid → (마지막 수정 시각, [파일 경로])
+    groups = {}
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        match = pattern.match(name)
+        if not match or int(match.group(1)) == keep_pid:
+            continue
+        path = os.path.join(directory, name)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            continue
+        latest, paths = groups.get(match.group(1), (0, []))
+        paths.append(path)
+        groups[match.group(1)] = (max(latest, mtime), paths)
+
+    cutoff = time.time() - retention_days * 86400
+    # 최근 것부터 max_files 개(현재 프로세스 몫 1개 제외)만 남김
+    ordered = sorted(groups.values(), key=lambda group: group[0], reverse=True)
+    keep = max(max_files - 1, 0)
+    removed = 0
+    for n, (latest, paths) in enumerate(ordered):
+        if n < keep and latest >= cutoff:
+            continue
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    """
+    크기(max_bytes) 또는 시간(interval_hours)이 지나면 교체하는 파일 핸들러
+    백업 파일은 RotatingFileHandler와 같이 .1, .2, ... 번호로 backup_count 개까지 유지
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=10,
+                 interval_hours=24, encoding='utf-8'):
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self.interval = interval_hours * 3600
+        self.rollover_at = time.time() + self.interval
+
+    def shouldRollover(self, record):
+        if time.time() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = time.time() + self.interval
+
+
+class QueueingRotatingFileHandler(QueueHandler):
+    """
+    큐 기반 로그 핸들러 (LOGGING 설정에서 class로 지정)
+    SizeAndTimeRotatingFileHandler (+ 선택적으로 콘솔)를 QueueListener 스레드에서 실행한다.
+    """
+
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=10,
+                 interval_hours=24, console=True, fmt=DEFAULT_FORMAT,
+                 retention_days=7, max_process_files=20):
+        super().__init__(queue.SimpleQueue())
+        self._closed = False
+        self._file_args = (filename, max_bytes, backup_count, interval_hours)
+
+        # 종료된 프로세스들의 로그 파일이 계속 쌓이지 않도록 시작할 때 정리
+        prune_process_logs(filename, retention_days, max_process_files)
+
+        self._target_formatter = logging.Formatter(fmt)
+        targets = [self._open_file()]
+        if console:
+            targets.append(logging.StreamHandler(sys.stdout))
+        for target in targets:
+            target.setFormatter(self._target_formatter)
+
+        self.listener = QueueListener(self.queue, *targets, respect_handler_level=True)
+        self.listener.start()
+        # 프로세스 종료 시 큐에 남은 로그를 모두 쓰고 종료
+        atexit.register(self.stop_listener)
+        # 배치 렌더링 워커처럼 fork된 자식 프로세스에는 리스너 스레드가 없으므로 새로 시작
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._restart_listener)
+
+    def _open_file(self):
+        """현재 프로세스 전용 로그 파일 핸들러"""
+        filename, max_bytes, backup_count, interval_hours = self._file_args
+        return SizeAndTimeRotatingFileHandler(
+            process_log_filename(filename), max_bytes, backup_count, interval_hours,
+        )
+
+    def stop_listener(self):
+        """큐에 남은 로그를 모두 쓰고 리스너 스레드 종료"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def _restart_listener(self):
+        if self._closed:
+            return
+        self.queue = queue.SimpleQueue()
+        self.listener.queue = self.queue
+        # 부모의 파일 핸들러를 이어 쓰지 않고 자식 pid의 파일로 새로 염 (닫지 않고 버림: 부모 소유)
+        file_handler = self._open_file()
+        file_handler.setFormatter(self._target_formatter)
+        self.listener.handlers = (file_handler,) + tuple(
+            h for h in self.listener.handlers if not isinstance(h, SizeAndTimeRotatingFileHandler)
+        )
+        self.listener._thread = None
+        self.listener.start()
+
+    def close(self):
+        self._closed = True
+        self.stop_listener()
+        for target in self.listener.handlers:
+            target.close()
+        super().close()
@@ -0,0 +1,136 @@
+"""
+단계별 소요 시간 계측
+timed(단계 이름)로 감싼 구간의 시간을 프로세스 안의 히스토그램에 모으고,
+collect_timings() 안에서 실행 중이면 요청별 목록(Server-Timing 헤더용)에도 기록한다.
+
+히스토그램은 프로세스별이므로 워커가 여러 개면 워커마다 따로 집계된다.
+"""
+
+import bisect
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+
+# 히스토그램 구간 상한 (초)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_NAME = "pattern_stage_duration_seconds"
+
+_lock = threading.Lock()
+_histograms = {}  # 단계 이름 → {"buckets": [구간별 개수], "sum": 합계, "count": 개수}
+
+# 현재 요청의 [(단계 이름, 초), ...] (collect_timings 밖이면 None)
+_current_timings = contextvars.ContextVar("pattern_stage_timings", default=None)
+
+
+def observe(stage, seconds):
+    """단계 소요 시간 하나를 기록"""
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        index = bisect.bisect_left(BUCKETS, seconds)
+        if index < len(BUCKETS):
+            hist["buckets"][index] += 1
+        hist["sum"] += seconds
+        hist["count"] += 1
+
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+class timed:
+    """
+    구간 시간 측정 (with 문 / 데코레이터 모두 사용 가능, async 함수도 지원)
+
+        with timed("encode"):
+            ...
+
+        @timed("create_product_with_pattern")
+        def view(request): ...
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+        self._started = []
+
+    def __enter__(self):
+        self._started.append(time.perf_counter())
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.stage, time.perf_counter() - self._started.pop())
+        return False
+
+    def __call__(self, func):
+        stage = self.stage
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+@contextmanager
+def collect_timings():
+    """
+    이 블록 안에서 기록된 단계 시간을 목록으로 모음
+
+    Yields:
+        list: [(단계 이름, 초), ...] (블록이 끝날 때까지 계속 채워짐)
+    """
+    timings = []
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def snapshot():
+    """현재 히스토그램 복사본 {단계 이름: {"buckets", "sum", "count"}}"""
+    with _lock:
+        return {
+            stage: {"buckets": list(h["buckets"]), "sum": h["sum"], "count": h["count"]}
+            for stage, h in _histograms.items()
+        }
+
+
+def reset():
+    """히스토그램 초기화"""
+    with _lock:
+        _histograms.clear()
+
+
+def render_prometheus():
+    """
+    히스토그램을 Prometheus 텍스트 형식으로 변환
+
+    Returns:
+        str: `pattern_stage_duration_seconds_bucket{stage="...",le="..."}` 등의 줄
+    """
+    lines = [
+        f"# HELP {METRIC_NAME} Duration of pattern service stages.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for stage, hist in sorted(snapshot().items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS, hist["buckets"]):
+            cumulative += count
+            lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{stage="{stage}",le="+Inf"}} {hist["count"]}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{stage}"}} {hist["sum"]:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{stage}"}} {hist["count"]}')
+    return "\n".join(lines) + "\n"
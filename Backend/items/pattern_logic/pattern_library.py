@@ -0,0 +1,510 @@
+"""
+패턴 라이브러리
+mnt_project 의 패턴 타일 이미지를 프로세스당 한 번만 로드해서
+모든 요청/생성기 인스턴스가 공유하도록 관리한다.
+
+패턴 디렉토리에 컴파일된 패턴 세트 파일(pattern_set.bin)이 있으면 PNG 대신 그 파일을
+memmap으로 열어서 같은 서버의 모든 워커가 타일 메모리를 공유한다.
+"""
+
+import io
+import os
+import re
+import hashlib
+import threading
+import time
+import logging
+from collections import Counter, OrderedDict
+
+import numpy as np
+from PIL import Image
+
+try:
+    from .pattern_set import PATTERN_SET_FILENAME, open_pattern_set, write_pattern_set
+    from .vector import trace_tile
+except ImportError:  # 스크립트로 직접 실행하는 경우
+    from pattern_set import PATTERN_SET_FILENAME, open_pattern_set, write_pattern_set
+    from vector import trace_tile
+
+logger = logging.getLogger(__name__)
+
+# 지원하는 파일명 규칙: 00.png, 0-0.png, (0,0).png
+PATTERN_FILENAME_RE = re.compile(r"^(?:(\d)(\d)|(\d)-(\d)|\((\d),(\d)\))\.png$")
+
+# 회전 상태 개수 (0°, 90°, 180°, 270°)
+ORIENTATIONS = 4
+
+# 타일이 하나도 없을 때 사용하는 기본 타일 크기
+DEFAULT_TILE_SIZE = 256
+
+# 축소 atlas를 크기별로 보관하는 개수 (오래 안 쓴 크기부터 버림, 스프라이트 시트용)
+SCALED_ATLAS_CACHE_SIZE = 4
+
+# 패턴 세트 파일이 있을 때 PNG 타일의 mtime을 다시 확인하는 간격 (초)
+# (reload_if_changed 는 요청마다 불리므로 매번 타일 100개를 stat 하지 않음)
+TILE_SCAN_INTERVAL = 5.0
+
+# 원본과 크기가 다른 타일 캐시 용량 (바이트, 단일 렌더링에서 타일 단위로 필요할 때만 만듦)
+SCALED_TILE_CACHE_BYTES = 256 * 1024 * 1024
+
+# 타일 → atlas 변환 방식이 바뀌면 올림 (패턴 세트 버전에 섞여서 예전 렌더 캐시 / PatternAsset을 쓰지 않게 됨)
+#   2: 크기가 다른 타일을 가장 많은 크기로 최근접 축소해서 통일 (이전에는 원본 크기 그대로 붙임)
+ATLAS_REVISION = 2
+
+# 파일명 규칙 우선순위 (같은 좌표에 파일이 여러 개 있으면 앞쪽 규칙 사용)
+_FILENAME_PRIORITY = ("{row}{col}.png", "{row}-{col}.png", "({row},{col}).png")
+
+
+def find_pattern_dir(pattern_dir=None):
+    """
+    패턴 디렉토리 경로를 결정
+
+    Args:
+        pattern_dir: 명시적으로 지정한 경로 (None이면 기본 후보 경로 탐색)
+
+    Returns:
+        존재하는 패턴 디렉토리의 절대 경로
+    """
+    if pattern_dir is None:
+        project_root = os.path.dirname(os.path.abspath(__file__))
+        candidate_dirs = [
+            os.path.join(project_root, "mnt_project"),
+            os.path.join(project_root, "patterns"),
+            "/mnt/project",
+        ]
+        pattern_dir = next((d for d in candidate_dirs if os.path.isdir(d)), None)
+
+    if not pattern_dir or not os.path.isdir(pattern_dir):
+        raise FileNotFoundError(
+            "패턴 디렉터리를 찾을 수 없습니다. --pattern-dir 경로를 확인하세요."
+        )
+
+    return os.path.abspath(pattern_dir)
+
+
+def scan_pattern_files(pattern_dir):
+    """
+    디렉토리를 한 번만 읽어서 (행, 열) → 파일 경로 매핑 생성
+
+    Returns:
+        dict: {(row, col): filepath}
+    """
+    names = set(os.listdir(pattern_dir))
+    files = {}
+    for name in names:
+        match = PATTERN_FILENAME_RE.match(name)
+        if not match:
+            continue
+        digits = [g for g in match.groups() if g is not None]
+        row, col = int(digits[0]), int(digits[1])
+        if (row, col) in files:
+            continue
+        for template in _FILENAME_PRIORITY:
+            candidate = template.format(row=row, col=col)
+            if candidate in names:
+                files[(row, col)] = os.path.join(pattern_dir, candidate)
+                break
+    return files
+
+
+def atlas_tile_size(patterns):
+    """
+    atlas 타일 크기: 크기가 섞여 있으면 가장 많은 크기 (타일이 없으면 DEFAULT_TILE_SIZE)
+
+    Raises:
+        ValueError: 정사각형이 아닌 타일 크기
+    """
+    sizes = Counter(img.size for img in patterns.values())
+    if sizes:
+        width, height = sizes.most_common(1)[0][0]
+    else:
+        width = height = DEFAULT_TILE_SIZE
+    if width != height:
+        raise ValueError(f"패턴 타일은 정사각형이어야 합니다: {width}x{height}")
+    return width
+
+
+def load_tile_images(pattern_dir):
+    """
+    패턴 PNG 파일을 모두 읽어서 흑백 이미지로 변환
+
+    버전에는 타일 파일 내용과 함께 ATLAS_REVISION, 크기를 맞춘 타일 목록이 들어가므로
+    같은 파일이라도 atlas로 바뀌는 방식이 달라지면 버전도 달라진다.
+
+    Returns:
+        tuple: ({(row, col): 흑백 PIL Image}, 패턴 세트 버전 - 해시 16자)
+    """
+    files = scan_pattern_files(pattern_dir)
+
+    patterns = {}
+    digest = hashlib.sha256()
+    for row in range(10):
+        for col in range(10):
+            filepath = files.get((row, col))
+            if filepath is None:
+                logger.warning("패턴 파일 없음: (%d,%d) in %s", row, col, pattern_dir)
+                continue
+            try:
+                with open(filepath, 'rb') as f:
+                    raw = f.read()
+                with Image.open(io.BytesIO(raw)) as src:
+                    img = src.convert('L')  # 흑백으로 변환
+                patterns[(row, col)] = img
+                digest.update(f"{row},{col}:{len(raw)}:".encode('ascii'))
+                digest.update(raw)
+                logger.debug("패턴 로드 완료: %s", os.path.basename(filepath))
+            except Exception as e:
+                logger.error("패턴 로드 실패 %s: %s", os.path.basename(filepath), e)
+
+    digest.update(f"atlas:{ATLAS_REVISION}".encode('ascii'))
+    if patterns:
+        size = atlas_tile_size(patterns)
+        for (row, col), img in sorted(patterns.items()):
+            if img.size != (size, size):
+                digest.update(f"resize:{row},{col}:{img.size[0]}x{img.size[1]}->{size}".encode('ascii'))
+
+    return patterns, digest.hexdigest()[:16]
+
+
+def build_atlas(patterns):
+    """
+    10x10 패턴 x 4방향 회전 결과를 하나의 연속된 uint8 배열로 미리 계산
+
+    atlas[row, col, k] 는 (row, col) 패턴을 시계 방향으로 k*90° 돌린 타일이다.
+    정사각형 타일의 90° 단위 회전은 전치(transpose)만으로 손실 없이 계산된다.
+    없는 패턴은 기존 동작과 같이 (0,0) 패턴으로, 그것도 없으면 흰색으로 채운다.
+
+    Args:
+        patterns: {(row, col): 흑백 PIL Image}
+
+    Returns:
+        tuple: (atlas 배열 (10, 10, 4, H, W), present 마스크 (10, 10))
+    """
+    # 크기가 섞여 있으면 가장 많은 크기로 통일 (흑백 타일이라 최근접 보간으로 충분)
+    # 원본과 다른 그림이 되므로 경고를 남김 (버전은 load_tile_images 에서 이 변환까지 반영)
+    width = height = atlas_tile_size(patterns)
+    resized = sorted(key for key, img in patterns.items() if img.size != (width, height))
+    if resized:
+        logger.warning(
+            "패턴 타일 %d개의 크기가 달라 %dx%d로 축소/확대합니다 (렌더 결과가 원본 타일과 다름): %s",
+            len(resized), width, height,
+            ", ".join(f"({r},{c}) {patterns[(r, c)].size[0]}px" for r, c in resized),
+        )
+
+    # 모든 칸을 아래에서 채우므로 초기화 없이 할당 (400장 분량이라 fill 비용이 큼)
+    atlas = np.empty((10, 10, ORIENTATIONS, height, width), dtype=np.uint8)
+    present = np.zeros((10, 10), dtype=bool)
+
+    for (row, col), img in patterns.items():
+        if img.size != (width, height):
+            img = img.resize((width, height), Image.NEAREST)
+        tile = np.asarray(img, dtype=np.uint8)
+        for k in range(ORIENTATIONS):
+            # Image.rotate(-90*k) 와 동일한 시계 방향 회전
+            atlas[row, col, k] = np.rot90(tile, -k)
+        present[row, col] = True
+
+    if present[0, 0]:
+        atlas[~present] = atlas[0, 0]
+    else:
+        atlas[~present] = 255
+
+    return atlas, present
+
+
+def compile_pattern_set(pattern_dir, output_path=None):
+    """
+    패턴 PNG 디렉토리를 패턴 세트 파일 하나로 컴파일 (회전 결과 포함)
+
+    실행 중인 워커는 다음 요청에서 파일 교체를 감지하고 새 세트로 전환한다.
+
+    Args:
+        pattern_dir: 패턴 이미지 디렉토리
+        output_path: 저장 경로 (None이면 패턴 디렉토리의 pattern_set.bin)
+
+    Returns:
+        tuple: (저장 경로, 패턴 세트 버전, 실제 파일이 있던 패턴 수)
+    """
+    pattern_dir = find_pattern_dir(pattern_dir)
+    if output_path is None:
+        output_path = os.path.join(pattern_dir, PATTERN_SET_FILENAME)
+
+    patterns, version = load_tile_images(pattern_dir)
+    atlas, present = build_atlas(patterns)
+    write_pattern_set(output_path, atlas, present, version)
+    logger.info("패턴 세트 컴파일 완료: %s (버전 %s, 패턴 %d개)", output_path, version, len(patterns))
+    return output_path, version, len(patterns)
+
+
+class PatternLibrary:
+    """
+    패턴 타일 저장소 (스레드 안전)
+
+    patterns 딕셔너리와 atlas 배열은 reload() 시 통째로 교체되므로,
+    읽는 쪽은 잠금 없이 현재 참조를 그대로 사용하면 된다.
+    """
+
+    def __init__(self, pattern_dir):
+        self.pattern_dir = pattern_dir
+        self.pattern_set_path = os.path.join(pattern_dir, PATTERN_SET_FILENAME)
+        self.patterns = {}
+        self.atlas = None
+        self.present = None
+        self.signature = None
+        self.version = None
+        self.source = None
+        self._scaled = OrderedDict()
+        self._scaled_tiles = OrderedDict()
+        self._scaled_tile_bytes = 0
+        self._paths = {}
+        self._tile_scan = (float('-inf'), 0)  # (확인 시각, 가장 최근 PNG 타일 mtime)
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _newest_tile_mtime(self, max_age=None):
+        """
+        가장 최근에 수정된 PNG 타일의 mtime (ns, 타일이 없으면 0)
+        max_age 초 (None이면 TILE_SCAN_INTERVAL) 안에 확인한 값이 있으면 다시 stat 하지 않고 그 값을 돌려줌
+        """
+        if max_age is None:
+            max_age = TILE_SCAN_INTERVAL
+        checked_at, newest = self._tile_scan
+        now = time.monotonic()
+        if now - checked_at < max_age:
+            return newest
+        newest = 0
+        for path in scan_pattern_files(self.pattern_dir).values():
+            try:
+                newest = max(newest, os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                continue
+        self._tile_scan = (now, newest)
+        return newest
+
+    def _source_signature(self, tile_max_age=None):
+        """
+        변경 감지용 서명
+        패턴 세트 파일이 있으면 그 파일의 (inode, mtime, 크기) - rename으로 교체되면 inode가 바뀜 -
+        와 가장 최근 PNG 타일 mtime (세트를 다시 컴파일하지 않고 PNG만 고친 경우),
+        없으면 디렉토리의 (inode, mtime) - 파일 추가/삭제/교체 시 mtime이 바뀜
+        """
+        try:
+            stat = os.stat(self.pattern_set_path)
+        except FileNotFoundError:
+            stat = os.stat(self.pattern_dir)
+            return (None, stat.st_ino, stat.st_mtime_ns)
+        return (
+            PATTERN_SET_FILENAME, stat.st_ino, stat.st_mtime_ns, stat.st_size,
+            self._newest_tile_mtime(tile_max_age),
+        )
+
+    def _load_pattern_set(self):
+        """
+        패턴 세트 파일을 memmap으로 열기
+
+        Returns:
+            tuple | None: (atlas, present, 버전), 파일이 없거나 잘못됐으면 None (PNG에서 로드)
+        """
+        if not os.path.exists(self.pattern_set_path):
+            return None
+        try:
+            return open_pattern_set(self.pattern_set_path)
+        except (OSError, ValueError) as e:
+            logger.error("패턴 세트 파일을 열 수 없어 PNG에서 로드합니다 %s: %s", self.pattern_set_path, e)
+            return None
+
+    def reload(self):
+        """패턴 세트 파일(또는 패턴 이미지)을 다시 읽어서 라이브러리를 교체"""
+        with self._lock:
+            signature = self._source_signature(tile_max_age=0)
+
+            loaded = self._load_pattern_set()
+            if loaded is not None and signature[-1] > signature[2]:
+                # 패턴 세트 파일보다 새로 고친 PNG 타일이 있으면 옛 세트 대신 PNG를 사용
+                logger.warning(
+                    "PNG 타일이 패턴 세트 파일보다 새로워 PNG에서 로드합니다 "
+                    "(compile_pattern_set 으로 다시 컴파일하세요): %s", self.pattern_set_path,
+                )
+                loaded = None
+            if loaded is not None:
+                atlas, present, version = loaded
+                source = self.pattern_set_path
+            else:
+                logger.info("패턴 이미지 로드 시작: %s", self.pattern_dir)
+                patterns, version = load_tile_images(self.pattern_dir)
+                atlas, present = build_atlas(patterns)
+                atlas.setflags(write=False)
+                source = self.pattern_dir
+
+            # patterns 의 이미지는 atlas 의 0° 타일을 그대로 참조 (추가 메모리 없음)
+            self.patterns = {
+                (row, col): Image.frombuffer('L', atlas.shape[:-3:-1], atlas[row, col, 0], 'raw', 'L', 0, 1)
+                for row, col in np.argwhere(present).tolist()
+            }
+            # 참조 교체만 하므로 렌더링 중인 요청은 이전 atlas(이전 memmap)를 끝까지 사용
+            self.atlas = atlas
+            self.present = present
+            self.signature = signature
+            # 패턴 세트 버전: 타일 파일 내용의 해시 (렌더 캐시 키에 사용)
+            self.version = version
+            self.source = source
+            self._scaled = OrderedDict()
+            self._scaled_tiles = OrderedDict()
+            self._scaled_tile_bytes = 0
+            self._paths = {}
+            logger.info("총 %d개의 패턴 로드 완료 (버전 %s, %s)", len(self.patterns), self.version, source)
+
+    @property
+    def tile_size(self):
+        """atlas 타일 한 변의 픽셀 수"""
+        return self.atlas.shape[-1]
+
+    def get_tile(self, row, col, rotation, tile_size=None):
+        """
+        회전이 적용된 타일 배열 반환 (복사/리샘플링 없음, 읽기 전용 view)
+
+        Args:
+            row, col: 패턴 좌표 (0-9)
+            rotation: 회전 각도 (90의 배수, 360 이상도 허용)
+            tile_size: 타일 한 변 크기 (None이면 원본, 이미 만든 scaled_atlas가 있으면 그것, 없으면 scaled_tile)
+        """
+        k = (rotation // 90) % ORIENTATIONS
+        atlas = self.atlas
+        if tile_size is None or tile_size == atlas.shape[-1]:
+            return atlas[row, col, k]
+        scaled = self._scaled.get(tile_size)
+        if scaled is not None and self.atlas is atlas:
+            return scaled[row, col, k]
+        # 한 장에 타일 4개만 쓰므로 크기마다 atlas 전체(400개, 타일 1023px이면 약 400MB)를 만들지 않고
+        # 타일 단위로 바꿈. 0°만 보관하고 회전은 view로 (scaled_atlas와 같은 순서라 픽셀도 같음)
+        return np.rot90(self.scaled_tile(row, col, tile_size), -k)
+
+    def scaled_atlas(self, tile_size):
+        """
+        타일 한 변이 tile_size 인 축소 atlas (크기별로 한 번만 계산해서 재사용)
+
+        0° 타일을 BOX 필터로 축소한 뒤 build_atlas 와 같이 rot90 으로 회전 상태를 채운다.
+        (흑백 타일의 경계는 중간 밝기가 되고, 합성 시 임계값 처리로 다시 흑백이 됨)
+
+        Args:
+            tile_size: 1 이상, 원본 타일 크기 이하
+
+        Returns:
+            (10, 10, 4, tile_size, tile_size) 읽기 전용 uint8 배열
+
+        Raises:
+            ValueError: 범위를 벗어난 크기
+        """
+        atlas = self.atlas
+        if tile_size == atlas.shape[-1]:
+            return atlas
+        if not 1 <= tile_size < atlas.shape[-1]:
+            raise ValueError(f"타일 크기는 1 ~ {atlas.shape[-1]} 사이여야 합니다: {tile_size}")
+
+        with self._lock:
+            scaled = self._scaled.get(tile_size)
+            if scaled is not None and self.atlas is atlas:
+                self._scaled.move_to_end(tile_size)
+                return scaled
+
+            scaled = np.empty((10, 10, ORIENTATIONS, tile_size, tile_size), dtype=np.uint8)
+            for row in range(10):
+                for col in range(10):
+                    tile = Image.fromarray(np.asarray(atlas[row, col, 0]), 'L')
+                    small = np.asarray(tile.resize((tile_size, tile_size), Image.BOX))
+                    for k in range(ORIENTATIONS):
+                        scaled[row, col, k] = np.rot90(small, -k)
+            scaled.setflags(write=False)
+
+            if self.atlas is atlas:
+                self._scaled[tile_size] = scaled
+                while len(self._scaled) > SCALED_ATLAS_CACHE_SIZE:
+                    self._scaled.popitem(last=False)
+            return scaled
+
+    def scaled_tile(self, row, col, tile_size):
+        """
+        tile_size 로 크기를 바꾼 0° 타일 (타일별로 한 번만 계산, 용량 제한 LRU)
+
+        축소는 scaled_atlas 와 같은 BOX 필터, 확대는 최근접 보간
+        (패턴 타일은 흑백 도형이라 최근접 보간으로 확대해도 경계가 그대로 유지된다).
+
+        Returns:
+            (tile_size, tile_size) 읽기 전용 uint8 배열
+        """
+        atlas = self.atlas
+        key = (tile_size, row, col)
+        with self._lock:
+            tile = self._scaled_tiles.get(key)
+            if tile is not None and self.atlas is atlas:
+                self._scaled_tiles.move_to_end(key)
+                return tile
+
+            source = Image.fromarray(np.asarray(atlas[row, col, 0]), 'L')
+            resample = Image.BOX if tile_size < atlas.shape[-1] else Image.NEAREST
+            tile = np.asarray(source.resize((tile_size, tile_size), resample))
+            tile.setflags(write=False)
+
+            if self.atlas is atlas:
+                self._scaled_tiles[key] = tile
+                self._scaled_tile_bytes += tile.nbytes
+                while self._scaled_tile_bytes > SCALED_TILE_CACHE_BYTES and len(self._scaled_tiles) > 1:
+                    _, evicted = self._scaled_tiles.popitem(last=False)
+                    self._scaled_tile_bytes -= evicted.nbytes
+            return tile
+
+    def tile_path(self, row, col):
+        """
+        (row, col) 패턴 0° 타일의 SVG path 데이터 (원본 해상도에서 한 번만 변환해서 재사용)
+        좌표계는 0 ~ tile_size
+        """
+        paths = self._paths
+        d = paths.get((row, col))
+        if d is None:
+            d = paths[(row, col)] = trace_tile(self.atlas[row, col, 0])
+        return d
+
+    def reload_if_changed(self):
+        """
+        mnt_project 디렉토리 또는 패턴 세트 파일이 바뀌었으면 다시 로드
+
+        Returns:
+            bool: 다시 로드했으면 True
+        """
+        try:
+            signature = self._source_signature()
+        except OSError:
+            return False
+        if signature == self.signature:
+            return False
+        self.reload()
+        return True
+
+
+_libraries = {}
+_libraries_lock = threading.Lock()
+
+
+def get_pattern_library(pattern_dir=None):
+    """
+    프로세스 단위로 공유되는 PatternLibrary 반환 (최초 호출 시에만 로드)
+
+    Args:
+        pattern_dir: 패턴 이미지 디렉토리 (None이면 기본 경로 탐색)
+    """
+    pattern_dir = find_pattern_dir(pattern_dir)
+    library = _libraries.get(pattern_dir)
+    if library is None:
+        with _libraries_lock:
+            library = _libraries.get(pattern_dir)
+            if library is None:
+                library = PatternLibrary(pattern_dir)
+                _libraries[pattern_dir] = library
+    return library
+
+
+def reload_pattern_library(pattern_dir=None):
+    """mnt_project 변경 후 명시적으로 호출하는 재로드 훅"""
+    library = get_pattern_library(pattern_dir)
+    library.reload()
+    return library
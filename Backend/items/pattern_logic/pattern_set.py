@@ -0,0 +1,129 @@
+"""
+컴파일된 패턴 세트 파일 (pattern_set.bin)
+10x10 패턴 x 4방향 회전 atlas를 헤더 + 원시 uint8 배열 하나로 저장한다.
+
+워커는 PNG를 디코딩하지 않고 이 파일을 np.memmap으로 열기만 하므로 시작이 즉시 끝나고,
+같은 파일을 연 모든 프로세스가 OS 페이지 캐시의 한 사본을 공유한다.
+파일은 임시 파일에 쓴 뒤 rename으로 교체되므로, 이미 열려 있던 매핑은 이전 세트를 계속 읽고
+새로 여는 쪽은 새 세트를 읽는다.
+
+파일 구조 (리틀 엔디언):
+    0   magic (8바이트, b"PATSET\\r\\n")
+    8   파일 형식 버전 (uint32)
+    12  타일 한 변 픽셀 수 (uint32)
+    16  회전 상태 수 (uint32)
+    20  atlas 시작 위치 (uint32, DATA_ALIGN 배수)
+    24  패턴 세트 버전 (16바이트 ASCII, PatternLibrary.version 과 같은 값)
+    40  present 마스크 (100바이트, (row, col) 순)
+    ... 0으로 채움
+    data_offset  atlas (10, 10, 회전, 타일, 타일) uint8
+"""
+
+import os
+import struct
+import tempfile
+
+import numpy as np
+
+MAGIC = b"PATSET\r\n"
+FORMAT_VERSION = 1
+
+# 기본 파일 이름 (패턴 디렉토리 안에 두면 PatternLibrary가 자동으로 사용)
+PATTERN_SET_FILENAME = "pattern_set.bin"
+
+_HEADER = struct.Struct("<8sIIII16s100s")
+
+# atlas 시작 위치 정렬 (페이지 크기 배수라 mmap 오프셋으로 바로 쓸 수 있음)
+DATA_ALIGN = 4096
+
+
+def write_pattern_set(path, atlas, present, version):
+    """
+    atlas를 패턴 세트 파일로 저장 (임시 파일에 쓴 뒤 rename으로 원자적 교체)
+
+    Args:
+        path: 저장할 파일 경로
+        atlas: (10, 10, 회전, 타일, 타일) uint8 배열
+        present: (10, 10) bool 마스크 (실제 파일이 있던 패턴)
+        version: 패턴 세트 버전 문자열 (16자 이하 ASCII)
+    """
+    atlas = np.ascontiguousarray(atlas, dtype=np.uint8)
+    rows, cols, orientations, height, width = atlas.shape
+    if (rows, cols) != (10, 10) or height != width:
+        raise ValueError(f"잘못된 atlas 형태: {atlas.shape}")
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, width, orientations, DATA_ALIGN,
+        version.encode("ascii"),
+        np.asarray(present, dtype=np.uint8).tobytes(),
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header.ljust(DATA_ALIGN, b"\0"))
+            f.write(memoryview(atlas).cast("B"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_header(path):
+    """
+    패턴 세트 파일 헤더 읽기
+
+    Returns:
+        dict: tile_size / orientations / data_offset / version / present
+
+    Raises:
+        ValueError: 패턴 세트 파일이 아니거나 지원하지 않는 형식 버전 / 잘린 파일
+    """
+    with open(path, "rb") as f:
+        raw = f.read(_HEADER.size)
+        size = os.fstat(f.fileno()).st_size
+    if len(raw) < _HEADER.size:
+        raise ValueError(f"패턴 세트 파일이 너무 짧습니다: {path}")
+
+    magic, fmt, tile_size, orientations, data_offset, version, present = _HEADER.unpack(raw)
+    if magic != MAGIC:
+        raise ValueError(f"패턴 세트 파일이 아닙니다: {path}")
+    if fmt != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 패턴 세트 형식 버전: {fmt}")
+
+    expected = data_offset + 100 * orientations * tile_size * tile_size
+    if size != expected:
+        raise ValueError(f"패턴 세트 파일 크기가 맞지 않습니다: {size} != {expected}")
+
+    return {
+        "tile_size": tile_size,
+        "orientations": orientations,
+        "data_offset": data_offset,
+        "version": version.rstrip(b"\0").decode("ascii"),
+        "present": np.frombuffer(present, dtype=np.uint8).reshape(10, 10).astype(bool),
+    }
+
+
+def open_pattern_set(path):
+    """
+    패턴 세트 파일을 읽기 전용 memmap으로 열기 (타일 데이터는 접근할 때 페이지 단위로 읽힘)
+
+    Returns:
+        tuple: (atlas memmap (10, 10, 회전, 타일, 타일), present 마스크, 버전 문자열)
+
+    Raises:
+        ValueError: 잘못된 패턴 세트 파일
+    """
+    header = read_header(path)
+    size = header["tile_size"]
+    atlas = np.memmap(
+        path, dtype=np.uint8, mode="r", offset=header["data_offset"],
+        shape=(10, 10, header["orientations"], size, size),
+    )
+    # 슬라이스마다 memmap 객체가 생기지 않도록 일반 ndarray view로 (매핑은 view가 유지)
+    return atlas.view(np.ndarray), header["present"], header["version"]
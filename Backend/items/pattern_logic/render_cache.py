@@ -0,0 +1,157 @@
+"""
+패턴 렌더 캐시
+패턴 결과는 (바코드, 하단 색상, 패턴 세트 버전)만으로 결정되므로
+인코딩된 PNG를 메모리(LRU) + 디스크 두 단계로 캐시한다.
+"""
+
+import os
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+# 메모리 캐시 기본 용량 (바이트)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def normalize_hex(hex_str):
+    """'#AABBCC' / 'aabbcc' / None → '#aabbcc' / '' (캐시 키용)"""
+    if not hex_str:
+        return ''
+    return '#' + hex_str.strip().lstrip('#').lower()
+
+
+def render_key(barcode, bottom_color_hex, pattern_version, variant=''):
+    """(바코드, 정규화된 hex, 패턴 세트 버전, 출력 형식)의 해시"""
+    raw = f"{barcode}|{normalize_hex(bottom_color_hex)}|{pattern_version}|{variant}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def write_atomic(path, data):
+    """임시 파일에 쓴 뒤 rename (읽는 쪽이 쓰다 만 파일을 보지 않도록)"""
+    directory = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class RenderCache:
+    """
+    메모리 LRU(바이트 용량 제한) + 디스크 2단계 렌더 캐시
+
+    키는 그대로 파일명(확장자 포함)으로 쓰이므로 경로 구분자가 없는 문자열이어야 한다.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: 디스크 캐시 디렉토리 (None이면 메모리 캐시만 사용)
+            max_bytes: 메모리 캐시 최대 용량
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key):
+        """디스크 캐시 파일 경로 (디스크 캐시를 쓰지 않으면 None)"""
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, key)
+
+    def _remember(self, key, data):
+        """메모리 LRU에 추가 (잠금을 잡은 상태에서 호출)"""
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+
+    def get(self, key):
+        """
+        캐시된 바이트 반환 (메모리 → 디스크 순서로 조회, 없으면 None)
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+        path = self.path(key)
+        if path is not None:
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                with self._lock:
+                    self._remember(key, data)
+                    self.disk_hits += 1
+                return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def contains(self, key):
+        """통계를 바꾸지 않고 캐시 존재 여부만 확인"""
+        with self._lock:
+            if key in self._entries:
+                return True
+        path = self.path(key)
+        return path is not None and os.path.exists(path)
+
+    def put(self, key, data):
+        """
+        메모리와 디스크에 저장 (디스크는 임시 파일 → rename으로 원자적으로 기록)
+
+        Returns:
+            디스크 캐시 파일 경로 (디스크 캐시를 쓰지 않으면 None)
+        """
+        with self._lock:
+            self._remember(key, data)
+
+        path = self.path(key)
+        if path is not None and not os.path.exists(path):
+            write_atomic(path, data)
+        return path
+
+    def clear(self):
+        """메모리 캐시 비우기 (디스크 파일은 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """캐시 히트/미스 통계"""
+        with self._lock:
+            return {
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+            }
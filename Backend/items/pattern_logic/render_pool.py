@@ -0,0 +1,224 @@
+"""
+프로세스 풀 렌더 서비스
+합성 / 인코딩(NumPy, Pillow)을 요청 스레드가 아닌 별도 워커 프로세스에서 실행해서
+요청 처리와 GIL을 다투지 않고 여러 코어를 쓰도록 한다.
+
+- 워커는 시작할 때 패턴 타일을 한 번만 로드 (pattern_set.bin이 있으면 memmap이라 즉시)
+- 결과 바이트는 작업마다 배정된 공유 메모리 슬롯으로 돌려받음 (슬롯보다 크면 pickle로 전달)
+- 슬롯 수가 곧 대기 + 실행 중 작업의 상한이라, 가득 차면 기다리지 않고 RenderPoolBusy
+"""
+
+import concurrent.futures
+import multiprocessing
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+try:
+    from .barcode_pattern import BarcodePatternGenerator
+except ImportError:  # 스크립트로 직접 실행하는 경우
+    from barcode_pattern import BarcodePatternGenerator
+
+
+class RenderPoolBusy(Exception):
+    """대기열이 가득 찼거나 시간 안에 결과를 받지 못함 (HTTP 503으로 응답)"""
+
+
+# 워커 프로세스 상태 (_init_worker 에서 설정)
+_worker_generator = None
+_worker_shm = None
+
+
+def _init_worker(pattern_dir, output_dir, encoder_profile, shm_name):
+    """워커 초기화: 생성기(타일 로드)와 결과용 공유 메모리 연결"""
+    global _worker_generator, _worker_shm
+    _worker_generator = BarcodePatternGenerator(
+        pattern_dir=pattern_dir,
+        output_dir=output_dir,
+        cache_max_bytes=0,  # 캐시는 부모 프로세스의 렌더 캐시 하나만 사용
+        disk_cache=False,
+        encoder_profile=encoder_profile,
+    )
+    # spawn 워커는 부모의 resource_tracker를 공유하므로 따로 unregister 하지 않음 (해제는 부모 shutdown)
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+
+
+def _render_job(slot, slot_bytes, barcode, bottom_color_hex, profile, size):
+    """
+    워커에서 패턴 하나를 렌더링하고 결과를 슬롯에 기록
+
+    Returns:
+        tuple: (결과 길이, 슬롯에 못 넣은 경우의 bytes 또는 None)
+    """
+    generator = _worker_generator
+    generator.library.reload_if_changed()
+    data = generator.render_pattern(barcode, bottom_color_hex, profile, size)
+    if len(data) > slot_bytes:
+        return len(data), data
+    start = slot * slot_bytes
+    _worker_shm.buf[start:start + len(data)] = data
+    return len(data), None
+
+
+class RenderPool:
+    """
+    렌더 워커 프로세스 풀
+
+        pool = RenderPool(pattern_dir, processes=4, max_pending=32)
+        data = pool.render("1234567890121", "#aabbcc", timeout=10)
+    """
+
+    def __init__(self, pattern_dir, output_dir, processes=2, max_pending=32,
+                 slot_bytes=4 * 1024 * 1024, encoder_profile=None, start_method="spawn"):
+        """
+        Args:
+            pattern_dir: 패턴 이미지 디렉토리
+            output_dir: 워커 생성기의 출력 디렉토리 (워커는 파일을 쓰지 않음)
+            processes: 워커 프로세스 수
+            max_pending: 대기 + 실행 중 작업 최대 수 (= 공유 메모리 슬롯 수)
+            slot_bytes: 슬롯 하나의 크기 (결과가 더 크면 pickle로 전달)
+            encoder_profile: 워커 생성기의 기본 인코더 프로필
+            start_method: 워커 시작 방식 (Django 스레드가 도는 프로세스라 fork 대신 spawn 기본)
+        """
+        self.pattern_dir = pattern_dir
+        self.output_dir = output_dir
+        self.processes = processes
+        self.max_pending = max_pending
+        self.slot_bytes = slot_bytes
+        self.encoder_profile = encoder_profile
+        self._context = multiprocessing.get_context(start_method)
+
+        self._shm = shared_memory.SharedMemory(create=True, size=max_pending * slot_bytes)
+        self._free = list(range(max_pending))
+        self._slots = threading.Condition()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self):
+        executor = self._executor
+        if executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        mp_context=self._context,
+                        initializer=_init_worker,
+                        initargs=(self.pattern_dir, self.output_dir, self.encoder_profile, self._shm.name),
+                    )
+                executor = self._executor
+        return executor
+
+    def _reset_executor(self, broken):
+        """워커가 비정상 종료되어 풀이 깨졌으면 다음 작업 때 새로 시작"""
+        with self._executor_lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire_slot(self, wait, timeout):
+        with self._slots:
+            if not self._free and wait:
+                self._slots.wait_for(lambda: self._free, timeout)
+            if not self._free:
+                self.rejected += 1
+                raise RenderPoolBusy("렌더링 대기열이 가득 찼습니다.")
+            return self._free.pop()
+
+    def _release_slot(self, slot):
+        with self._slots:
+            self._free.append(slot)
+            self._slots.notify()
+
+    def submit(self, barcode, bottom_color_hex=None, profile=None, size=None, wait=False, timeout=None):
+        """
+        렌더링 작업 제출
+
+        Args:
+            wait: 슬롯이 없을 때 기다릴지 여부 (False면 바로 RenderPoolBusy, 백그라운드 작업은 True)
+            timeout: wait=True일 때 슬롯을 기다릴 최대 시간 (초)
+
+        Returns:
+            concurrent.futures.Future: 결과 bytes (잘못된 입력이면 ValueError)
+
+        Raises:
+            RenderPoolBusy: 빈 슬롯 없음
+        """
+        slot = self._acquire_slot(wait, timeout)
+        executor = self._get_executor()
+        try:
+            future = executor.submit(
+                _render_job, slot, self.slot_bytes, barcode, bottom_color_hex, profile, size,
+            )
+        except BrokenProcessPool:
+            self._release_slot(slot)
+            self._reset_executor(executor)
+            raise RenderPoolBusy("렌더 워커를 다시 시작하는 중입니다.")
+        except BaseException:
+            self._release_slot(slot)
+            raise
+
+        result = concurrent.futures.Future()
+
+        def _done(f):
+            try:
+                length, data = f.result()
+                if data is None:
+                    start = slot * self.slot_bytes
+                    data = bytes(self._shm.buf[start:start + length])
+            except BaseException as e:
+                if isinstance(e, BrokenProcessPool):
+                    self._reset_executor(executor)
+                self._release_slot(slot)
+                result.set_exception(e)
+                return
+            self._release_slot(slot)
+            result.set_result(data)
+
+        future.add_done_callback(_done)
+        return result
+
+    def render(self, barcode, bottom_color_hex=None, profile=None, size=None, wait=False, timeout=None):
+        """
+        submit() 후 결과를 기다림
+
+        Args:
+            timeout: 슬롯을 기다릴 최대 시간(wait=True)과 결과를 기다릴 최대 시간 (초, None이면 제한 없음)
+
+        Returns:
+            bytes: 인코딩된 이미지
+
+        Raises:
+            RenderPoolBusy: 빈 슬롯이 없거나 시간 안에 끝나지 않음
+            ValueError: 잘못된 바코드 / 색상 / 프로필 / 크기
+        """
+        future = self.submit(barcode, bottom_color_hex, profile, size, wait=wait, timeout=timeout)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            raise RenderPoolBusy("렌더링 시간이 초과되었습니다.")
+        except BrokenProcessPool:
+            raise RenderPoolBusy("렌더 워커가 비정상 종료되었습니다.")
+
+    def stats(self):
+        """풀 상태 (워커 수, 슬롯 수, 사용 중인 슬롯, 거절한 작업 수)"""
+        with self._slots:
+            in_flight = self.max_pending - len(self._free)
+        return {
+            "processes": self.processes,
+            "max_pending": self.max_pending,
+            "in_flight": in_flight,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        """워커 종료 후 공유 메모리 해제"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
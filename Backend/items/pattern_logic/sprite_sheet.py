@@ -0,0 +1,174 @@
+"""
+스프라이트 시트 (여러 패턴을 격자로 배치한 한 장의 이미지)
+보관함 화면 / 인쇄용으로 패턴 N개를 한 번에 내려줄 때 사용한다.
+
+시트 전체를 메모리에 올리지 않고 한 줄(셀 높이)짜리 버퍼 하나에 셀을 합성한 뒤
+zlib 스트림으로 PNG IDAT를 이어 붙이므로, 시트가 커져도 메모리는 한 줄 분량만 쓴다.
+"""
+
+import math
+import struct
+import zlib
+
+import numpy as np
+
+try:
+    from .barcodes import ERROR_LENGTH, ERROR_REASONS, parse_barcodes
+    from .compositor import composite_quadrants
+except ImportError:  # 스크립트로 직접 실행하는 경우
+    from barcodes import ERROR_LENGTH, ERROR_REASONS, parse_barcodes
+    from compositor import composite_quadrants
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# 빈 셀 배경색
+BACKGROUND = 255
+
+
+def _png_chunk(tag, data):
+    """PNG 청크 (길이 + 태그 + 데이터 + CRC)"""
+    return (
+        struct.pack(">I", len(data)) + tag + data
+        + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    )
+
+
+class SpriteSheet:
+    """
+    패턴 스프라이트 시트
+
+        sheet = generator.sprite_sheet([(product.id, barcode, hex), ...], cell_size=256)
+        sheet.index()              # {key: {"x", "y", "width", "height"}} 등 좌표표
+        for chunk in sheet.iter_png(): ...
+
+    잘못된 바코드 / 색상 항목은 셀을 차지하지 않고 index()["errors"]에 사유가 기록된다.
+    """
+
+    def __init__(self, generator, items, columns=None, cell_size=256):
+        """
+        Args:
+            generator: 타일 atlas와 색상표를 쓸 BarcodePatternGenerator
+            items: (key, barcode, 하단 색 hex 또는 None) 의 iterable (key는 제품 ID 등)
+            columns: 한 줄의 셀 수 (None이면 정사각형에 가깝게)
+            cell_size: 셀(패턴 하나) 한 변의 픽셀 수 (짝수, 원본 패턴 크기 이하)
+
+        Raises:
+            ValueError: 셀 크기가 잘못됐거나 그릴 수 있는 항목이 없음
+        """
+        if cell_size < 2 or cell_size % 2:
+            raise ValueError(f"셀 크기는 2 이상의 짝수여야 합니다: {cell_size}")
+
+        items = list(items)
+        parsed, codes = parse_barcodes([barcode or "" for _, barcode, _ in items])
+
+        self.entries = []  # [(key, 타일 인덱스 4개, 사분면 색 4개)]
+        self.errors = {}
+        for (key, barcode, bottom_hex), record, code in zip(items, parsed, codes.tolist()):
+            if code:
+                reason = ERROR_REASONS[code]
+                if code == ERROR_LENGTH:
+                    reason += f" 입력된 길이: {len(barcode or '')}"
+                self.errors[key] = reason
+                continue
+
+            top_rgb = generator.colors[int(record["color"])]
+            try:
+                bottom_rgb = generator.hex_to_rgb(bottom_hex) if bottom_hex else top_rgb
+            except ValueError as e:
+                self.errors[key] = str(e)
+                continue
+
+            tiles = [
+                (int(row), int(col), (int(rotation) // 90) % 4)
+                for row, col, rotation in zip(record["row"], record["col"], record["rotation"])
+            ]
+            self.entries.append((key, tiles, [top_rgb, top_rgb, bottom_rgb, bottom_rgb]))
+
+        if not self.entries:
+            raise ValueError("시트에 그릴 패턴이 없습니다.")
+
+        self.cell_size = cell_size
+        self.columns = max(1, min(columns or math.ceil(math.sqrt(len(self.entries))), len(self.entries)))
+        self.rows = math.ceil(len(self.entries) / self.columns)
+        self.version = generator.library.version
+        # 시트 하나는 같은 atlas로 끝까지 그림 (도중에 패턴 세트가 바뀌어도 섞이지 않음)
+        self.atlas = generator.library.scaled_atlas(cell_size // 2)
+
+    @property
+    def width(self):
+        return self.columns * self.cell_size
+
+    @property
+    def height(self):
+        return self.rows * self.cell_size
+
+    def position(self, i):
+        """i번째 항목 셀의 왼쪽 위 (x, y)"""
+        row, col = divmod(i, self.columns)
+        return col * self.cell_size, row * self.cell_size
+
+    def index(self):
+        """
+        시트 좌표표 (JSON 응답용)
+
+        Returns:
+            dict: 시트 크기 / 셀 크기 / 격자 / 패턴 세트 버전,
+                  items {key: {"x", "y", "width", "height"}}, errors {key: 사유}
+        """
+        items = {}
+        for i, (key, _, _) in enumerate(self.entries):
+            x, y = self.position(i)
+            items[key] = {"x": x, "y": y, "width": self.cell_size, "height": self.cell_size}
+        return {
+            "width": self.width,
+            "height": self.height,
+            "cell_size": self.cell_size,
+            "columns": self.columns,
+            "rows": self.rows,
+            "pattern_set_version": self.version,
+            "items": items,
+            "errors": self.errors,
+        }
+
+    def iter_png(self, compress_level=6):
+        """
+        시트를 PNG로 인코딩하며 바이트 조각을 순서대로 돌려줌 (StreamingHttpResponse / 파일 쓰기용)
+
+        Args:
+            compress_level: zlib 압축 레벨 (0-9)
+
+        Yields:
+            bytes: PNG 조각 (이어 붙이면 PNG 파일 하나)
+        """
+        cell = self.cell_size
+        width = self.width
+        yield PNG_SIGNATURE + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, self.height, 8, 2, 0, 0, 0))
+
+        # 한 줄 버퍼: 스캔라인마다 필터 바이트(0 = None) + RGB 픽셀
+        strip = np.empty((cell, 1 + width * 3), dtype=np.uint8)
+        strip[:, 0] = 0
+        pixels = strip[:, 1:].reshape(cell, width, 3)
+
+        atlas = self.atlas
+        compressor = zlib.compressobj(compress_level)
+        for row in range(self.rows):
+            start = row * self.columns
+            entries = self.entries[start:start + self.columns]
+            for col, (_, tiles, colors) in enumerate(entries):
+                composite_quadrants(
+                    [atlas[r, c, k] for r, c, k in tiles], colors,
+                    out=pixels[:, col * cell:(col + 1) * cell],
+                )
+            if len(entries) < self.columns:
+                pixels[:, len(entries) * cell:] = BACKGROUND
+
+            data = compressor.compress(strip)
+            if data:
+                yield _png_chunk(b"IDAT", data)
+
+        yield _png_chunk(b"IDAT", compressor.flush()) + _png_chunk(b"IEND", b"")
+
+    def save(self, fileobj, compress_level=6):
+        """시트를 PNG로 파일 객체에 기록"""
+        for chunk in self.iter_png(compress_level):
+            fileobj.write(chunk)
@@ -0,0 +1,74 @@
+"""
+SVG 패턴 출력
+흑백 타일을 한 번만 사각형 경로로 변환(trace)해 두고, 바코드마다 경로 4개에 색 / 회전만 붙여서
+작은 SVG를 만든다. 패턴 타일은 축에 정렬된 도형이라 같은 가로 구간이 이어지는 행을 합치면
+타일 하나가 수십 개의 사각형으로 정확히 표현된다.
+"""
+
+import numpy as np
+
+# 합성(compositor)과 같은 기준: 128 미만이면 색을 칠하는 부분
+THRESHOLD = 128
+
+
+def trace_tile(tile):
+    """
+    흑백 타일의 색칠 부분을 SVG path 데이터로 변환
+
+    행마다 칠할 가로 구간을 구하고, 구간이 같은 연속 행은 하나의 사각형으로 합친다.
+
+    Args:
+        tile: (H, W) uint8 배열
+
+    Returns:
+        str: "M x y h w v h h -w z ..." 형식의 path 데이터 (타일 좌표계, 칠할 부분이 없으면 "")
+    """
+    mask = np.asarray(tile) < THRESHOLD
+    height = mask.shape[0]
+
+    # 바로 위 행과 달라지는 행에서만 새 구간 묶음이 시작됨
+    starts = np.flatnonzero(np.r_[True, (mask[1:] != mask[:-1]).any(axis=1)])
+    ends = np.r_[starts[1:], height]
+
+    parts = []
+    for top, bottom in zip(starts.tolist(), ends.tolist()):
+        edges = np.flatnonzero(np.diff(mask[top].astype(np.int8), prepend=0, append=0)).tolist()
+        h = bottom - top
+        for x0, x1 in zip(edges[0::2], edges[1::2]):
+            parts.append(f"M{x0} {top}h{x1 - x0}v{h}h{x0 - x1}z")
+    return "".join(parts)
+
+
+def render_svg(paths, rotations, quadrant_colors, tile_size, size=None):
+    """
+    사분면 4개의 경로로 SVG 문서 생성
+
+    Args:
+        paths: trace_tile 결과 4개 (①②③④ 순서, 0° 기준)
+        rotations: 사분면별 시계 방향 회전 횟수 (0-3)
+        quadrant_colors: 사분면별 (r,g,b)
+        tile_size: 경로 좌표계의 타일 한 변 길이
+        size: 출력 width/height (None이면 tile_size x 2)
+
+    Returns:
+        bytes: UTF-8 SVG
+    """
+    full = tile_size * 2
+    size = size or full
+    half = tile_size / 2
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {full} {full}" shape-rendering="crispEdges">',
+        f'<rect width="{full}" height="{full}" fill="#ffffff"/>',
+    ]
+    for q, (d, k, rgb) in enumerate(zip(paths, rotations, quadrant_colors)):
+        if not d:
+            continue
+        y, x = divmod(q, 2)
+        transform = f"translate({x * tile_size} {y * tile_size})"
+        if k % 4:
+            transform += f" rotate({90 * (k % 4)} {half:g} {half:g})"
+        fill = "#{:02x}{:02x}{:02x}".format(*rgb)
+        out.append(f'<path transform="{transform}" fill="{fill}" d="{d}"/>')
+    out.append("</svg>")
+    return "".join(out).encode("utf-8")
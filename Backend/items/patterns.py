@@ -0,0 +1,250 @@
+"""
+Django 쪽 패턴 생성 서비스
+뷰, 백그라운드 작업, 관리 명령이 같은 생성기와 저장 로직을 공유한다.
+"""
+
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+
+from items.pattern_logic.barcode_pattern import BarcodePatternGenerator
+from items.pattern_logic.encoders import get_profile
+from items.pattern_logic.metrics import timed
+from items.pattern_logic.render_cache import normalize_hex
+from items.pattern_logic.render_pool import RenderPool
+
+from .models import PatternAsset
+
+
+_generator = None
+_generator_lock = threading.Lock()
+_render_executor = None
+_render_pool = None
+
+
+def get_pattern_generator():
+    """
+    워커 프로세스당 하나의 BarcodePatternGenerator를 재사용
+    (패턴 타일은 공유 PatternLibrary에서 한 번만 로드됨)
+    """
+    global _generator
+    generator = _generator
+    if generator is None:
+        with _generator_lock:
+            if _generator is None:
+                # CLI/배치용 출력 폴더 (뷰는 스토리지에 직접 저장하므로 디스크 캐시는 끔)
+                output_dir = os.path.join(
+                    settings.BASE_DIR,
+                    "pattern_outputs",
+                )
+
+                _generator = BarcodePatternGenerator(
+                    pattern_dir=settings.PATTERN_DIR,
+                    output_dir=output_dir,
+                    cache_max_bytes=settings.PATTERN_RENDER_CACHE_MAX_BYTES,
+                    disk_cache=False,
+                    encoder_profile=settings.PATTERN_ENCODER_PROFILE,
+                )
+            generator = _generator
+
+    # mnt_project 폴더가 바뀌었으면 타일을 다시 로드 (stat 한 번)
+    generator.library.reload_if_changed()
+    return generator
+
+
+def reset_pattern_generator():
+    """다음 get_pattern_generator() 호출 때 현재 설정으로 생성기를 새로 만들도록 초기화"""
+    global _generator
+    with _generator_lock:
+        _generator = None
+
+
+def get_render_executor():
+    """
+    async 뷰에서 CPU 작업(합성/인코딩)을 넘기는 프로세스당 스레드 풀
+    이벤트 루프와 ORM용 sync 스레드를 막지 않도록 렌더링만 여기서 실행한다.
+    """
+    global _render_executor
+    if _render_executor is None:
+        with _generator_lock:
+            if _render_executor is None:
+                _render_executor = ThreadPoolExecutor(
+                    max_workers=settings.PATTERN_RENDER_THREADS,
+                    thread_name_prefix='pattern-render',
+                )
+    return _render_executor
+
+
+def get_render_pool():
+    """
+    렌더 워커 프로세스 풀 (프로세스당 하나, 첫 호출 때 워커 시작)
+
+    Returns:
+        RenderPool | None: PATTERN_RENDER_PROCESSES가 0이면 None (요청 스레드에서 직접 렌더링)
+    """
+    global _render_pool
+    if not settings.PATTERN_RENDER_PROCESSES:
+        return None
+    if _render_pool is None:
+        generator = get_pattern_generator()
+        with _generator_lock:
+            if _render_pool is None:
+                pool = RenderPool(
+                    pattern_dir=generator.pattern_dir,
+                    output_dir=generator.output_dir,
+                    processes=settings.PATTERN_RENDER_PROCESSES,
+                    max_pending=settings.PATTERN_RENDER_QUEUE_SIZE,
+                    slot_bytes=settings.PATTERN_RENDER_RESULT_BYTES,
+                    encoder_profile=generator.encoder_profile,
+                )
+                # 서버 종료 시 워커 정리 + 공유 메모리 해제
+                atexit.register(pool.shutdown)
+                _render_pool = pool
+    return _render_pool
+
+
+def render_pattern_bytes(barcode, bottom_color_hex=None, profile=None, size=None, wait=False, timeout=None):
+    """
+    인코딩된 패턴 이미지 바이트 (렌더 캐시 → 워커 프로세스 풀, 풀이 없으면 현재 스레드에서 렌더링)
+
+    Args:
+        wait: 풀 대기열이 가득 찼을 때 자리가 날 때까지 기다릴지 여부
+              (요청 처리는 False로 바로 503, 백그라운드 작업은 True)
+        timeout: 풀 자리 / 결과를 기다리는 최대 시간 (초, None이면 PATTERN_RENDER_TIMEOUT)
+
+    Raises:
+        ValueError: 잘못된 바코드 / 색상 / 프로필 / 크기
+        RenderPoolBusy: 대기열이 가득 찼거나 PATTERN_RENDER_TIMEOUT 안에 끝나지 않음
+    """
+    generator = get_pattern_generator()
+    pool = get_render_pool()
+    if pool is None:
+        return generator.render_pattern(barcode, bottom_color_hex, profile, size)
+
+    # 잘못된 입력은 대기열 자리를 쓰기 전에 걸러냄
+    profile = profile or generator.encoder_profile
+    get_profile(profile)
+    generator.parse_barcode(barcode)
+    if bottom_color_hex is not None:
+        generator.hex_to_rgb(bottom_color_hex)
+    generator.output_tile_size(size)
+
+    name = generator.render_name(barcode, bottom_color_hex, profile, size)
+    data = generator.render_cache.get(name)
+    if data is None:
+        with timed("render_pool"):
+            data = pool.render(
+                barcode, bottom_color_hex, profile, size,
+                wait=wait, timeout=settings.PATTERN_RENDER_TIMEOUT if timeout is None else timeout,
+            )
+        generator.render_cache.put(name, data)
+    return data
+
+
+def pattern_asset_key(barcode, bottom_color_hex=None, encoder=None):
+    """
+    PatternAsset 조회 키 (패턴 세트 버전은 현재 로드된 타일 기준)
+
+    Returns:
+        dict: barcode / bottom_color / pattern_set_version / encoder
+    """
+    generator = get_pattern_generator()
+    return {
+        "barcode": barcode,
+        "bottom_color": normalize_hex(bottom_color_hex),
+        "pattern_set_version": generator.library.version,
+        "encoder": encoder or generator.encoder_profile,
+    }
+
+
+def render_asset_bytes(key, wait=False, timeout=None):
+    """키에 해당하는 패턴 이미지 바이트 (DB·스토리지 접근 없음, 렌더 캐시 사용)"""
+    return render_pattern_bytes(
+        barcode=key["barcode"],
+        bottom_color_hex=key["bottom_color"] or None,
+        profile=key["encoder"],
+        wait=wait,
+        timeout=timeout,
+    )
+
+
+def find_pattern_asset(key):
+    """
+    이미 저장된 PatternAsset 조회 (행은 있어도 파일이 없으면 None)
+    """
+    asset = PatternAsset.objects.filter(**key).first()
+    if asset is not None and asset.image and asset.image.storage.exists(asset.image.name):
+        return asset
+    return None
+
+
+def store_pattern_asset(key, render):
+    """
+    패턴 파일을 스토리지에 저장하고 PatternAsset 행을 만듦
+
+    같은 이름의 파일이 이미 있으면 render를 호출하지 않고 그 파일을 가리킨다.
+    다른 요청이 같은 조합을 먼저 저장했으면(unique 충돌) 그 행을 돌려준다.
+
+    Args:
+        key: pattern_asset_key() 결과
+        render: 이미지 bytes를 돌려주는 함수 (파일이 없을 때만 호출)
+
+    Returns:
+        PatternAsset
+    """
+    generator = get_pattern_generator()
+    bottom_color_hex = key["bottom_color"] or None
+
+    asset = PatternAsset.objects.filter(**key).first() or PatternAsset(**key)
+    filename = generator.render_name(key["barcode"], bottom_color_hex, key["encoder"])
+    field = asset.image
+    storage_name = field.field.generate_filename(asset, filename)
+
+    if not field.storage.exists(storage_name):
+        # 메모리에서 만든 이미지 바이트를 스토리지에 바로 저장 (임시 파일 없음)
+        image_bytes = render()
+        with timed("storage_save"):
+            storage_name = field.storage.save(storage_name, ContentFile(image_bytes))
+
+    pattern_info = generator.describe_pattern(key["barcode"], bottom_color_hex)
+    pattern_info["encoder"] = key["encoder"]
+
+    asset.image.name = storage_name
+    asset.pattern_info = pattern_info
+    try:
+        with timed("db_save"), transaction.atomic():
+            asset.save()
+    except IntegrityError:
+        asset = PatternAsset.objects.get(**key)
+    return asset
+
+
+def get_or_create_pattern_asset(barcode, bottom_color_hex=None, encoder=None, wait=False, timeout=None):
+    """
+    (바코드, 하단 색, 패턴 세트 버전, 인코더) 조합의 PatternAsset
+    이미 있으면 그대로, 없으면 렌더링해서 저장
+
+    Args:
+        wait: 렌더 풀이 가득 찼을 때 기다릴지 여부 (render_pattern_bytes 참고)
+        timeout: 렌더 풀을 기다리는 최대 시간 (render_pattern_bytes 참고)
+
+    Raises:
+        ValueError: 잘못된 바코드 / 색상 / 인코더 프로필
+        RenderPoolBusy: 렌더 풀이 가득 찼거나 시간 안에 끝나지 않음
+    """
+    key = pattern_asset_key(barcode, bottom_color_hex, encoder)
+    return find_pattern_asset(key) or store_pattern_asset(
+        key, lambda: render_asset_bytes(key, wait, timeout),
+    )
+
+
+def attach_pattern_asset(product, asset):
+    """Product가 패턴 자산을 가리키도록 설정 (DB 저장은 호출하는 쪽에서 수행)"""
+    product.pattern_asset = asset
+    product.pattern_image.name = asset.image.name
+    product.pattern_info = asset.pattern_info
@@ -0,0 +1,74 @@
+"""
+이미지 파생본(썸네일 / 중간 크기) 생성
+목록 화면이 원본 사진 / 원본 크기 패턴을 받지 않도록 작은 사본을 처음 요청될 때 만들어 둔다.
+
+파생본 이름은 원본 이름과 크기로 정해지므로(renditions/<이름>_<크기>/<원본 경로>)
+한 번 만든 파일은 스토리지에서 그대로 재사용된다.
+"""
+
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from .imaging import open_downscaled
+
+# 파생본을 제공하는 Product 이미지 필드
+RENDITION_FIELDS = ('image', 'pattern_image')
+
+# 원본 확장자 → (Pillow 포맷, 저장 옵션)
+#   사진(JPEG)은 JPEG로, 패턴(PNG/WebP)은 원래 포맷으로 다시 인코딩
+_FORMATS = {
+    '.jpg': ('JPEG', {'quality': 82, 'optimize': True}),
+    '.jpeg': ('JPEG', {'quality': 82, 'optimize': True}),
+    '.webp': ('WEBP', {'quality': 85, 'method': 4}),
+}
+_DEFAULT_FORMAT = ('PNG', {'optimize': True})
+
+
+def rendition_name(source_name, rendition):
+    """
+    원본 스토리지 이름에 대한 파생본 이름
+
+    Args:
+        source_name: 원본 파일 이름 (예: 'product_images/cup.jpg')
+        rendition: settings.IMAGE_RENDITIONS 의 이름 (예: 'thumb')
+
+    Raises:
+        KeyError: 알 수 없는 파생본 이름
+    """
+    size = settings.IMAGE_RENDITIONS[rendition]
+    return f"renditions/{rendition}_{size}/{source_name}"
+
+
+def get_or_create_rendition(storage, source_name, rendition):
+    """
+    파생본을 스토리지에서 찾고, 없으면 원본을 축소해서 저장
+
+    Returns:
+        str: 파생본 스토리지 이름 (SVG 패턴은 크기와 무관하므로 원본 이름)
+
+    Raises:
+        KeyError: 알 수 없는 파생본 이름
+        FileNotFoundError: 원본 파일 없음
+    """
+    name = rendition_name(source_name, rendition)
+    if os.path.splitext(source_name)[1].lower() == '.svg':
+        return source_name
+    if storage.exists(name):
+        return name
+
+    size = settings.IMAGE_RENDITIONS[rendition]
+    with storage.open(source_name, 'rb') as source:
+        image = open_downscaled(source, size)
+
+    fmt, options = _FORMATS.get(os.path.splitext(source_name)[1].lower(), _DEFAULT_FORMAT)
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **options)
+
+    saved = storage.save(name, ContentFile(buffer.getvalue()))
+    if saved != name:
+        # 다른 요청이 같은 파생본을 먼저 만든 경우: 중복 사본은 지우고 먼저 만든 것을 사용
+        storage.delete(saved)
+    return name
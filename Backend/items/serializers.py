@@ -1,7 +1,57 @@
+from django.conf import settings
+from django.urls import reverse
 from rest_framework import serializers
+from .imaging import normalize_upload
 from .models import Product
+from .renditions import RENDITION_FIELDS
+
+
+def requested_fields(request):
+    """`?fields=nickname,pattern_image` 형식의 필드 목록 (없으면 None)"""
+    if request is None or request.method != 'GET':
+        return None
+    value = request.query_params.get('fields')
+    if not value:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
+
 
 class ProductSerializer(serializers.ModelSerializer):
+    # 이미지별 파생본 URL: {"image": {"thumb": url, "medium": url}, "pattern_image": {...}}
+    renditions = serializers.SerializerMethodField()
+
     class Meta:
         model = Product
         fields = '__all__'
+
+    def validate_image(self, value):
+        # 검증 / 축소 / 메타데이터 제거 후 저장
+        if not value:
+            return value
+        try:
+            return normalize_upload(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    def get_renditions(self, obj):
+        request = self.context.get('request')
+        result = {}
+        for field in RENDITION_FIELDS:
+            if not getattr(obj, field):
+                result[field] = None
+                continue
+            urls = {}
+            for rendition in settings.IMAGE_RENDITIONS:
+                url = reverse('product_rendition', args=[obj.pk, field, rendition])
+                urls[rendition] = request.build_absolute_uri(url) if request else url
+            result[field] = urls
+        return result
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # 목록 조회 시 요청한 필드만 응답 (예: 아카이브 카드에 필요한 닉네임 / 이미지 URL만)
+        fields = requested_fields(self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
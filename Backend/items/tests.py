@@ -1,3 +1,1223 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import ConnectionHandler
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from .imaging import extract_colors, extract_product_colors, kmeans_palette
+from .jobs import job_heartbeat, process_pending_jobs, run_pattern_job
+from .middleware import server_timing_header
+from .models import PatternAsset, PatternJob, Product
+from .nicknames import NicknameIndex, get_nickname_index
+from .patterns import get_or_create_pattern_asset, get_pattern_generator, render_pattern_bytes
+from items.pattern_logic import compositor, metrics, pattern_library
+from items.pattern_logic.barcode_pattern import BarcodePatternGenerator
+from items.pattern_logic.barcodes import OK, parse_barcodes, to_patterns_info
+from items.pattern_logic.encoders import ENCODER_PROFILES, RASTER_PROFILES, encode_image, get_profile
+from items.pattern_logic.log_handlers import process_log_filename, prune_process_logs
+from items.pattern_logic.pattern_library import scan_pattern_files
+from items.pattern_logic.render_pool import RenderPool, RenderPoolBusy
+from items.pattern_logic.render_cache import RenderCache, render_key
+
+
+def make_photo(size=(320, 240), color=(200, 30, 40)):
+    """테스트용 JPEG 업로드 파일"""
+    buffer = io.BytesIO()
+    Image.new('RGB', size, color).save(buffer, 'JPEG')
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+def product_data(nickname, barcode='1204567890125', **extra):
+    """create-with-pattern / 목록 등록 요청 본문"""
+    data = {
+        'item_name': '컵',
+        'nickname': nickname,
+        'met_date': '2020-01-01',
+        'farewell_date': '2024-01-01',
+        'barcode': barcode,
+        'dominant_color': '#112233',
+    }
+    data.update(extra)
+    return data
+
+
+class MediaRootTestCase(TestCase):
+    """업로드 / 패턴 파일을 임시 MEDIA_ROOT에 저장하고, 닉네임 인덱스를 테스트 DB 기준으로 다시 읽음"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls._media_root = tempfile.mkdtemp(prefix='items_test_media_')
+        cls._media_override = override_settings(MEDIA_ROOT=cls._media_root)
+        cls._media_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._media_override.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        # 인덱스는 프로세스에 하나라 이전 테스트(롤백된 데이터)의 닉네임이 남아 있지 않게 함
+        get_nickname_index().rebuild()
+
+
+class ProcessLogPruneTests(SimpleTestCase):
+    """프로세스별 로그 파일이 무한히 쌓이지 않는지"""
+
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp(prefix='items_test_logs_')
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
+        self.filename = os.path.join(self.log_dir, 'pattern_generator.log')
+
+    def touch(self, name, age_days=0):
+        path = os.path.join(self.log_dir, name)
+        with open(path, 'w'):
+            pass
+        mtime = time.time() - age_days * 86400
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def test_removes_old_and_excess_process_files(self):
+        self.touch('pattern_generator.100.log', age_days=30)
+        self.touch('pattern_generator.100.log.1', age_days=31)
+        for pid in range(200, 205):
+            self.touch(f'pattern_generator.{pid}.log', age_days=(pid - 200) / 10)
+        current = self.touch(os.path.basename(process_log_filename(self.filename)), age_days=60)
+        self.touch('pattern_generator.log', age_days=60)  # 예전 공용 파일은 건드리지 않음
+        self.touch('other.100.log', age_days=60)
+
+        removed = prune_process_logs(self.filename, retention_days=7, max_files=4)
+
+        self.assertEqual(removed, 4)  # 오래된 pid 100 (백업 포함 2개) + 개수 초과 2개
+        self.assertEqual(sorted(os.listdir(self.log_dir)), sorted([
+            'other.100.log',
+            'pattern_generator.log',
+            'pattern_generator.200.log',
+            'pattern_generator.201.log',
+            'pattern_generator.202.log',
+            os.path.basename(current),
+        ]))
+
+    def test_missing_directory(self):
+        self.assertEqual(prune_process_logs(os.path.join(self.log_dir, 'none', 'x.log')), 0)
+
+
+class PatternSetVersionTests(SimpleTestCase):
+    """크기가 다른 타일의 축소 / 확대가 경고와 패턴 세트 버전에 반영되는지"""
+
+    def setUp(self):
+        self.pattern_dir = tempfile.mkdtemp(prefix='items_test_tiles_')
+        self.addCleanup(shutil.rmtree, self.pattern_dir, ignore_errors=True)
+        for name, size in [('00.png', 8), ('01.png', 8), ('02.png', 16)]:
+            Image.new('L', (size, size), 0).save(f"{self.pattern_dir}/{name}")
+
+    def test_resized_tiles_warn_and_change_version(self):
+        with self.assertLogs(pattern_library.logger, 'WARNING') as logs:
+            patterns, version = pattern_library.load_tile_images(self.pattern_dir)
+            atlas, _ = pattern_library.build_atlas(patterns)
+        self.assertEqual(atlas.shape[-2:], (8, 8))
+        self.assertTrue(any('(0,2) 16px' in line for line in logs.output))
+
+        with mock.patch.object(pattern_library, 'ATLAS_REVISION', pattern_library.ATLAS_REVISION + 1):
+            _, next_version = pattern_library.load_tile_images(self.pattern_dir)
+        self.assertNotEqual(version, next_version)
+
+
+class PatternSetReloadTests(SimpleTestCase):
+    """패턴 세트 파일이 있어도 PNG 타일 수정을 감지하는지"""
+
+    def setUp(self):
+        self.pattern_dir = tempfile.mkdtemp(prefix='items_test_tiles_')
+        self.addCleanup(shutil.rmtree, self.pattern_dir, ignore_errors=True)
+        for name in ('00.png', '01.png'):
+            Image.new('L', (8, 8), 0).save(f"{self.pattern_dir}/{name}")
+        with self.assertLogs(pattern_library.logger, 'WARNING'):  # 없는 타일 경고
+            pattern_library.compile_pattern_set(self.pattern_dir)
+            self.library = pattern_library.PatternLibrary(self.pattern_dir)
+
+    def touch_future(self, path, seconds=10):
+        future = time.time() + seconds
+        os.utime(path, (future, future))
+
+    def test_edited_tile_falls_back_to_png(self):
+        self.assertEqual(self.library.source, self.library.pattern_set_path)
+        version = self.library.version
+
+        # 같은 파일을 제자리에서 고침 (디렉토리 mtime / 패턴 세트 파일은 그대로)
+        tile = f"{self.pattern_dir}/01.png"
+        Image.new('L', (8, 8), 255).save(tile)
+        self.touch_future(tile)
+        with mock.patch.object(pattern_library, 'TILE_SCAN_INTERVAL', 0), \
+                self.assertLogs(pattern_library.logger, 'WARNING') as logs:
+            self.assertTrue(self.library.reload_if_changed())
+        self.assertTrue(any('PNG 타일이 패턴 세트 파일보다 새로워' in line for line in logs.output))
+        self.assertEqual(self.library.source, self.pattern_dir)
+        self.assertNotEqual(self.library.version, version)
+        self.assertEqual(int(self.library.get_tile(0, 1, 0)[0, 0]), 255)
+        with mock.patch.object(pattern_library, 'TILE_SCAN_INTERVAL', 0):
+            self.assertFalse(self.library.reload_if_changed())
+
+        # 다시 컴파일하면 패턴 세트 파일로 돌아감
+        with self.assertLogs(pattern_library.logger, 'WARNING'):
+            pattern_library.compile_pattern_set(self.pattern_dir)
+        self.touch_future(self.library.pattern_set_path, 20)
+        self.assertTrue(self.library.reload_if_changed())
+        self.assertEqual(self.library.source, self.library.pattern_set_path)
+        self.assertEqual(int(self.library.get_tile(0, 1, 0)[0, 0]), 255)
+
+    def test_tile_scan_is_throttled(self):
+        tile = f"{self.pattern_dir}/01.png"
+        self.touch_future(tile)
+        # 확인 간격 안에서는 타일을 다시 stat 하지 않음
+        self.assertFalse(self.library.reload_if_changed())
+
+
+class CompositorBaselineTests(SimpleTestCase):
+    """NumPy 합성 결과가 타일별 apply_color + paste (기존 방식) 결과와 같은지"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.generator = get_pattern_generator()
+        cls.files = scan_pattern_files(cls.generator.pattern_dir)
+
+    def baseline(self, tiles, color_index, bottom_rgb=None):
+        """atlas 도입 전 방식: 회전한 타일마다 색을 칠해서 2x2로 붙임"""
+        generator = self.generator
+        size = tiles[0].size[0]
+        canvas = Image.new('RGB', (size * 2, size * 2), (255, 255, 255))
+        for q, tile in enumerate(tiles):
+            if q >= 2 and bottom_rgb is not None:
+                colored = generator.apply_color_rgb(tile, bottom_rgb)
+            else:
+                colored = generator.apply_color(tile, color_index)
+            canvas.paste(colored, ((q % 2) * size, (q // 2) * size))
+        return canvas
+
+    def file_tiles(self, patterns_info):
+        """원본 PNG 파일을 그대로 읽어서 회전한 타일"""
+        tiles = []
+        for row, col, rotation in patterns_info:
+            with Image.open(self.files[(row, col)]) as src:
+                tiles.append(self.generator.rotate_pattern(src.convert('L'), rotation))
+        return tiles
+
+    def atlas_tiles(self, patterns_info):
+        """atlas의 0° 타일을 PIL로 회전한 타일"""
+        library = self.generator.library
+        return [
+            self.generator.rotate_pattern(Image.fromarray(np.array(library.get_tile(row, col, 0))), rotation)
+            for row, col, rotation in patterns_info
+        ]
+
+    def assertSameImage(self, actual, expected):
+        self.assertEqual(actual.size, expected.size)
+        np.testing.assert_array_equal(np.asarray(actual.convert('RGB')), np.asarray(expected))
+
+    def test_matches_original_tiles(self):
+        # 3열(2048px) 타일을 쓰지 않는 바코드는 원본 PNG로 합성한 결과와 같음
+        for barcode, bottom_rgb in [
+            ('1204567890125', None),
+            ('0111522466719', (10, 200, 30)),
+        ]:
+            with self.subTest(barcode=barcode):
+                patterns_info, color_index = self.generator.parse_barcode(barcode)
+                self.assertTrue(all(col != 3 for _, col, _ in patterns_info))
+                expected = self.baseline(self.file_tiles(patterns_info), color_index, bottom_rgb)
+                self.assertSameImage(
+                    self.generator.compose_pattern(patterns_info, color_index, bottom_rgb), expected,
+                )
+                self.assertSameImage(
+                    self.generator.compose_pattern(patterns_info, color_index, bottom_rgb, palette=True),
+                    expected,
+                )
+
+    def test_matches_atlas_tiles_for_resized_column(self):
+        # 크기가 다른 타일(3열)은 원본과 다르지만 atlas 타일로 합성한 결과와는 같음
+        patterns_info, color_index = self.generator.parse_barcode('0331237438935')
+        self.assertTrue(any(col == 3 for _, col, _ in patterns_info))
+        expected = self.baseline(self.atlas_tiles(patterns_info), color_index)
+        self.assertSameImage(self.generator.compose_pattern(patterns_info, color_index), expected)
+
+
+class ParseBarcodesTests(SimpleTestCase):
+    """벡터화된 parse_barcodes가 parse_barcode와 같은 판정 / 결과를 내는지"""
+
+    CASES = [
+        '1234567890128',
+        '0000000000000',
+        '9999999999999',
+        '123456789012',        # 12자리
+        '12345678901234',      # 14자리
+        '12345678901a8',       # 숫자 아님
+        ' 123456789012',       # 공백
+        '1234567890128\x00',   # 끝의 NUL (고정 길이 문자열 변환에서 잘리면 13자리로 통과)
+        '123456\x00789012',    # 중간의 NUL
+        '１２３４５６７８９０１２８',  # 전각 숫자
+        '١٢٣٤٥٦٧٨٩٠١٢٨',       # 아라비아-인도 숫자
+        '',
+    ]
+
+    def test_agrees_with_parse_barcode(self):
+        generator = get_pattern_generator()
+        parsed, errors = parse_barcodes(self.CASES)
+        for barcode, record, error in zip(self.CASES, parsed, errors):
+            with self.subTest(barcode=barcode):
+                try:
+                    expected = generator.parse_barcode(barcode)
+                except ValueError:
+                    self.assertNotEqual(error, OK)
+                else:
+                    self.assertEqual(error, OK)
+                    self.assertEqual(to_patterns_info(record), expected)
+
+    def test_array_input(self):
+        barcodes = ['1234567890128', '123456789012']
+        _, list_errors = parse_barcodes(barcodes)
+        _, array_errors = parse_barcodes(np.array(barcodes))
+        np.testing.assert_array_equal(list_errors, array_errors)
+
+
+class PatternBarcodeValidationTests(SimpleTestCase):
+    """단일 렌더 엔드포인트도 ASCII 숫자가 아닌 바코드를 거절하는지"""
+
+    def test_full_width_digits_rejected(self):
+        response = self.client.get('/api/patterns/１２３４５６７８９０１２８.png')
+        self.assertEqual(response.status_code, 400)
+
+
+class PatternImageTests(MediaRootTestCase):
+    """단일 렌더 엔드포인트의 색상 검증 / ETag"""
+
+    url = '/api/patterns/1204567890125.png'
+
+    def test_malformed_colour_rejected(self):
+        for bottom in ('-f-f-f', '+f+f+f', ' fffff', 'abc', 'gggggg', '#aabbccdd'):
+            with self.subTest(bottom=bottom):
+                response = self.client.get(self.url, {'bottom': bottom, 'size': 32})
+                self.assertEqual(response.status_code, 400)
+
+    def test_create_rejects_malformed_colour(self):
+        response = self.client.post(
+            '/api/products/create-with-pattern/', product_data('colour', dominant_color='-f-f-f'),
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Product.objects.exists())
+
+    def test_create_stores_normalised_colour(self):
+        response = self.client.post(
+            '/api/products/create-with-pattern/', product_data('upper', dominant_color='AABBCC'),
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Product.objects.get(nickname='upper').dominant_color, '#aabbcc')
+
+    def test_etag_and_not_modified(self):
+        response = self.client.get(self.url, {'bottom': 'aabbcc', 'size': 32})
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with Image.open(io.BytesIO(response.content)) as image:
+            self.assertEqual(image.size, (32, 32))
+
+        response = self.client.get(self.url, {'bottom': 'aabbcc', 'size': 32}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        # 대소문자 / '#' 유무는 같은 입력
+        for bottom in ('#AABBCC', 'AaBbCc'):
+            response = self.client.get(self.url, {'bottom': bottom, 'size': 32}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(self.url, {'bottom': 'aabbcd', 'size': 32})
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class ProductListTests(MediaRootTestCase):
+    """목록 ETag / 304와 커서 페이지네이션"""
+
+    def create_products(self, count):
+        return [
+            Product.objects.create(
+                item_name='컵', nickname=f"list-{n}", met_date='2020-01-01',
+                farewell_date='2024-01-01', barcode='1204567890125',
+            )
+            for n in range(count)
+        ]
+
+    def test_etag_and_not_modified(self):
+        product = self.create_products(2)[0]
+        response = self.client.get('/api/products/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # 물건을 수정하면 (updated_at) 검증자가 바뀌어 다시 200
+        product.nickname = 'renamed'
+        product.save()
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/api/products/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_etag_depends_on_query(self):
+        self.create_products(1)
+        etag = self.client.get('/api/products/')['ETag']
+        self.assertNotEqual(self.client.get('/api/products/?fields=nickname')['ETag'], etag)
+
+    def test_cursor_pagination(self):
+        products = self.create_products(5)
+        expected = [p.nickname for p in sorted(products, key=lambda p: (p.created_at, p.id), reverse=True)]
+
+        seen = []
+        url = '/api/products/?page_size=2'
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page['results']), 2)
+            seen.extend(item['nickname'] for item in page['results'])
+            url = page['next']
+        self.assertEqual(seen, expected)
+
+    def test_unpaginated_list(self):
+        self.create_products(3)
+        self.assertEqual(len(self.client.get('/api/products/').json()), 3)
+
+
+class PatternJobTests(MediaRootTestCase):
+    """비동기 등록 작업의 상태 변화 (대기 → 완료 / 실패, 멈춘 작업 회수)"""
+
+    def create_async(self, nickname):
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post(
+                '/api/products/create-with-pattern/', product_data(nickname), HTTP_PREFER='respond-async',
+            )
+        self.assertEqual(response.status_code, 202)
+        return response.json()
+
+    def test_job_completes(self):
+        data = self.create_async('job-done')
+        status = self.client.get(data['status_url']).json()
+        self.assertEqual(status['status'], PatternJob.STATUS_QUEUED)
+        self.assertIsNone(status['pattern_image_url'])
+
+        self.assertTrue(run_pattern_job(data['job_id']))
+        status = self.client.get(data['status_url']).json()
+        self.assertEqual(status['status'], PatternJob.STATUS_DONE)
+        self.assertEqual(status['progress'], 100)
+        self.assertIsNotNone(status['pattern_image_url'])
+
+        # 이미 처리한 작업은 다시 가져가지 않음
+        self.assertFalse(run_pattern_job(data['job_id']))
+
+    def test_job_failure_is_recorded(self):
+        data = self.create_async('job-failed')
+        with mock.patch('items.jobs.get_or_create_pattern_asset', side_effect=RuntimeError('렌더 실패')):
+            self.assertTrue(run_pattern_job(data['job_id']))
+
+        status = self.client.get(data['status_url']).json()
+        self.assertEqual(status['status'], PatternJob.STATUS_FAILED)
+        self.assertIn('렌더 실패', status['error'])
+        self.assertIsNone(status['pattern_image_url'])
+
+    def test_stale_running_job_is_reclaimed(self):
+        stale = PatternJob.objects.get(pk=self.create_async('job-stale')['job_id'])
+        fresh = PatternJob.objects.get(pk=self.create_async('job-fresh')['job_id'])
+        PatternJob.objects.filter(pk=stale.pk).update(
+            status=PatternJob.STATUS_RUNNING, updated_at=timezone.now() - timedelta(hours=1),
+        )
+        PatternJob.objects.filter(pk=fresh.pk).update(status=PatternJob.STATUS_RUNNING)
+
+        self.assertEqual(process_pending_jobs(stale_seconds=60), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, PatternJob.STATUS_DONE)
+        self.assertEqual(fresh.status, PatternJob.STATUS_RUNNING)
+
+    def test_render_waits_with_timeout(self):
+        data = self.create_async('job-timeout')
+        with mock.patch('items.jobs.get_or_create_pattern_asset', side_effect=RuntimeError('x')) as render:
+            run_pattern_job(data['job_id'])
+        self.assertTrue(render.call_args.kwargs['wait'])
+        self.assertEqual(render.call_args.kwargs['timeout'], settings.PATTERN_JOB_RENDER_TIMEOUT)
+
+
+class PatternJobHeartbeatTests(TransactionTestCase):
+    """렌더링 중인 작업의 updated_at이 계속 갱신되는지 (별도 스레드가 DB에 씀)"""
+
+    def test_heartbeat_keeps_running_job_fresh(self):
+        product = Product.objects.create(
+            item_name='컵', nickname='heartbeat', met_date='2020-01-01',
+            farewell_date='2024-01-01', barcode='1204567890125',
+        )
+        old = timezone.now() - timedelta(hours=1)
+        job = PatternJob.objects.create(product=product, status=PatternJob.STATUS_RUNNING)
+        PatternJob.objects.filter(pk=job.pk).update(updated_at=old)
+
+        with job_heartbeat(job.pk, interval=0.05):
+            time.sleep(0.3)
+        job.refresh_from_db()
+        self.assertGreater(job.updated_at, old + timedelta(minutes=59))
+
+
+class NicknameReservationTests(MediaRootTestCase):
+    """닉네임 예약 / 확인 / 409 응답"""
+
+    def reserve(self, nickname, token=None):
+        data = {'nickname': nickname}
+        if token:
+            data['token'] = token
+        return self.client.post('/api/products/nickname-reservations/', data)
+
+    def exists(self, nickname, token=None):
+        params = {'nickname': nickname}
+        if token:
+            params['token'] = token
+        return self.client.get('/api/products/check-nickname/', params).json()['exists']
+
+    def test_reserve_and_check(self):
+        response = self.reserve('sunny')
+        self.assertEqual(response.status_code, 201)
+        token = response.json()['token']
+
+        self.assertTrue(self.exists('sunny'))
+        self.assertFalse(self.exists('sunny', token))
+        self.assertEqual(self.reserve('sunny').status_code, 409)
+        # 같은 토큰으로 다시 예약하면 연장
+        self.assertEqual(self.reserve('sunny', token).json()['token'], token)
+
+    def test_switch_and_release(self):
+        token = self.reserve('first').json()['token']
+        switched = self.reserve('second', token)
+        self.assertEqual(switched.status_code, 201)
+        self.assertFalse(self.exists('first'))
+        self.assertTrue(self.exists('second'))
+
+        token = switched.json()['token']
+        self.assertEqual(self.client.delete(f'/api/products/nickname-reservations/{token}/').status_code, 204)
+        self.assertFalse(self.exists('second'))
+        self.assertEqual(self.client.delete(f'/api/products/nickname-reservations/{token}/').status_code, 404)
+
+    def test_other_process_sees_changes(self):
+        # 다른 프로세스의 인덱스도 증분 갱신만으로 예약 / 취소를 봄
+        other = NicknameIndex(refresh_seconds=0)
+        other.sync()
+        token = self.reserve('shared').json()['token']
+        other.sync()
+        self.assertFalse(other.is_available('shared'))
+        self.assertTrue(other.is_available('shared', token))
+
+        self.client.delete(f'/api/products/nickname-reservations/{token}/')
+        other.sync()
+        self.assertTrue(other.is_available('shared'))
+
+    def test_create_with_pattern_conflicts(self):
+        token = self.reserve('held').json()['token']
+
+        response = self.client.post('/api/products/create-with-pattern/', product_data('held'))
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Product.objects.filter(nickname='held').exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/products/create-with-pattern/', product_data('held', nickname_token=token),
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(self.exists('held', token))
+
+        response = self.client.post('/api/products/create-with-pattern/', product_data('held'))
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(Product.objects.filter(nickname='held').count(), 1)
+
+    def test_plain_create_respects_reservation(self):
+        token = self.reserve('plain').json()['token']
+        self.assertEqual(self.client.post('/api/products/', product_data('plain')).status_code, 409)
+        response = self.client.post('/api/products/', product_data('plain', nickname_token=token))
+        self.assertEqual(response.status_code, 201)
+
+
+class NicknameIndexRaceTests(TestCase):
+    """갱신(rebuild / refresh)이 DB를 읽는 동안 들어온 변경을 잃지 않는지"""
+
+    def racing(self, index, name):
+        original = getattr(index, name)
+        expires_at = timezone.now() + timedelta(minutes=5)
+
+        def read():
+            # DB를 읽기 전에 다른 스레드의 저장 / 예약이 끝난 상황 (스냅샷에는 없음)
+            index.add('saved-during-sync')
+            index.reserve('reserved-during-sync', 'token', expires_at)
+            original()
+
+        setattr(index, name, read)
+
+    def test_rebuild_keeps_concurrent_changes(self):
+        index = NicknameIndex()
+        self.racing(index, '_rebuild')
+        index.rebuild()
+        self.assertFalse(index.is_available('saved-during-sync'))
+        self.assertFalse(index.is_available('reserved-during-sync'))
+        self.assertTrue(index.is_available('reserved-during-sync', 'token'))
+
+    def test_refresh_keeps_concurrent_changes(self):
+        index = NicknameIndex()
+        index.rebuild()
+        self.racing(index, '_refresh')
+        index.refresh()
+        self.assertFalse(index.is_available('saved-during-sync'))
+        self.assertFalse(index.is_available('reserved-during-sync'))
+
+
+@override_settings(PRODUCT_IMAGE_MAX_UPLOAD_BYTES=1024)
+class UploadLimitTests(MediaRootTestCase):
+    """크기 제한을 넘는 사진은 413, Product를 남기지 않음"""
+
+    def test_list_create_rejects_large_upload(self):
+        response = self.client.post('/api/products/', product_data('big-list', image=make_photo()))
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Product.objects.exists())
+
+    def test_create_with_pattern_rejects_large_upload(self):
+        response = self.client.post(
+            '/api/products/create-with-pattern/', product_data('big-pattern', image=make_photo()),
+        )
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Product.objects.exists())
+
+    @override_settings(PRODUCT_IMAGE_MAX_UPLOAD_BYTES=10 * 1024 * 1024)
+    def test_small_upload_is_accepted(self):
+        response = self.client.post(
+            '/api/products/create-with-pattern/', product_data('small', image=make_photo()),
+        )
+        self.assertEqual(response.status_code, 201)
+
+    @override_settings(PRODUCT_IMAGE_MAX_UPLOAD_BYTES=10 * 1024 * 1024)
+    def test_non_image_rejected(self):
+        upload = SimpleUploadedFile('photo.jpg', b'not an image', content_type='image/jpeg')
+        response = self.client.post('/api/products/create-with-pattern/', product_data('text', image=upload))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Product.objects.exists())
+
+    @override_settings(PRODUCT_IMAGE_MAX_UPLOAD_BYTES=10 * 1024 * 1024, PRODUCT_IMAGE_MAX_PIXELS=100 * 100)
+    def test_resolution_limit(self):
+        response = self.client.post(
+            '/api/products/create-with-pattern/', product_data('huge', image=make_photo(size=(200, 200))),
+        )
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(PRODUCT_IMAGE_MAX_UPLOAD_BYTES=10 * 1024 * 1024, PRODUCT_IMAGE_MAX_SIDE=64)
+    def test_stored_photo_is_downscaled_jpeg(self):
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 200), (10, 20, 30)).save(buffer, 'PNG')
+        upload = SimpleUploadedFile('photo.png', buffer.getvalue(), content_type='image/png')
+        response = self.client.post('/api/products/', product_data('resized', image=upload))
+        self.assertEqual(response.status_code, 201)
+
+        product = Product.objects.get(nickname='resized')
+        self.assertTrue(product.image.name.endswith('.jpg'))
+        with Image.open(product.image.path) as stored:
+            self.assertEqual(stored.format, 'JPEG')
+            self.assertEqual(stored.size, (64, 32))
+
+
+class SpriteSheetTests(MediaRootTestCase):
+    """스프라이트 시트 좌표표 / PNG와 크기 제한"""
+
+    def setUp(self):
+        super().setUp()
+        self.products = [
+            Product.objects.create(
+                item_name='컵', nickname=f"sprite-{n}", met_date='2020-01-01',
+                farewell_date='2024-01-01', barcode=barcode, dominant_color=color,
+            )
+            for n, (barcode, color) in enumerate([
+                ('1204567890125', '#aabbcc'), ('9876543210987', None), ('123', None),
+            ])
+        ]
+        self.ids = ','.join(str(p.id) for p in self.products)
+
+    def test_index_matches_png(self):
+        response = self.client.get(
+            '/api/products/sprite-sheet/index/', {'ids': f"{self.ids},99999", 'columns': 2, 'cell': 32},
+        )
+        self.assertEqual(response.status_code, 200)
+        index = response.json()
+        self.assertEqual((index['width'], index['height'], index['columns'], index['rows']), (64, 32, 2, 1))
+        first, second, invalid = (str(p.id) for p in self.products)
+        self.assertEqual(index['items'][first], {'x': 0, 'y': 0, 'width': 32, 'height': 32})
+        self.assertEqual(index['items'][second], {'x': 32, 'y': 0, 'width': 32, 'height': 32})
+        # 잘못된 바코드 / 없는 ID는 셀을 차지하지 않고 errors에 기록
+        self.assertEqual(set(index['errors']), {invalid, '99999'})
+
+        response = self.client.get('/api/products/sprite-sheet/', {'ids': self.ids, 'columns': 2, 'cell': 32})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Pattern-Set-Version'], index['pattern_set_version'])
+        with Image.open(io.BytesIO(b''.join(response.streaming_content))) as sheet:
+            sheet.load()
+            self.assertEqual(sheet.size, (64, 32))
+
+    def test_parameter_limits(self):
+        for params in (
+            {'columns': 0}, {'columns': settings.PATTERN_SPRITE_MAX_ITEMS + 1},
+            {'cell': 8}, {'cell': settings.PATTERN_SPRITE_MAX_CELL_SIZE + 2}, {'ids': 'a'},
+            {'ids': ','.join(['1'] * (settings.PATTERN_SPRITE_MAX_ITEMS + 1))},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get('/api/products/sprite-sheet/', params)
+                self.assertEqual(response.status_code, 400)
+
+    @override_settings(PATTERN_SPRITE_MAX_WIDTH=64)
+    def test_width_limit(self):
+        params = {'ids': self.ids, 'cell': 32}
+        response = self.client.get('/api/products/sprite-sheet/', {**params, 'columns': 2})
+        self.assertEqual(response.status_code, 200)
+        # 셀 수만큼만 줄을 채우므로 columns=400 이어도 그릴 항목 수로 줄어든 가로로 판단
+        response = self.client.get('/api/products/sprite-sheet/', {**params, 'columns': 400})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/products/sprite-sheet/', {**params, 'columns': 1, 'cell': 128})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/products/sprite-sheet/index/', {**params, 'columns': 1, 'cell': 128})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(PATTERN_SPRITE_MAX_PIXELS=32 * 32)
+    def test_pixel_limit(self):
+        response = self.client.get('/api/products/sprite-sheet/', {'ids': self.products[0].id, 'cell': 32})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/products/sprite-sheet/', {'ids': self.ids, 'columns': 1, 'cell': 32})
+        self.assertEqual(response.status_code, 400)
+
+
+class PatternSizeTests(SimpleTestCase):
+    """size 파라미터 범위와 크기별 타일 / 작업 버퍼 메모리"""
+
+    url = '/api/patterns/1204567890125.png'
+
+    def test_size_bounds(self):
+        for size in (0, 1, -4, 'x', settings.PATTERN_IMAGE_MAX_SIZE + 1):
+            with self.subTest(size=size):
+                self.assertEqual(self.client.get(self.url, {'size': size}).status_code, 400)
+
+        for size in (50, 101, settings.PATTERN_IMAGE_MAX_SIZE):
+            with self.subTest(size=size):
+                response = self.client.get(self.url, {'size': size})
+                self.assertEqual(response.status_code, 200)
+                with Image.open(io.BytesIO(response.content)) as image:
+                    self.assertEqual(image.size, (size, size))
+
+    def test_single_render_scales_only_needed_tiles(self):
+        library = get_pattern_generator().library
+        tile_size = 37
+        library._scaled.pop(tile_size, None)
+        tiles = {
+            (row, col, rotation): np.array(library.get_tile(row, col, rotation, tile_size))
+            for row, col in ((0, 0), (3, 5), (9, 9)) for rotation in (0, 90, 180, 270)
+        }
+        # 한 장을 위해 축소 atlas 전체를 만들지 않음
+        self.assertNotIn(tile_size, library._scaled)
+
+        # 타일 단위로 바꾼 결과가 축소 atlas와 같음
+        atlas = library.scaled_atlas(tile_size)
+        for (row, col, rotation), tile in tiles.items():
+            np.testing.assert_array_equal(tile, atlas[row, col, rotation // 90])
+
+    def test_large_scratch_buffers_are_not_kept(self):
+        tiles = [np.full((64, 64), value, dtype=np.uint8) for value in (0, 255, 0, 255)]
+        colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (9, 9, 9)]
+        kept = {}
+
+        def render():
+            out = compositor.composite_quadrants(tiles, colors)
+            kept['names'] = set(vars(compositor._scratch))
+            kept['out'] = out
+
+        with mock.patch.object(compositor, 'SCRATCH_MAX_BYTES', 128 * 128):
+            thread = threading.Thread(target=render)
+            thread.start()
+            thread.join()
+
+        # 모자이크(128x128 uint8)는 남기고, 더 큰 조회 버퍼(128x128 intp)는 남기지 않음
+        self.assertEqual(kept['names'], {'mosaic'})
+        self.assertEqual(tuple(kept['out'][0, 0]), (255, 0, 0))
+        self.assertEqual(tuple(kept['out'][0, 64]), (255, 255, 255))
+
+
+class RenditionTests(MediaRootTestCase):
+    """목록의 파생본 URL과 썸네일 / 중간 크기 파생본 생성"""
+
+    def setUp(self):
+        super().setUp()
+        buffer = io.BytesIO()
+        Image.new('RGB', (1600, 800), (10, 200, 30)).save(buffer, 'JPEG')
+        self.product = Product.objects.create(
+            item_name='컵', nickname='rendition', met_date='2020-01-01', farewell_date='2024-01-01',
+            barcode='1204567890125', image=SimpleUploadedFile('cup.jpg', buffer.getvalue()),
+        )
+
+    def rendition_url(self, field, rendition, pk=None):
+        return f"/api/products/{pk or self.product.pk}/renditions/{field}/{rendition}/"
+
+    def test_list_returns_rendition_urls(self):
+        response = self.client.get('/api/products/', {'page_size': 10, 'fields': 'id,nickname,renditions'})
+        self.assertEqual(response.status_code, 200)
+        item = response.json()['results'][0]
+        self.assertEqual(set(item), {'id', 'nickname', 'renditions'})
+        self.assertEqual(
+            item['renditions']['image'],
+            {name: f"http://testserver{self.rendition_url('image', name)}" for name in settings.IMAGE_RENDITIONS},
+        )
+        self.assertIsNone(item['renditions']['pattern_image'])
+
+    def test_rendition_is_created_once(self):
+        storage = self.product.image.storage
+        for rendition, side in settings.IMAGE_RENDITIONS.items():
+            with self.subTest(rendition=rendition):
+                response = self.client.get(self.rendition_url('image', rendition))
+                self.assertEqual(response.status_code, 302)
+                name = f"renditions/{rendition}_{side}/{self.product.image.name}"
+                self.assertEqual(response['Location'], storage.url(name))
+                self.assertIn('max-age=86400', response['Cache-Control'])
+                with storage.open(name) as f, Image.open(f) as image:
+                    self.assertEqual((image.format, image.size), ('JPEG', (side, side // 2)))
+
+                # 두 번째 요청은 저장된 파생본을 그대로 사용
+                with mock.patch('items.renditions.open_downscaled') as downscale:
+                    self.assertEqual(self.client.get(self.rendition_url('image', rendition)).status_code, 302)
+                downscale.assert_not_called()
+
+    def test_unknown_or_missing_rendition(self):
+        self.assertEqual(self.client.get(self.rendition_url('image', 'huge')).status_code, 404)
+        self.assertEqual(self.client.get(self.rendition_url('barcode', 'thumb')).status_code, 404)
+        self.assertEqual(self.client.get(self.rendition_url('pattern_image', 'thumb')).status_code, 404)
+        self.assertEqual(self.client.get(self.rendition_url('image', 'thumb', pk=99999)).status_code, 404)
+
+        self.product.image.storage.delete(self.product.image.name)
+        self.assertEqual(self.client.get(self.rendition_url('image', 'thumb')).status_code, 404)
+
+
+class RenderCacheTests(SimpleTestCase):
+    """메모리 LRU / 디스크 2단계 렌더 캐시"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix='items_test_cache_')
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+
+    def test_memory_then_disk_hit(self):
+        cache = RenderCache(self.cache_dir, max_bytes=1024)
+        self.assertIsNone(cache.get('a.png'))
+        cache.put('a.png', b'x' * 10)
+        self.assertEqual(cache.get('a.png'), b'x' * 10)
+
+        # 메모리를 비워도 (다른 프로세스처럼) 디스크에서 읽고 다시 메모리에 올림
+        cache.clear()
+        self.assertEqual(cache.get('a.png'), b'x' * 10)
+        self.assertEqual(cache.get('a.png'), b'x' * 10)
+        stats = cache.stats()
+        self.assertEqual((stats['misses'], stats['memory_hits'], stats['disk_hits']), (1, 2, 1))
+        self.assertEqual(RenderCache(self.cache_dir).get('a.png'), b'x' * 10)
+
+    def test_memory_is_bounded_by_bytes(self):
+        cache = RenderCache(None, max_bytes=25)
+        for key in ('a', 'b', 'c'):
+            cache.put(key, b'x' * 10)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['bytes'], 20)
+        # 용량보다 큰 항목은 메모리에 두지 않음
+        cache.put('big', b'x' * 30)
+        self.assertIsNone(cache.get('big'))
+        self.assertEqual(cache.get('c'), b'x' * 10)
+
+    def test_key_normalises_colour_and_includes_version(self):
+        key = render_key('1204567890125', '#AABBCC', 'v1', 'default')
+        self.assertEqual(key, render_key('1204567890125', 'aabbcc', 'v1', 'default'))
+        self.assertNotEqual(key, render_key('1204567890125', '#aabbcc', 'v2', 'default'))
+        self.assertNotEqual(key, render_key('1204567890125', '#aabbcc', 'v1', 'webp'))
+        self.assertNotEqual(key, render_key('1204567890125', None, 'v1', 'default'))
+
+    def test_generator_renders_once(self):
+        generator = BarcodePatternGenerator(output_dir=self.cache_dir, library=get_pattern_generator().library)
+        with mock.patch.object(generator, 'compose_pattern', wraps=generator.compose_pattern) as compose:
+            first = generator.render_pattern('1204567890125', '#aabbcc', size=64)
+            self.assertEqual(generator.render_pattern('1204567890125', '#AABBCC', size=64), first)
+        self.assertEqual(compose.call_count, 1)
+        self.assertEqual(generator.cache_stats()['memory_hits'], 1)
+
+        # 같은 output_dir 을 쓰는 다른 생성기(다른 워커)는 디스크에서 읽음
+        other = BarcodePatternGenerator(output_dir=self.cache_dir, library=generator.library)
+        with mock.patch.object(other, 'compose_pattern') as compose:
+            self.assertEqual(other.render_pattern('1204567890125', 'aabbcc', size=64), first)
+        compose.assert_not_called()
+        self.assertEqual(other.cache_stats()['disk_hits'], 1)
+
+
+class GeneratePatternsCommandTests(SimpleTestCase):
+    """generate_patterns 일괄 생성 명령의 항목별 결과"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix='items_test_batch_')
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.generator = BarcodePatternGenerator(
+            output_dir=os.path.join(self.tmp, 'out'), library=get_pattern_generator().library,
+        )
+        patcher = mock.patch(
+            'items.management.commands.generate_patterns.get_pattern_generator', return_value=self.generator,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_input(self, name, lines):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        return path
+
+    def run_command(self, path, *args):
+        results = os.path.join(self.tmp, 'results.jsonl')
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('generate_patterns', path, '--results', results, *args, stdout=stdout, stderr=stderr)
+        with open(results, encoding='utf-8') as f:
+            rows = sorted((json.loads(line) for line in f), key=lambda row: row['index'])
+        return rows, stdout.getvalue()
+
+    def test_renders_valid_items_and_reports_the_rest(self):
+        path = self.write_input('items.jsonl', [
+            '{"barcode": "1204567890125", "bottom_color": "#aabbcc"}',
+            '"9876543210987"',
+            '{"barcode": "123"}',
+            'not json',
+            '{"barcode": "1204567890125", "bottom_color": "-f-f-f"}',
+        ])
+        rows, stdout = self.run_command(path, '--workers', '1')
+
+        self.assertEqual([row['index'] for row in rows], [0, 1, 2, 3, 4])
+        for row in rows[:2]:
+            self.assertIsNone(row['error'])
+            self.assertTrue(os.path.exists(row['path']))
+        self.assertEqual(rows[0]['bottom_color'], '#aabbcc')
+        for row in rows[2:]:
+            self.assertIsNone(row['path'])
+            self.assertTrue(row['error'])
+        self.assertIn('입력된 길이: 3', rows[2]['error'])
+        self.assertIn('JSON', rows[3]['error'])
+        self.assertIn('성공 2건, 실패 3건', stdout)
+
+    def test_validate_only_reads_csv_without_rendering(self):
+        path = self.write_input('items.csv', ['barcode,dominant_color', '1204567890125,#112233', '12a4567890125,'])
+        with mock.patch.object(self.generator, 'create_pattern_image') as create:
+            rows, stdout = self.run_command(path, '--validate-only')
+        create.assert_not_called()
+        self.assertEqual([(row['bottom_color'], row['error'] is None) for row in rows], [('#112233', True), (None, False)])
+        self.assertIn('성공 1건, 실패 1건', stdout)
+
+
+class PatternStorageTests(MediaRootTestCase):
+    """렌더링한 패턴 바이트를 임시 파일 없이 스토리지에 저장하는지"""
+
+    def test_create_saves_rendered_bytes(self):
+        response = self.client.post(
+            '/api/products/create-with-pattern/', product_data('stored', dominant_color='#aabbcc'),
+        )
+        self.assertEqual(response.status_code, 201)
+        product = Product.objects.get(nickname='stored')
+
+        generator = get_pattern_generator()
+        name = generator.render_name('1204567890125', '#aabbcc', settings.PATTERN_ENCODER_PROFILE)
+        self.assertEqual(os.path.basename(product.pattern_image.name), name)
+        with product.pattern_image.open('rb') as f:
+            self.assertEqual(f.read(), render_pattern_bytes('1204567890125', '#aabbcc', settings.PATTERN_ENCODER_PROFILE))
+        # 요청 경로의 생성기는 output_dir 에 파일을 남기지 않음
+        self.assertIsNone(generator.render_cache.cache_dir)
+        self.assertFalse(os.path.exists(os.path.join(generator.output_dir, name)))
+
+        info = response.json()['pattern_info']
+        self.assertEqual(info, product.pattern_info)
+        self.assertEqual((info['barcode'], info['bottom_color_hex']), ('1204567890125', '#aabbcc'))
+        self.assertEqual([p['quadrant'] for p in info['patterns']], [1, 2, 3, 4])
+        self.assertEqual(info['pattern_set_version'], generator.library.version)
+
+    def test_cli_writes_png_and_json_sidecar(self):
+        output_dir = tempfile.mkdtemp(prefix='items_test_cli_')
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        generator = BarcodePatternGenerator(output_dir=output_dir, library=get_pattern_generator().library)
+
+        path = generator.create_pattern_image('1204567890125', '#aabbcc')
+        with Image.open(path) as image:
+            self.assertEqual(image.format, 'PNG')
+        with open(os.path.splitext(path)[0] + '_info.json', encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['bottom_color_hex'], '#aabbcc')
+
+        # 같은 입력은 기존 파일을 그대로 사용
+        with mock.patch.object(generator, 'render_pattern') as render:
+            self.assertEqual(generator.create_pattern_image('1204567890125', '#aabbcc'), path)
+        render.assert_not_called()
+
+
+class EncoderProfileTests(MediaRootTestCase):
+    """인코더 프로필별 출력 형식과 픽셀"""
+
+    def render(self, profile):
+        return get_pattern_generator().render_pattern('1204567890125', '#aabbcc', profile, size=64)
+
+    def test_raster_profiles_are_lossless(self):
+        with Image.open(io.BytesIO(self.render('default'))) as image:
+            expected = np.asarray(image.convert('RGB'))
+        for profile in RASTER_PROFILES:
+            with self.subTest(profile=profile), Image.open(io.BytesIO(self.render(profile))) as image:
+                self.assertEqual(image.format, ENCODER_PROFILES[profile]['format'])
+                self.assertEqual(image.mode == 'P', ENCODER_PROFILES[profile]['palette'])
+                np.testing.assert_array_equal(np.asarray(image.convert('RGB')), expected)
+
+    def test_palette_profile_is_smaller(self):
+        self.assertLess(len(self.render('small')), len(self.render('default')))
+        # RGB 이미지도 4색 팔레트로 바꿔서 저장
+        with Image.open(io.BytesIO(encode_image(Image.new('RGB', (8, 8), (1, 2, 3)), 'small'))) as image:
+            self.assertEqual(image.mode, 'P')
+
+    def test_svg_and_unknown_profiles(self):
+        self.assertTrue(self.render('svg').lstrip().startswith(b'<svg'))
+        with self.assertRaises(ValueError):
+            encode_image(Image.new('RGB', (8, 8)), 'svg')
+        with self.assertRaises(ValueError):
+            get_profile('jpeg')
+
+    def test_create_uses_requested_encoder(self):
+        response = self.client.post('/api/products/create-with-pattern/', product_data('bogus', encoder='jpeg'))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Product.objects.exists())
+
+        response = self.client.post('/api/products/create-with-pattern/', product_data('webp', encoder='webp'))
+        self.assertEqual(response.status_code, 201)
+        product = Product.objects.get(nickname='webp')
+        self.assertTrue(product.pattern_image.name.endswith('.webp'))
+        self.assertEqual(product.pattern_asset.encoder, 'webp')
+
+
+class ColorExtractionTests(MediaRootTestCase):
+    """업로드 사진의 대표색 / 팔레트 추출"""
+
+    def two_colour_png(self):
+        image = Image.new('RGB', (64, 32), (255, 0, 0))
+        image.paste((0, 0, 255), (48, 0, 64, 32))  # 1/4 파란색
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        buffer.seek(0)
+        return buffer
+
+    def test_dominant_colour_and_palette(self):
+        dominant, palette = extract_colors(self.two_colour_png(), k=3)
+        self.assertEqual(dominant, '#ff0000')
+        self.assertEqual(palette, ['#ff0000', '#0000ff'])
+
+    def test_kmeans_is_deterministic(self):
+        pixels = np.random.default_rng(1).integers(0, 256, size=(500, 3))
+        clusters = kmeans_palette(pixels, k=4)
+        self.assertEqual(clusters, kmeans_palette(pixels, k=4))
+        self.assertAlmostEqual(sum(share for _, share in clusters), 1.0)
+        self.assertEqual(kmeans_palette(np.empty((0, 3))), [])
+
+    def test_unreadable_photo_keeps_client_colour(self):
+        with self.assertLogs('items.imaging', 'WARNING'):
+            self.assertIsNone(extract_product_colors(io.BytesIO(b'not an image')))
+
+    def test_create_stores_extracted_colours(self):
+        response = self.client.post(
+            '/api/products/create-with-pattern/',
+            product_data('photo', image=make_photo(color=(0, 128, 0))),
+        )
+        self.assertEqual(response.status_code, 201)
+        product = Product.objects.get(nickname='photo')
+        red, green, blue = (int(product.dominant_color[i:i + 2], 16) for i in (1, 3, 5))
+        self.assertTrue(red < 16 and blue < 16 and abs(green - 128) < 16, product.dominant_color)
+        self.assertEqual(product.palette[0], product.dominant_color)
+        self.assertEqual(product.pattern_info['bottom_color_hex'], product.dominant_color)
+
+    @override_settings(PRODUCT_COLOR_EXTRACTION=False)
+    def test_extraction_can_be_disabled(self):
+        response = self.client.post('/api/products/create-with-pattern/', product_data('off', image=make_photo()))
+        self.assertEqual(response.status_code, 201)
+        product = Product.objects.get(nickname='off')
+        self.assertEqual((product.dominant_color, product.palette), ('#112233', None))
+
+
+class MetricsTests(SimpleTestCase):
+    """단계별 시간 히스토그램, /api/metrics/ 와 Server-Timing"""
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+
+    def test_histogram_buckets(self):
+        metrics.observe('encode', 0.003)
+        metrics.observe('encode', 0.2)
+        metrics.observe('encode', 60)
+
+        @metrics.timed('decorated')
+        def work():
+            return 'done'
+
+        with metrics.collect_timings() as timings:
+            self.assertEqual(work(), 'done')
+        self.assertEqual([stage for stage, _ in timings], ['decorated'])
+
+        hist = metrics.snapshot()['encode']
+        self.assertEqual(hist['count'], 3)
+        self.assertAlmostEqual(hist['sum'], 60.203)
+        text = metrics.render_prometheus()
+        self.assertIn('pattern_stage_duration_seconds_bucket{stage="encode",le="0.005"} 1', text)
+        self.assertIn('pattern_stage_duration_seconds_bucket{stage="encode",le="10.0"} 2', text)
+        self.assertIn('pattern_stage_duration_seconds_bucket{stage="encode",le="+Inf"} 3', text)
+        self.assertIn('pattern_stage_duration_seconds_count{stage="decorated"} 1', text)
+
+    def test_metrics_endpoint(self):
+        self.client.get('/api/patterns/1204567890125.png', {'size': 32})
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('pattern_stage_duration_seconds_count{stage="pattern_image"} 1', body)
+        self.assertIn('pattern_render_cache_misses_total', body)
+
+    def test_server_timing_header(self):
+        self.assertEqual(
+            server_timing_header([('compose', 0.01), ('encode', 0.002), ('compose', 0.005)]),
+            'compose;dur=15.0, encode;dur=2.0',
+        )
+        url = '/api/patterns/1204567890125.png'
+        self.assertNotIn('Server-Timing', self.client.get(url, {'size': 34}))
+        with self.settings(PATTERN_SERVER_TIMING=True):
+            response = self.client.get(url, {'size': 34})
+        self.assertIn('pattern_image;dur=', response['Server-Timing'])
+
+
+class PatternAssetTests(MediaRootTestCase):
+    """같은 (바코드, 색, 패턴 세트, 인코더) 조합은 한 번만 렌더링 / 저장"""
+
+    def create(self, nickname, **extra):
+        response = self.client.post('/api/products/create-with-pattern/', product_data(nickname, **extra))
+        self.assertEqual(response.status_code, 201)
+        return Product.objects.get(nickname=nickname)
+
+    def test_same_pattern_is_shared(self):
+        first = self.create('first', dominant_color='#aabbcc')
+        with mock.patch('items.patterns.render_asset_bytes') as render:
+            second = self.create('second', dominant_color='#AABBCC')
+        render.assert_not_called()
+        self.assertEqual(PatternAsset.objects.count(), 1)
+        self.assertEqual(first.pattern_asset_id, second.pattern_asset_id)
+        self.assertEqual(first.pattern_image.name, second.pattern_image.name)
+
+        other = self.create('other', dominant_color='#aabbcd')
+        self.assertNotEqual(other.pattern_asset_id, first.pattern_asset_id)
+        self.assertEqual(PatternAsset.objects.count(), 2)
+
+    def test_missing_file_is_rendered_again(self):
+        asset = get_or_create_pattern_asset('1204567890125', '#aabbcc')
+        asset.image.storage.delete(asset.image.name)
+        again = get_or_create_pattern_asset('1204567890125', '#aabbcc')
+        self.assertEqual(again.pk, asset.pk)
+        self.assertTrue(again.image.storage.exists(again.image.name))
+
+    def test_list_by_barcode(self):
+        self.create('a')
+        self.create('b', barcode='9876543210987')
+        response = self.client.get('/api/products/', {'barcode': '9876543210987', 'fields': 'nickname'})
+        self.assertEqual(response.json(), [{'nickname': 'b'}])
+
+
+class RenderPoolTests(SimpleTestCase):
+    """워커 프로세스 렌더링 결과와 대기열 상한"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.generator = get_pattern_generator()
+        # 결과가 슬롯(1KB)보다 크면 pickle로 돌려받는 경로도 함께 확인
+        cls.pool = RenderPool(
+            cls.generator.pattern_dir, cls.generator.output_dir, processes=1, max_pending=2, slot_bytes=1024,
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def test_matches_in_process_render(self):
+        for size in (32, 512):  # 슬롯에 들어가는 / 넘치는 결과
+            with self.subTest(size=size):
+                expected = self.generator.render_pattern('1204567890125', '#aabbcc', 'default', size)
+                self.assertEqual(
+                    self.pool.render('1204567890125', '#aabbcc', 'default', size, timeout=60), expected,
+                )
+        self.assertLessEqual(len(self.generator.render_pattern('1204567890125', '#aabbcc', 'default', 32)), 1024)
+        self.assertGreater(len(self.generator.render_pattern('1204567890125', '#aabbcc', 'default', 512)), 1024)
+
+        with self.assertRaises(ValueError):
+            self.pool.render('123', timeout=60)
+        self.assertEqual(self.pool.stats()['in_flight'], 0)
+
+    def test_full_queue_is_rejected(self):
+        slots = [self.pool._acquire_slot(False, None) for _ in range(self.pool.max_pending)]
+        try:
+            rejected = self.pool.rejected
+            with self.assertRaises(RenderPoolBusy):
+                self.pool.submit('1204567890125')
+            with self.assertRaises(RenderPoolBusy):
+                self.pool.submit('1204567890125', wait=True, timeout=0.05)
+            self.assertEqual(self.pool.rejected, rejected + 2)
+            self.assertEqual(self.pool.stats()['in_flight'], self.pool.max_pending)
+        finally:
+            for slot in slots:
+                self.pool._release_slot(slot)
+
+    def test_busy_pool_returns_503(self):
+        with mock.patch('items.views.render_pattern_bytes', side_effect=RenderPoolBusy('busy')):
+            response = self.client.get('/api/patterns/1204567890125.png', {'size': 38})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+
+class DatabaseTuningTests(TestCase):
+    """SQLite 운영 설정과 자주 쓰는 조회의 인덱스 사용"""
+
+    def test_sqlite_options(self):
+        tmp = tempfile.mkdtemp(prefix='items_test_db_')
+        self.addCleanup(shutil.rmtree, tmp, ignore_errors=True)
+        default = settings.DATABASES['default']
+        handler = ConnectionHandler({'default': {
+            'ENGINE': default['ENGINE'],
+            'NAME': os.path.join(tmp, 'tuned.sqlite3'),
+            'OPTIONS': default['OPTIONS'],
+        }})
+        connection = handler['default']
+        self.addCleanup(connection.close)
+        with connection.cursor() as cursor:
+            pragmas = {}
+            for name in ('journal_mode', 'synchronous', 'busy_timeout', 'temp_store'):
+                cursor.execute(f'PRAGMA {name}')
+                pragmas[name] = cursor.fetchone()[0]
+        self.assertEqual(pragmas, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 20000, 'temp_store': 2})
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+        self.assertGreater(default['CONN_MAX_AGE'], 0)
+
+    def test_hot_queries_use_indexes(self):
+        plans = {
+            'product_created_id_idx': Product.objects.order_by('-created_at', '-id')[:30],
+            'items_product_barcode': Product.objects.filter(barcode='1204567890125'),
+            'pattern_job_status_idx': PatternJob.objects.filter(status=PatternJob.STATUS_QUEUED).order_by('created_at'),
+            'pattern_job_product_idx': PatternJob.objects.filter(product_id=1).order_by('-created_at', '-id')[:1],
+        }
+        for index, queryset in plans.items():
+            with self.subTest(index=index):
+                self.assertIn(index, queryset.explain())
@@ -0,0 +1,34 @@
+"""
+업로드 크기 제한 핸들러
+파일을 받는 도중에 바이트 수를 세어 제한을 넘으면 바로 수신을 멈춘다.
+(나머지 본문은 버리면서 읽으므로 메모리 / 임시 파일이 더 커지지 않음)
+
+settings.FILE_UPLOAD_HANDLERS 의 맨 앞에 두고, 뷰에서는 upload_too_large(request)로 확인한다.
+"""
+
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+
+class SizeLimitedUploadHandler(FileUploadHandler):
+    """파일 하나가 PRODUCT_IMAGE_MAX_UPLOAD_BYTES를 넘으면 업로드 중단"""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.PRODUCT_IMAGE_MAX_UPLOAD_BYTES:
+            self.request.upload_too_large = True
+            raise StopUpload(connection_reset=False)
+        # 다음 핸들러(메모리 / 임시 파일)로 그대로 넘김
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+
+def upload_too_large(request):
+    """요청의 업로드 파일이 크기 제한에 걸렸는지 (request.FILES를 읽은 뒤 호출)"""
+    return getattr(request, 'upload_too_large', False)
@@ -1,8 +1,34 @@
 from django.urls import path
-from .views import ProductListCreateView, check_nickname, create_product_with_pattern
+from . import async_views
+from .views import (
+    ProductListCreateView,
+    check_nickname,
+    create_nickname_reservation,
+    create_product_with_pattern,
+    delete_nickname_reservation,
+    metrics,
+    pattern_cache_stats,
+    pattern_image,
+    pattern_status,
+    product_rendition,
+    product_sprite_sheet,
+    product_sprite_sheet_index,
+)
 
 urlpatterns = [
     path('products/', ProductListCreateView.as_view(), name='product-list-create'),
     path('products/check-nickname/', check_nickname, name='product-check-nickname'),
+    path('products/nickname-reservations/', create_nickname_reservation, name='nickname-reservation-create'),
+    path('products/nickname-reservations/<str:token>/', delete_nickname_reservation, name='nickname-reservation-delete'),
     path("products/create-with-pattern/", create_product_with_pattern, name="product_create_with_pattern"),
+    path("products/<int:pk>/pattern-status/", pattern_status, name="product_pattern_status"),
+    path("products/sprite-sheet/", product_sprite_sheet, name="product_sprite_sheet"),
+    path("products/sprite-sheet/index/", product_sprite_sheet_index, name="product_sprite_sheet_index"),
+    path("products/<int:pk>/renditions/<str:field>/<str:rendition>/", product_rendition, name="product_rendition"),
+    # ASGI 서버용 async 버전 (응답 형식 동일)
+    path('async/products/check-nickname/', async_views.check_nickname, name='product-check-nickname-async'),
+    path("async/products/create-with-pattern/", async_views.create_product_with_pattern, name="product_create_with_pattern_async"),
+    path("patterns/cache-stats/", pattern_cache_stats, name="pattern_cache_stats"),
+    path("patterns/<str:barcode>.<str:ext>", pattern_image, name="pattern_image"),
+    path("metrics/", metrics, name="metrics"),
 ]
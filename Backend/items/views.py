@@ -1,42 +1,195 @@
+import hashlib
+
 from rest_framework import generics, status
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
 from django.conf import settings
-from django.core.files import File
+from django.db import transaction
+from django.db.models import Count, Max
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import require_GET, require_safe
+
+from .imaging import extract_product_colors, normalize_upload
+from .jobs import enqueue_pattern_job
+from .models import PatternJob, Product
+from .nicknames import NicknameTaken, nickname_available, release_nickname, reserve_nickname, save_product_nickname
+from .patterns import (
+    attach_pattern_asset,
+    get_or_create_pattern_asset,
+    get_pattern_generator,
+    get_render_pool,
+    render_pattern_bytes,
+)
+from .renditions import RENDITION_FIELDS, get_or_create_rendition
+from .pagination import ProductCursorPagination
+from .serializers import ProductSerializer, requested_fields
+from .uploads import upload_too_large
+from items.pattern_logic.encoders import get_profile
+from items.pattern_logic.metrics import render_prometheus, timed
+from items.pattern_logic.render_cache import normalize_hex
+from items.pattern_logic.render_pool import RenderPoolBusy
 
-import os
+# 렌더 풀이 가득 차서 503으로 응답할 때 다시 시도하라고 알려주는 시간 (초)
+RENDER_BUSY_RETRY_AFTER = 1
 
-from .models import Product
-from .serializers import ProductSerializer
-from items.pattern_logic.barcode_pattern import BarcodePatternGenerator
+
+def wants_async_render(request):
+    """
+    패턴을 백그라운드 작업으로 만들지 여부
+    설정(PATTERN_RENDER_ASYNC)이 켜져 있거나 요청에 `Prefer: respond-async` 헤더가 있으면 비동기
+    """
+    if settings.PATTERN_RENDER_ASYNC:
+        return True
+    prefer = request.headers.get('Prefer', '')
+    return 'respond-async' in [p.strip().lower() for p in prefer.split(',')]
 
 
 # 1) 기본 Product 리스트 조회 + 생성 (GET / POST /api/products/)
+#    ?page_size= / ?cursor=  : 커서 페이지네이션 (없으면 전체 배열)
+#    ?fields=nickname,pattern_image : 필요한 필드만 조회 / 응답
+#    ?barcode=8801234567890 : 바코드로 검색
+#    ETag / Last-Modified 로 변경이 없으면 304 응답
 class ProductListCreateView(generics.ListCreateAPIView):
-    # 최신순으로 정렬
-    queryset = Product.objects.all().order_by('-created_at')
+    # 최신순으로 정렬 (같은 시각이면 id 역순)
+    queryset = Product.objects.all().order_by('-created_at', '-id')
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        # ?barcode= : 같은 바코드의 물건만 (barcode 인덱스 사용)
+        barcode = self.request.query_params.get('barcode')
+        if barcode:
+            queryset = queryset.filter(barcode=barcode.strip())
+
+        fields = requested_fields(self.request)
+        if fields is None:
+            return queryset
+
+        columns = {f.name for f in Product._meta.concrete_fields}
+        unknown = set(fields) - columns - {'renditions'}
+        if unknown:
+            raise ValidationError({"fields": f"알 수 없는 필드: {', '.join(sorted(unknown))}"})
+
+        # 요청한 컬럼만 SELECT (커서 정렬에 필요한 created_at / id는 항상 포함)
+        only = (set(fields) & columns) | {'id', 'created_at'}
+        if 'renditions' in fields:
+            only.update(RENDITION_FIELDS)
+        return queryset.only(*only)
+
+    def create(self, request, *args, **kwargs):
+        request.FILES  # 업로드를 먼저 파싱해야 크기 제한 여부를 알 수 있음
+        if upload_too_large(request):
+            return Response(
+                {"detail": "사진 파일이 너무 큽니다."},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        try:
+            return super().create(request, *args, **kwargs)
+        except NicknameTaken as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+
+    def perform_create(self, serializer):
+        # 다른 키오스크가 예약한 닉네임은 거절, 자기 예약(nickname_token)이면 사용 처리
+        product = Product(**serializer.validated_data)
+        with transaction.atomic():
+            save_product_nickname(product, self.request.data.get('nickname_token') or None)
+        serializer.instance = product
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # 목록 상태(개수 / 마지막 id / 마지막 변경 시각)와 쿼리 문자열로 검증자 생성
+        state = queryset.order_by().aggregate(
+            count=Count('id'),
+            last_id=Max('id'),
+            last_modified=Max('updated_at'),
+        )
+        last_modified = state['last_modified']
+        etag = quote_etag(hashlib.md5(
+            f"{request.get_full_path()}|{state['count']}|{state['last_id']}|"
+            f"{last_modified.isoformat() if last_modified else ''}".encode()
+        ).hexdigest())
+        last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified_ts)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        if last_modified_ts is not None:
+            response['Last-Modified'] = http_date(last_modified_ts)
+        patch_vary_headers(response, ['Accept'])
+        return response
 
 
 # 2) 닉네임 중복 확인 (GET /api/products/check-nickname/?nickname=...)
+#    DB 조회 없이 메모리 인덱스로 답함. token을 보내면 자기 예약은 사용 가능으로 봄
 @api_view(['GET'])
 def check_nickname(request):
     nickname = request.query_params.get('nickname', '').strip()
-    exists = Product.objects.filter(nickname=nickname).exists()
-    return Response({'exists': exists})
+    token = request.query_params.get('token') or None
+    return Response({'exists': not nickname_available(nickname, token)})
+
+
+# 2-1) 닉네임 예약 (POST /api/products/nickname-reservations/ {nickname, token?})
+#      받은 token을 create-with-pattern의 nickname_token으로 보내면 등록 시 닉네임 충돌이 없음
+#      token을 같이 보내면 기존 예약을 연장하거나 새 닉네임으로 바꿈
+@api_view(['POST'])
+def create_nickname_reservation(request):
+    nickname = (request.data.get('nickname') or '').strip()
+    token = request.data.get('token') or None
+    max_length = Product._meta.get_field('nickname').max_length
+    if not nickname or len(nickname) > max_length:
+        return Response(
+            {"detail": f"닉네임은 1~{max_length}자여야 합니다."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        reservation = reserve_nickname(nickname, token)
+    except NicknameTaken as e:
+        return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+
+    return Response(
+        {
+            "nickname": reservation.nickname,
+            "token": reservation.token,
+            "expires_at": reservation.expires_at,
+        },
+        status=status.HTTP_201_CREATED,
+    )
+
+
+# 2-2) 닉네임 예약 취소 (DELETE /api/products/nickname-reservations/<token>/)
+@api_view(['DELETE'])
+def delete_nickname_reservation(request, token):
+    if not release_nickname(token):
+        raise Http404("예약을 찾을 수 없습니다.")
+    return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 # 3) 패턴 생성까지 같이 처리하는 엔드포인트
 #    (POST /api/products/create-with-pattern/)
 @api_view(['POST'])
+@timed("create_product_with_pattern")
 def create_product_with_pattern(request):
     """
     물건 정보 + 바코드 + dominant_color + 사진을 받아
-    1) Product 생성
+    1) Product 생성 (사진이 있으면 서버에서 대표색 / 팔레트 추출)
     2) 패턴 PNG 생성
     3) pattern_image에 저장
     4) pattern_image_url을 응답
+
+    비동기 모드(wants_async_render)에서는 2~3을 백그라운드 작업으로 넘기고
+    202 + job_id를 응답한다. 진행 상태는 pattern-status 엔드포인트로 조회.
     """
 
     item_name = request.data.get('item_name')
@@ -46,6 +199,14 @@ def create_product_with_pattern(request):
     barcode = request.data.get('barcode')
     dominant_color = request.data.get('dominant_color')
     image_file = request.FILES.get('image')  # FormData에서 'image'로 들어오는 파일
+    encoder = request.data.get('encoder') or settings.PATTERN_ENCODER_PROFILE
+    nickname_token = request.data.get('nickname_token') or None  # 닉네임 예약 토큰
+
+    if upload_too_large(request):
+        return Response(
+            {"detail": "사진 파일이 너무 큽니다."},
+            status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
 
     # 필수 값 체크
     if not all([item_name, nickname, met_date, farewell_date, barcode]):
@@ -54,7 +215,39 @@ def create_product_with_pattern(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    # 1) Product 기본 정보 저장
+    # 닉네임 충돌은 사진 처리 / 렌더링 전에 메모리 인덱스로 먼저 거름 (최종 판정은 저장 시점)
+    if not nickname_available(nickname, nickname_token):
+        return Response(
+            {"detail": str(NicknameTaken(nickname))},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    # 사진 검증 / 축소 + 메타데이터 제거 (저장되는 사진 크기 제한)
+    palette = None
+    if image_file:
+        try:
+            with timed("upload_normalize"):
+                image_file = normalize_upload(image_file)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 서버에서 대표색 / 팔레트 추출 (하단 패턴 색에 사용)
+        with timed("color_extract"):
+            colors = extract_product_colors(image_file)
+        if colors:
+            dominant_color, palette = colors
+
+    # 패턴 입력값은 Product를 저장하기 전에 검증 (잘못된 값이면 400, DB에 아무것도 남기지 않음)
+    try:
+        with timed("validate"):
+            get_profile(encoder)
+            get_pattern_generator().describe_pattern(barcode, dominant_color)
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if dominant_color:
+        dominant_color = normalize_hex(dominant_color)
+
+    # 1) Product 기본 정보
     product = Product(
         item_name=item_name,
         nickname=nickname,
@@ -62,37 +255,51 @@ def create_product_with_pattern(request):
         farewell_date=farewell_date,
         barcode=barcode,
         dominant_color=dominant_color,
+        palette=palette,
     )
 
     if image_file:
         product.image = image_file
 
-    product.save()
+    # 2-a) 비동기 모드: 작업만 등록하고 202 응답 (렌더링은 작업 스레드에서)
+    if wants_async_render(request):
+        try:
+            with timed("db_save"), transaction.atomic():
+                save_product_nickname(product, nickname_token)
+                job = PatternJob.objects.create(product=product, encoder=encoder)
+                enqueue_pattern_job(job)
+        except NicknameTaken as e:
+            return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
 
-    # 12) 패턴 템플릿 PNG가 들어있는 폴더 (mnt_project)
-    pattern_dir = os.path.join(
-        settings.BASE_DIR,
-        "items",
-        "pattern_logic",
-        "mnt_project",
-    )
-
-    # 3) 결과 패턴 이미지가 저장될 폴더
-    output_dir = os.path.join(
-        settings.BASE_DIR,
-        "pattern_outputs",
-    )
-    os.makedirs(output_dir, exist_ok=True)
-
-    generator = BarcodePatternGenerator(
-        pattern_dir=pattern_dir,
-        output_dir=output_dir,
-    )
+        return Response(
+            {
+                "id": product.id,
+                "job_id": job.id,
+                "status": job.status,
+                "status_url": reverse('product_pattern_status', args=[product.id]),
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
 
+    # 2-b) 동기 모드: 패턴 자산을 먼저 준비한 뒤 Product만 짧은 트랜잭션으로 저장
+    #      렌더링 동안 쓰기 잠금(IMMEDIATE)을 잡지 않도록 트랜잭션 밖에서 렌더링한다.
+    #      패턴 생성이 실패하면 Product는 남지 않고, 저장이 실패해도 만들어 둔 자산은
+    #      같은 조합의 다음 요청이 그대로 재사용한다.
     try:
-        pattern_path = generator.create_pattern_image(
-            barcode=barcode,
-            bottom_color_hex=dominant_color,
+        # 같은 (바코드, 색, 패턴 세트, 인코더) 자산이 있으면 렌더링 없이 재사용
+        asset = get_or_create_pattern_asset(barcode, dominant_color, encoder)
+        with transaction.atomic():
+            attach_pattern_asset(product, asset)
+            with timed("db_save"):
+                save_product_nickname(product, nickname_token)
+    except NicknameTaken as e:
+        return Response({"detail": str(e)}, status=status.HTTP_409_CONFLICT)
+    except RenderPoolBusy as e:
+        # 렌더 대기열이 가득 참: 기다리지 않고 바로 503 (Product도 남기지 않음)
+        return Response(
+            {"detail": f"패턴 생성 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요. ({e})"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": str(RENDER_BUSY_RETRY_AFTER)},
         )
     except Exception as e:
         # 패턴 생성 실패 시
@@ -101,16 +308,233 @@ def create_product_with_pattern(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    # 3) pattern_image 필드에 저장 (ImageField 또는 FileField라고 가정)
-    with open(pattern_path, 'rb') as f:
-        filename = os.path.basename(pattern_path)
-        product.pattern_image.save(filename, File(f), save=True)
-
-    # 4) 응답: 프론트에서 바로 이미지 쓸 수 있도록 URL 반환
+    # 3) 응답: 프론트에서 바로 이미지 쓸 수 있도록 URL 반환
     return Response(
         {
             "id": product.id,
             "pattern_image_url": product.pattern_image.url,
+            "pattern_info": product.pattern_info,
         },
         status=status.HTTP_201_CREATED,
     )
+
+
+# 4) 패턴 생성 진행 상태 (GET /api/products/<id>/pattern-status/)
+@api_view(['GET'])
+def pattern_status(request, pk):
+    product = get_object_or_404(Product, pk=pk)
+    job = product.pattern_jobs.order_by('-created_at', '-id').first()
+
+    data = {
+        "id": product.id,
+        "job_id": job.id if job else None,
+        "status": job.status if job else (PatternJob.STATUS_DONE if product.pattern_image else None),
+        "progress": job.progress if job else (100 if product.pattern_image else 0),
+        "error": job.error if job and job.error else None,
+        "pattern_image_url": product.pattern_image.url if product.pattern_image else None,
+    }
+    return Response(data)
+
+
+# 5) 이미지 파생본 (GET /api/products/<id>/renditions/<image|pattern_image>/<thumb|medium>/)
+#    처음 요청 시 파생본을 만들고, 이후에는 저장된 파일로 바로 리다이렉트
+@api_view(['GET'])
+def product_rendition(request, pk, field, rendition):
+    if field not in RENDITION_FIELDS or rendition not in settings.IMAGE_RENDITIONS:
+        raise Http404("알 수 없는 파생본입니다.")
+
+    product = get_object_or_404(Product.objects.only('id', field), pk=pk)
+    source = getattr(product, field)
+    if not source:
+        raise Http404("원본 이미지가 없습니다.")
+
+    try:
+        name = get_or_create_rendition(source.storage, source.name, rendition)
+    except FileNotFoundError:
+        raise Http404("원본 이미지 파일을 찾을 수 없습니다.")
+
+    response = HttpResponseRedirect(source.storage.url(name))
+    # 같은 원본/크기면 파생본 위치가 바뀌지 않으므로 리다이렉트도 캐시 가능
+    patch_cache_control(response, public=True, max_age=86400)
+    return response
+
+
+def _sprite_sheet_for_request(request):
+    """
+    쿼리 파라미터로 스프라이트 시트 구성
+        ids=1,2,3 : 넣을 물건 ID (순서대로 배치, 없으면 최신 물건부터 PATTERN_SPRITE_MAX_ITEMS 개)
+        columns   : 한 줄의 셀 수 (없으면 정사각형에 가깝게)
+        cell      : 셀 한 변의 픽셀 수 (짝수)
+
+    Returns:
+        tuple: (SpriteSheet, 찾을 수 없는 ID의 오류 dict)
+
+    Raises:
+        ValueError: 잘못된 파라미터이거나 그릴 물건이 없음, 시트가 너무 큼
+    """
+    max_items = settings.PATTERN_SPRITE_MAX_ITEMS
+    try:
+        ids = [int(v) for v in request.GET.get('ids', '').split(',') if v.strip()]
+        columns = int(request.GET['columns']) if request.GET.get('columns') else None
+        cell_size = int(request.GET.get('cell') or settings.PATTERN_SPRITE_CELL_SIZE)
+    except ValueError:
+        raise ValueError("ids / columns / cell 은 정수여야 합니다.")
+
+    if len(ids) > max_items:
+        raise ValueError(f"한 번에 최대 {max_items}개까지 가능합니다.")
+    if columns is not None and not 1 <= columns <= max_items:
+        raise ValueError(f"columns 는 1 ~ {max_items} 사이여야 합니다.")
+    if not 16 <= cell_size <= settings.PATTERN_SPRITE_MAX_CELL_SIZE:
+        raise ValueError(f"cell 은 16 ~ {settings.PATTERN_SPRITE_MAX_CELL_SIZE} 사이여야 합니다.")
+
+    queryset = Product.objects.only('id', 'barcode', 'dominant_color')
+    if ids:
+        found = {p.id: p for p in queryset.filter(id__in=ids)}
+        products = [found[i] for i in dict.fromkeys(ids) if i in found]
+        missing = {i: "물건을 찾을 수 없습니다." for i in ids if i not in found}
+    else:
+        products = list(queryset.order_by('-created_at', '-id')[:max_items])
+        missing = {}
+
+    sheet = get_pattern_generator().sprite_sheet(
+        ((p.id, p.barcode, p.dominant_color or None) for p in products),
+        columns=columns,
+        cell_size=cell_size,
+    )
+    # 항목 수 / columns / cell 을 각각 제한해도 곱은 커질 수 있으므로 시트 전체 크기로 한 번 더 제한
+    # (그리기 전이라 한 줄 버퍼는 아직 할당되지 않음)
+    if sheet.width > settings.PATTERN_SPRITE_MAX_WIDTH:
+        raise ValueError(
+            f"시트 가로(columns × cell = {sheet.width}px)는 {settings.PATTERN_SPRITE_MAX_WIDTH}px 이하여야 합니다."
+        )
+    if sheet.width * sheet.height > settings.PATTERN_SPRITE_MAX_PIXELS:
+        raise ValueError(
+            f"시트 크기({sheet.width}×{sheet.height})가 최대 픽셀 수 {settings.PATTERN_SPRITE_MAX_PIXELS}를 넘습니다."
+        )
+    return sheet, missing
+
+
+# 6) 패턴 스프라이트 시트 (GET /api/products/sprite-sheet/?ids=1,2,3&columns=10&cell=256)
+#    여러 물건의 패턴을 격자로 배치한 PNG 한 장 (한 줄씩 인코딩해서 스트리밍)
+#    좌표표는 같은 파라미터로 /api/products/sprite-sheet/index/ 에서 조회
+#    (ids 없이 요청하면 그 사이 새 물건이 생길 때 배치가 달라지므로 ids 지정 권장)
+@require_GET
+def product_sprite_sheet(request):
+    try:
+        sheet, _ = _sprite_sheet_for_request(request)
+    except ValueError as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+
+    response = StreamingHttpResponse(sheet.iter_png(), content_type='image/png')
+    response['X-Pattern-Set-Version'] = sheet.version
+    return response
+
+
+@api_view(['GET'])
+def product_sprite_sheet_index(request):
+    try:
+        sheet, missing = _sprite_sheet_for_request(request)
+    except ValueError as e:
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    index = sheet.index()
+    index["errors"].update(missing)
+    query = request.GET.urlencode()
+    index["image"] = request.build_absolute_uri(
+        reverse('product_sprite_sheet') + (f"?{query}" if query else "")
+    )
+    return Response(index)
+
+
+def _pattern_image_profile(ext):
+    """URL 확장자에 맞는 인코더 프로필 (png는 설정된 프로필이 PNG일 때만 그대로 사용)"""
+    if ext in ('webp', 'svg'):
+        return ext
+    if ext == 'png':
+        profile = settings.PATTERN_ENCODER_PROFILE
+        return profile if get_profile(profile)['format'] == 'PNG' else 'default'
+    return None
+
+
+# 7) 패턴 이미지 즉시 렌더링 (GET /api/patterns/<barcode>.<png|webp|svg>?bottom=aabbcc&size=512)
+#    저장하지 않은 물건의 미리보기 / 인쇄용. size는 원본보다 크거나 작아도 되고, svg는 벡터라 크기와 무관
+#    파일을 만들지 않고 렌더 캐시(메모리)만 사용하고,
+#    입력으로 정해지는 강한 ETag + 긴 Cache-Control로 반복 요청은 브라우저 / CDN에서 처리
+@require_safe
+@timed("pattern_image")
+def pattern_image(request, barcode, ext):
+    profile = _pattern_image_profile(ext)
+    if profile is None:
+        raise Http404("지원하지 않는 이미지 형식입니다.")
+
+    generator = get_pattern_generator()
+    bottom = request.GET.get('bottom') or None
+    try:
+        size = int(request.GET['size']) if request.GET.get('size') else None
+    except ValueError:
+        return JsonResponse({"detail": "size 는 정수여야 합니다."}, status=400)
+    if size is not None and size > settings.PATTERN_IMAGE_MAX_SIZE:
+        return JsonResponse({"detail": f"size 는 {settings.PATTERN_IMAGE_MAX_SIZE} 이하여야 합니다."}, status=400)
+
+    try:
+        generator.parse_barcode(barcode)
+        if bottom is not None:
+            generator.hex_to_rgb(bottom)
+            # 대소문자 / '#' 유무가 달라도 같은 캐시 키와 ETag
+            bottom = normalize_hex(bottom)
+        etag = quote_etag(generator.cache_key(barcode, bottom, profile, size)[:32])
+    except ValueError as e:
+        return JsonResponse({"detail": str(e)}, status=400)
+
+    # 같은 입력이면 렌더링 전에 304
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        try:
+            data = render_pattern_bytes(barcode, bottom, profile, size)
+        except RenderPoolBusy as e:
+            response = JsonResponse({"detail": str(e)}, status=503)
+            response['Retry-After'] = str(RENDER_BUSY_RETRY_AFTER)
+            return response
+        response = HttpResponse(data, content_type=get_profile(profile)['content_type'])
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.PATTERN_IMAGE_MAX_AGE)
+    return response
+
+
+# 8) 렌더 캐시 통계 (GET /api/patterns/cache-stats/)
+@api_view(['GET'])
+def pattern_cache_stats(request):
+    return Response(get_pattern_generator().cache_stats())
+
+
+# 9) 단계별 소요 시간 히스토그램 + 렌더 캐시 통계 (GET /api/metrics/, Prometheus 텍스트 형식)
+def metrics(request):
+    stats = get_pattern_generator().cache_stats()
+    lines = [
+        "# HELP pattern_render_cache_hits_total Render cache hits.",
+        "# TYPE pattern_render_cache_hits_total counter",
+        f'pattern_render_cache_hits_total{{tier="memory"}} {stats["memory_hits"]}',
+        f'pattern_render_cache_hits_total{{tier="disk"}} {stats["disk_hits"]}',
+        "# HELP pattern_render_cache_misses_total Render cache misses.",
+        "# TYPE pattern_render_cache_misses_total counter",
+        f"pattern_render_cache_misses_total {stats['misses']}",
+        "# HELP pattern_render_cache_bytes Bytes held in the in-memory render cache.",
+        "# TYPE pattern_render_cache_bytes gauge",
+        f"pattern_render_cache_bytes {stats['bytes']}",
+        "# HELP pattern_render_cache_entries Entries in the in-memory render cache.",
+        "# TYPE pattern_render_cache_entries gauge",
+        f"pattern_render_cache_entries {stats['entries']}",
+    ]
+    pool = get_render_pool()
+    if pool is not None:
+        pool_stats = pool.stats()
+        lines += [
+            "# HELP pattern_render_pool_in_flight Render jobs queued or running in worker processes.",
+            "# TYPE pattern_render_pool_in_flight gauge",
+            f"pattern_render_pool_in_flight {pool_stats['in_flight']}",
+            "# HELP pattern_render_pool_rejected_total Render jobs rejected because the queue was full.",
+            "# TYPE pattern_render_pool_rejected_total counter",
+            f"pattern_render_pool_rejected_total {pool_stats['rejected']}",
+        ]
+    body = render_prometheus() + "\n".join(lines) + "\n"
+    return HttpResponse(body, content_type="text/plain; version=0.0.4; charset=utf-8")
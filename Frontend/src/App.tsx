@@ -18,6 +18,7 @@ import ArchivePage from './pages/9-ArchivePage/ArchivePage.tsx'
 // 사용자가 입력/촬영한 데이터를 모아두는 타입
 export type ProductFormData = {
   nickname: string
+  nicknameToken?: string  // 닉네임 예약 토큰 (등록 요청 때 함께 보냄)
   metDate: string       // YYYY-MM-DD
   farewellDate: string  // YYYY-MM-DD
   screenshot?: string   // 캡처한 이미지 dataURL
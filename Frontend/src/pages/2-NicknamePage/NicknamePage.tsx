@@ -2,7 +2,7 @@
 // - 닉네임 입력
 // - 실시간 카드 동기화
 // - Django에 중복 체크 요청 (debounce)
-// - 통과하면 /met-date 로 이동
+// - 다음으로를 누르면 닉네임을 예약하고(토큰 저장) /met-date 로 이동
 
 import { useState, useEffect, useCallback } from 'react'
 import { useNavigate } from 'react-router-dom'
@@ -20,6 +20,7 @@ function NicknamePage({ formData, setFormData }: FormPageProps) {
   const [error, setError] = useState<string | null>(null)
   const [isChecking, setIsChecking] = useState(false)
   const [isDuplicate, setIsDuplicate] = useState(false)
+  const nicknameToken = formData.nicknameToken
 
   // 실시간으로 formData 업데이트
   useEffect(() => {
@@ -37,10 +38,13 @@ function NicknamePage({ formData, setFormData }: FormPageProps) {
 
       setIsChecking(true)
       try {
+        const params = new URLSearchParams({ nickname: nickname.trim() })
+        // 이미 예약한 닉네임으로 돌아온 경우 자기 예약은 중복으로 보지 않음
+        if (nicknameToken) {
+          params.set('token', nicknameToken)
+        }
         const res = await fetch(
-          `${API_BASE}/api/products/check-nickname/?nickname=${encodeURIComponent(
-            nickname.trim(),
-          )}`,
+          `${API_BASE}/api/products/check-nickname/?${params}`,
         )
 
         if (!res.ok) {
@@ -65,7 +69,7 @@ function NicknamePage({ formData, setFormData }: FormPageProps) {
         setIsChecking(false)
       }
     },
-    [],
+    [nicknameToken],
   )
 
   // debounce를 위한 useEffect
@@ -92,28 +96,30 @@ function NicknamePage({ formData, setFormData }: FormPageProps) {
       return
     }
 
-    // 최종 확인
+    // 최종 확인: 닉네임을 예약해서 등록할 때까지 다른 키오스크가 쓰지 못하게 함
+    // (이전에 받은 토큰을 보내면 기존 예약을 이 닉네임으로 바꿈)
     setIsChecking(true)
     try {
-      const res = await fetch(
-        `${API_BASE}/api/products/check-nickname/?nickname=${encodeURIComponent(
-          nickname,
-        )}`,
-      )
+      const res = await fetch(`${API_BASE}/api/products/nickname-reservations/`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ nickname, token: nicknameToken }),
+      })
 
+      if (res.status === 409) {
+        setError('이미 있는 별명이예요!')
+        setIsDuplicate(true)
+        return
+      }
       if (!res.ok) {
         setError('닉네임 확인 중 오류가 발생했습니다.')
         return
       }
 
       const data = await res.json()
-      if (data.exists) {
-        setError('이미 있는 별명이예요!')
-        setIsDuplicate(true)
-        return
-      }
+      setFormData((prev) => ({ ...prev, nicknameToken: data.token }))
 
-      // 닉네임 사용 가능 → 다음 단계로
+      // 닉네임 예약 완료 → 다음 단계로
       navigate('/met-date')
     } catch (err) {
       console.error(err)
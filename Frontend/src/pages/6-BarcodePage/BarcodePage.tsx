@@ -102,6 +102,9 @@ function BarcodePage({ formData, setFormData, setPatternImageUrl }: Props) {
 
       form.append('item_name', formData.nickname)
       form.append('nickname', formData.nickname)
+      if (formData.nicknameToken) {
+        form.append('nickname_token', formData.nicknameToken)
+      }
       form.append('met_date', formData.metDate)
       form.append('farewell_date', formData.farewellDate)
       form.append('barcode', localBarcode)
@@ -121,6 +124,11 @@ function BarcodePage({ formData, setFormData, setPatternImageUrl }: Props) {
 
       const data = await res.json()
 
+      if (res.status === 409) {
+        // 예약이 만료되어 다른 사람이 같은 닉네임을 먼저 등록한 경우
+        setError('이미 있는 별명이예요! 별명을 바꿔 주세요.')
+        return
+      }
       if (!res.ok) {
         console.error(data)
         setError('저장 또는 패턴 생성 중 오류가 발생했습니다.')
@@ -15,19 +15,35 @@ import downButtonSvg from '../../assets/images/buttons/downButton.svg'
 // 드래그와 클릭을 구분하기 위한 threshold (px)
 const DRAG_THRESHOLD = 10
 
-// 백엔드 Product 모델과 맞춘 타입
+// 목록 한 페이지 크기 (커서 페이지네이션, 다음 페이지는 응답의 next로 이어서 로드)
+const PAGE_SIZE = 60
+
+// 카드에 필요한 필드만 요청 (원본 이미지 URL 대신 썸네일 / 중간 크기 파생본 URL 사용)
+const LIST_FIELDS = ['id', 'nickname', 'met_date', 'farewell_date', 'renditions']
+
+// 이미지 파생본 URL (원본 이미지가 없으면 null)
+type Renditions = {
+  thumb: string
+  medium: string
+} | null
+
+// 백엔드 Product 목록 응답 중 아카이브에서 쓰는 필드
 type Product = {
   id: number
-  item_name: string
   nickname: string
   met_date: string
   farewell_date: string
-  barcode: string
-  dominant_color: string | null
-  palette: string[] | null
-  image: string | null
-  pattern_image: string | null
-  created_at: string
+  renditions: {
+    image: Renditions
+    pattern_image: Renditions
+  }
+}
+
+// 커서 페이지네이션 응답
+type ProductPage = {
+  next: string | null
+  previous: string | null
+  results: Product[]
 }
 
 type ViewMode = 'gallery' | 'detail'
@@ -67,32 +83,51 @@ function ArchivePage() {
     return () => window.removeEventListener('resize', checkMobile)
   }, [])
 
-  // 데이터 로드
+  // 데이터 로드: 첫 페이지를 먼저 보여주고, 나머지 페이지는 next를 따라 이어서 추가
   useEffect(() => {
+    const controller = new AbortController()
+
     const fetchProducts = async () => {
       setLoading(true)
       setError(null)
+      const params = new URLSearchParams({
+        page_size: String(PAGE_SIZE),
+        fields: LIST_FIELDS.join(','),
+      })
+      let url: string | null = `${API_BASE}/api/products/?${params}`
+      let first = true
       try {
-        const res = await fetch(`${API_BASE}/api/products/`)
-        if (!res.ok) {
-          setError(`데이터를 불러오는 중 오류가 발생했습니다. (status: ${res.status})`)
-          return
-        }
-        const data = await res.json()
-        setProducts(data)
-        // 중앙 인덱스로 초기화
-        if (data.length > 0) {
-          setCurrentIndex(Math.floor(data.length / 2))
+        while (url) {
+          const res = await fetch(url, { signal: controller.signal })
+          if (!res.ok) {
+            setError(`데이터를 불러오는 중 오류가 발생했습니다. (status: ${res.status})`)
+            return
+          }
+          const page: ProductPage = await res.json()
+          if (first) {
+            setProducts(page.results)
+            // 중앙 인덱스로 초기화
+            if (page.results.length > 0) {
+              setCurrentIndex(Math.floor(page.results.length / 2))
+            }
+            setLoading(false)
+            first = false
+          } else {
+            setProducts((prev) => [...prev, ...page.results])
+          }
+          url = page.next
         }
       } catch (err) {
+        if (controller.signal.aborted) return
         console.error(err)
         setError('서버와 통신 중 문제가 발생했습니다.')
       } finally {
-        setLoading(false)
+        if (!controller.signal.aborted) setLoading(false)
       }
     }
 
     fetchProducts()
+    return () => controller.abort()
   }, [])
 
   // 컴포넌트 언마운트 시 타이머 정리
@@ -362,7 +397,7 @@ function ArchivePage() {
       >
         <div className="archive-cards-container">
           {products.map((product, index) => {
-            const patternUrl = resolveUrl(product.pattern_image)
+            const patternUrl = resolveUrl(product.renditions.pattern_image?.thumb ?? null)
 
             return (
               // 외부 wrapper: x축 이동 (드래그 시 즉시 반응)
@@ -429,7 +464,7 @@ function ArchivePage() {
                   nickname={products[selectedIndex].nickname}
                   metDate={products[selectedIndex].met_date}
                   farewellDate={products[selectedIndex].farewell_date}
-                  imageUrl={resolveUrl(products[selectedIndex].pattern_image)}
+                  imageUrl={resolveUrl(products[selectedIndex].renditions.pattern_image?.medium ?? null)}
                   placeholder=""
                   className="archive-detail-preview-card"
                 />
@@ -442,7 +477,7 @@ function ArchivePage() {
                   nickname={products[selectedIndex].nickname}
                   metDate={products[selectedIndex].met_date}
                   farewellDate={products[selectedIndex].farewell_date}
-                  imageUrl={resolveUrl(products[selectedIndex].image)}
+                  imageUrl={resolveUrl(products[selectedIndex].renditions.image?.medium ?? null)}
                   placeholder=""
                   className="archive-detail-preview-card"
                 />